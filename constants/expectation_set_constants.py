@@ -3,4 +3,22 @@ LAST_EDITED = "last_edited"
 EXPECTATIONS = "expectations"
 EXPECTATION_NAME = "expectation_name"
 PARAMETERS = "parameters"
+EXPECTATION_COUNT = "expectation_count"
+CONTENT_HASH = "content_hash"
 MULTICOLUMN_CONFIG_SEPARATOR = ","
+
+# Expectation set specs, in which every expectation is a row with its columns, its
+# expectation ID or interface name, and its parameters
+SPEC_COLUMNS = "columns"
+SPEC_EXPECTATION = "expectation"
+SPEC_DATASET = "dataset"
+JSON_SPEC_EXTENSIONS = [".json"]
+YAML_SPEC_EXTENSIONS = [".yaml", ".yml"]
+CSV_SPEC_EXTENSIONS = [".csv"]
+
+# Interface names of the definer checklist whose parsed keys are kept in memory
+INTERFACE_NAME_CACHE_SIZE = 4096
+
+# Value sets can reference a column of an imported dataset, as "@dataset:column"
+VALUE_SET_REFERENCE_PREFIX = "@"
+VALUE_SET_REFERENCE_SEPARATOR = ":"
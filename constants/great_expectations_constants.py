@@ -1,16 +1,25 @@
+import os
+
 SINGLE_COLUMN_EXPECTATIONS_MAP = {
     "Values to be unique": "expect_column_values_to_be_unique",
     "Values to not be null": "expect_column_values_to_not_be_null",
     "Values to be in set": "expect_column_values_to_be_in_set",
     "Values to be of type": "expect_column_values_to_be_of_type",
     "Values to be between": "expect_column_values_to_be_between",
-    "Value lengths to equal": "expect_column_value_lengths_to_equal"
+    "Value lengths to equal": "expect_column_value_lengths_to_equal",
+    "Values to exist in another dataset": "expect_column_values_to_be_in_other_dataset"
 }
 MULTICOLUMN_EXPECTATIONS_MAP = {
     "Values from columns to be unique": "expect_multicolumn_values_to_be_unique",
     "Values in first to be greater than in second": "expect_column_pair_values_A_to_be_greater_than_B",
     "Values from columns to be in set": "expect_column_pair_values_to_be_in_set"
 }
+EXPECTATION_INTERFACE_NAMES = {
+    expectation_id: interface_name
+    for interface_name, expectation_id in {
+        **SINGLE_COLUMN_EXPECTATIONS_MAP, **MULTICOLUMN_EXPECTATIONS_MAP
+    }.items()
+}
 NUMERIC_ONLY_EXPECTATIONS = [
     "Values to be between"
 ]
@@ -35,6 +44,10 @@ EXPECTATION_PARAMS = {
         "min_value": "int",
         "max_value": "int"
     },
+    "expect_column_values_to_be_in_other_dataset": {
+        "reference_dataset": "str",
+        "reference_column": "str"
+    },
 
     # Multicolumn expectations
     "expect_multicolumn_values_to_be_unique": {
@@ -74,6 +87,8 @@ VALUE_SET_SINGLE = "value_set"
 LENGTH = "value"
 MIN_VALUE = "min_value"
 MAX_VALUE = "max_value"
+REFERENCE_DATASET = "reference_dataset"
+REFERENCE_COLUMN = "reference_column"
 
 # Multicolumn expectations
 COLUMN_A = "column_A"
@@ -82,6 +97,42 @@ COLUMN_LIST = "column_list"
 OR_EQUAL = "or_equal"
 VALUE_SET_MULTI = "value_pairs_set"
 
+# Parameters an expectation cannot be run without
+REQUIRED_EXPECTATION_PARAMETERS = {
+    "expect_column_values_to_be_in_set": [VALUE_SET_SINGLE],
+    "expect_column_values_to_be_of_type": [TYPE],
+    "expect_column_value_lengths_to_equal": [LENGTH],
+    "expect_column_values_to_be_in_other_dataset": [REFERENCE_DATASET, REFERENCE_COLUMN],
+    "expect_column_pair_values_to_be_in_set": [VALUE_SET_MULTI],
+}
+
 # validation_operations::save_validation constants
+TEMP_CHECKPOINT_NAME = "_temp_checkpoint"
 BATCH_KWARGS = "batch_kwargs"
 EXPECTATION_SUITE_NAMES = "expectation_suite_names"
+
+# Separator between set name, content hash and confidence in compiled suite names
+COMPILED_SUITE_SEPARATOR = "__"
+
+# Datasource every batch is read from
+DATASOURCE_NAME = "datasource"
+DATASOURCE_CONFIG = {"class_name": "PandasDatasource"}
+
+# Validation operator that stores results without building data docs
+VALIDATION_OPERATOR_NAME = "deebee_store_only_operator"
+VALIDATION_OPERATOR_CONFIG = {
+    "class_name": "ActionListValidationOperator",
+    "action_list": [
+        {
+            "name": "store_validation_result",
+            "action": {"class_name": "StoreValidationResultAction"},
+        },
+    ],
+}
+
+# How GE's data docs site follows new results: "disabled" leaves it untouched, as
+# results are rendered when opened, and "incremental" only adds the page of each new
+# result, without rebuilding the index
+DISABLED_DATA_DOCS = "disabled"
+INCREMENTAL_DATA_DOCS = "incremental"
+DATA_DOCS_MODE = os.environ.get("DEEBEE_DATA_DOCS_MODE", DISABLED_DATA_DOCS)
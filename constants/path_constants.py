@@ -21,4 +21,11 @@ GE_VALIDATIONS_PATH = os.path.join(
         "local_site",
         "validations",
     ]
-)
\ No newline at end of file
+)
+VALIDATION_CACHE_PATH = os.path.join(DATA_DIRECTORY, "validation_cache")
+INCREMENTAL_STATES_PATH = os.path.join(DATA_DIRECTORY, "incremental_states")
+RENDERED_VALIDATIONS_PATH = os.path.join(DATA_DIRECTORY, "rendered_validations")
+UNEXPECTED_ROWS_PATH = os.path.join(DATA_DIRECTORY, "unexpected_rows")
+VALIDATION_HISTORY_PATH = os.path.join(DATA_DIRECTORY, "validation_history.db")
+REFERENCE_INDEXES_PATH = os.path.join(DATA_DIRECTORY, "reference_indexes")
+EXPECTATION_SETS_DATABASE_PATH = os.path.join(DATA_DIRECTORY, "expectation_sets.db")
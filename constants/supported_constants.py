@@ -5,4 +5,11 @@ SUPPORTED_CORRECTION_DATA_TYPES = [
     "bool",
     "float",
     "str",
-]
\ No newline at end of file
+]
+
+# Kinds of dataset columns, as far as expectations are concerned. Schemas are inferred
+# from the first rows of a dataset
+NUMERIC_COLUMN = "numeric"
+STRING_COLUMN = "string"
+OTHER_COLUMN = "other"
+SCHEMA_SAMPLE_ROWS = 1000
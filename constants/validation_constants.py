@@ -0,0 +1,171 @@
+import os
+
+GREAT_EXPECTATIONS_MODE = "Great Expectations"
+CHUNKED_MODE = "Chunked"
+SAMPLING_MODE = "Sampling"
+INCREMENTAL_MODE = "Incremental"
+FAIL_FAST_MODE = "Fail-fast"
+SKETCH_MODE = "Sketch"
+VALIDATION_MODES = [
+    GREAT_EXPECTATIONS_MODE,
+    CHUNKED_MODE,
+    SAMPLING_MODE,
+    INCREMENTAL_MODE,
+    FAIL_FAST_MODE,
+    SKETCH_MODE,
+]
+DEFAULT_VALIDATION_MODE = GREAT_EXPECTATIONS_MODE
+
+# Chunked validation constants
+CHUNK_SIZE = 100000
+HASH_SPILL_THRESHOLD = 10000000
+HASH_SPILL_BUCKETS = 64
+
+# Threads that check independent columns of a chunk at the same time, where 1 means
+# that expectations run one after another
+VALIDATION_THREADS = int(
+    os.environ.get("DEEBEE_VALIDATION_THREADS", min(8, os.cpu_count() or 1))
+)
+
+# Sampling validation constants
+SAMPLE_SIZE = int(os.environ.get("DEEBEE_SAMPLE_SIZE", 100000))
+SAMPLE_SEED = 0
+SAMPLE_CONFIDENCE_LEVEL = 0.95
+
+# Incremental validation constants
+WATERMARK_FILE_NAME = "watermark.json"
+ROW_WATERMARK = "row_watermark"
+BYTE_WATERMARK = "byte_watermark"
+PREFIX_HASH = "prefix_hash"
+ENDS_WITH_NEWLINE = "ends_with_newline"
+EXPECTATION_SET_HASH = "expectation_set_hash"
+ENGINE = "engine"
+STATES = "states"
+HASHES_SIZE = "hashes_size"
+
+# Fail-fast validation constants, where 0 failures means no limit
+FAIL_FAST_MAX_FAILURES = int(os.environ.get("DEEBEE_FAIL_FAST_MAX_FAILURES", 0))
+
+# Sketch validation constants. Each uniqueness expectation holds a Bloom filter sized
+# for the given number of rows, and at most the given number of candidate duplicates
+SKETCH_HLL_PRECISION = 14
+SKETCH_BLOOM_CAPACITY = int(os.environ.get("DEEBEE_SKETCH_BLOOM_CAPACITY", 100000000))
+SKETCH_BLOOM_ERROR_RATE = 0.01
+SKETCH_MAX_CANDIDATES = int(os.environ.get("DEEBEE_SKETCH_MAX_CANDIDATES", 10000000))
+SKETCH_CONFIDENCE_LEVEL = 0.95
+
+# Unexpected rows export constants
+ROW_INDEX = "row_index"
+ROW_HASH = "row_hash"
+UNEXPECTED_ROWS_EXTENSION = ".parquet"
+STAGING_EXTENSION = ".staging"
+EXPECTATION_METADATA = b"expectation"
+COLUMN_KEY_METADATA = b"column"
+
+# Column intermediates that expectations share, in the order they are computed
+NULL_MASK = "null_mask"
+NUMERIC_VALUES = "numeric_values"
+VALUE_LENGTHS = "value_lengths"
+VALUE_HASHES = "value_hashes"
+COLUMN_INTERMEDIATES = [NULL_MASK, NUMERIC_VALUES, VALUE_LENGTHS, VALUE_HASHES]
+EXPECTATION_INTERMEDIATES = {
+    "expect_column_values_to_not_be_null": [NULL_MASK],
+    "expect_column_values_to_be_in_set": [NULL_MASK],
+    "expect_column_values_to_be_of_type": [NULL_MASK],
+    "expect_column_values_to_be_between": [NULL_MASK, NUMERIC_VALUES],
+    "expect_column_value_lengths_to_equal": [NULL_MASK, VALUE_LENGTHS],
+    "expect_column_values_to_be_unique": [NULL_MASK, VALUE_HASHES],
+    "expect_column_values_to_be_in_other_dataset": [NULL_MASK, VALUE_HASHES],
+    "expect_column_pair_values_A_to_be_greater_than_B": [NULL_MASK],
+    "expect_column_pair_values_to_be_in_set": [NULL_MASK],
+    "expect_multicolumn_values_to_be_unique": [NULL_MASK, VALUE_HASHES],
+}
+
+# Compiled expectation plans kept in memory, the least recently used is dropped first
+EXPECTATION_PLAN_CACHE_SIZE = 64
+
+# Validation cache constants
+ENGINE_VERSION = "1"
+VALIDATION_CACHE_INDEX = "index.json"
+VALIDATION_CACHE_DISK_BUDGET = int(
+    os.environ.get("DEEBEE_VALIDATION_CACHE_BUDGET", 512 * 1024 * 1024)
+)
+CACHE_FILE_NAME = "file_name"
+CACHE_SIZE = "size"
+CACHE_LAST_ACCESS = "last_access"
+
+# Great Expectations' validation result keys
+GE_RESULTS = "results"
+GE_RESULT = "result"
+GE_SUCCESS = "success"
+GE_EXPECTATION_CONFIG = "expectation_config"
+GE_EXPECTATION_TYPE = "expectation_type"
+GE_KWARGS = "kwargs"
+GE_NON_PARAMETER_KWARGS = [
+    "column",
+    "column_A",
+    "column_B",
+    "column_list",
+    "mostly",
+    "result_format",
+    "include_config",
+    "catch_exceptions",
+]
+
+# Extension of the Great Expectations' validation results kept by the app
+GE_RESULT_EXTENSION = ".ge.json"
+
+# Validation result keys
+DATASET_NAME = "dataset_name"
+CONFIDENCE = "confidence"
+MODE = "mode"
+RUN_TIME = "run_time"
+SUCCESS = "success"
+STATISTICS = "statistics"
+RESULTS = "results"
+RESULT = "result"
+COLUMN_KEY = "column"
+SAMPLED_ROWS = "sampled_rows"
+TOTAL_ROWS = "total_rows"
+VALIDATED_ROWS = "validated_rows"
+EARLY_TERMINATED = "early_terminated"
+TERMINATION_REASON = "termination_reason"
+UNEXPECTED_ROWS = "unexpected_rows"
+
+# Validation result statistics keys
+EVALUATED_EXPECTATIONS = "evaluated_expectations"
+SUCCESSFUL_EXPECTATIONS = "successful_expectations"
+UNSUCCESSFUL_EXPECTATIONS = "unsuccessful_expectations"
+SUCCESS_PERCENT = "success_percent"
+UNDECIDED_EXPECTATIONS = "undecided_expectations"
+
+# Per expectation result keys
+ELEMENT_COUNT = "element_count"
+MISSING_COUNT = "missing_count"
+UNEXPECTED_COUNT = "unexpected_count"
+UNEXPECTED_PERCENT = "unexpected_percent"
+UNEXPECTED_FRACTION = "unexpected_fraction"
+OBSERVED_MIN = "observed_min"
+OBSERVED_MAX = "observed_max"
+UNEXPECTED_FRACTION_LOWER = "unexpected_fraction_lower"
+UNEXPECTED_FRACTION_UPPER = "unexpected_fraction_upper"
+DECIDABLE = "decidable"
+FIXED_SUCCESS = "fixed_success"
+DISTINCT_COUNT = "distinct_count"
+DISTINCT_COUNT_LOWER = "distinct_count_lower"
+DISTINCT_COUNT_UPPER = "distinct_count_upper"
+EXACT = "exact"
+
+# Expectations whose unexpected values can only be known after the whole dataset is seen
+UNIQUENESS_EXPECTATIONS = [
+    "expect_column_values_to_be_unique",
+    "expect_multicolumn_values_to_be_unique",
+]
+
+# Python types accepted by "Values to be of type" when a column holds objects
+NATIVE_TYPES = {
+    "int": (int,),
+    "bool": (bool,),
+    "float": (float,),
+    "str": (str,),
+}
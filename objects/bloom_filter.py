@@ -0,0 +1,74 @@
+import math
+import numpy as np
+
+from constants.validation_constants import SKETCH_BLOOM_CAPACITY, SKETCH_BLOOM_ERROR_RATE
+
+
+class BloomFilter:
+    def __init__(
+        self, capacity: int = SKETCH_BLOOM_CAPACITY, error_rate: float = SKETCH_BLOOM_ERROR_RATE
+    ) -> None:
+        """
+        Initializes BloomFilter object. It tells if a 64 bit hash may have been added
+        before, without false negatives, in a fixed amount of memory. Once more hashes
+        than its capacity have been added, false positives become more frequent than
+        the error rate.
+
+        :param capacity: Integer with the number of hashes the filter is sized for.
+        :param error_rate: Float with the false positive rate at full capacity.
+        """
+        n_bits = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._n_bits = np.uint64(n_bits)
+        self._n_hashes = max(1, round(n_bits / capacity * math.log(2)))
+        self._bits = np.zeros((n_bits + 7) // 8, dtype=np.uint8)
+
+    @property
+    def n_bytes(self) -> int:
+        """
+        Returns the memory held by the filter bits.
+
+        :return: Integer.
+        """
+        return self._bits.nbytes
+
+    def add_and_check(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Adds new hashes to the filter and tells which of them may have been added
+        before. A hash that appears more than once in the same array is flagged from its
+        second occurrence on.
+
+        :param hashes: NumPy array with 64 bit hashes.
+
+        :return: Boolean NumPy array, True where the hash may have been added before.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        unique_hashes, first_positions, inverse = np.unique(
+            hashes, return_index=True, return_inverse=True
+        )
+        positions = self._get_bit_positions(unique_hashes)
+        byte_positions = (positions >> np.uint64(3)).astype(np.intp)
+        bit_masks = np.left_shift(1, (positions & np.uint64(7)).astype(np.uint8))
+        bit_masks = bit_masks.astype(np.uint8)
+
+        was_added = np.all(self._bits[byte_positions] & bit_masks, axis=0)
+        np.bitwise_or.at(self._bits, byte_positions.ravel(), bit_masks.ravel())
+
+        seen_before = was_added[inverse]
+        is_repeated = np.ones(len(hashes), dtype=bool)
+        is_repeated[first_positions] = False
+        return seen_before | is_repeated
+
+    def _get_bit_positions(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Derives the bit positions of every hash with double hashing, from its lower and
+        upper 32 bits.
+
+        :param hashes: NumPy array with 64 bit hashes.
+
+        :return: NumPy array of 64 bit unsigned integers, with one row per hash
+        function and one column per hash.
+        """
+        lower = hashes & np.uint64(0xFFFFFFFF)
+        upper = (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self._n_hashes, dtype=np.uint64)[:, np.newaxis]
+        return (lower + steps * upper) % self._n_bits
@@ -0,0 +1,65 @@
+import copy
+from types import MappingProxyType
+
+
+class CompiledExpectation:
+    def __init__(
+        self, column_key: str, expectation_id: str, columns: tuple, parameters: dict,
+        raw_parameters: dict
+    ) -> None:
+        """
+        Initializes CompiledExpectation object. It is an expectation of a set ready to
+        be run: its columns are split and its parameters already have the types the
+        validation engines use, so nothing is parsed while a dataset is validated. It
+        cannot be modified, so the same object is shared by every validation.
+
+        :param column_key: String with the key of the expectation in the set config.
+        :param expectation_id: String with GE's expectation ID.
+        :param columns: Tuple with the table columns the expectation works with.
+        :param parameters: Dictionary with the typed parameters.
+        :param raw_parameters: Dictionary with the parameters as stored in the set,
+        which are reported in validation results.
+        """
+        self._column_key = column_key
+        self._expectation_id = expectation_id
+        self._columns = tuple(columns)
+        self._parameters = MappingProxyType(dict(parameters))
+        self._raw_parameters = copy.deepcopy(raw_parameters)
+
+    @property
+    def column_key(self) -> str:
+        """
+        self._column_key getter.
+        """
+        return self._column_key
+
+    @property
+    def expectation_id(self) -> str:
+        """
+        self._expectation_id getter.
+        """
+        return self._expectation_id
+
+    @property
+    def columns(self) -> tuple:
+        """
+        self._columns getter.
+        """
+        return self._columns
+
+    @property
+    def parameters(self) -> MappingProxyType:
+        """
+        self._parameters getter. It is a read only view.
+        """
+        return self._parameters
+
+    @property
+    def raw_parameters(self) -> dict:
+        """
+        Returns a copy of the parameters as stored in the set, which the caller can
+        modify freely.
+
+        :return: Dictionary.
+        """
+        return copy.deepcopy(self._raw_parameters)
@@ -0,0 +1,45 @@
+from types import MappingProxyType
+
+
+class ExpectationPlan:
+    def __init__(self, content_hash: str, expectations: tuple, intermediates: dict) -> None:
+        """
+        Initializes ExpectationPlan object. It is the compiled form of the expectations
+        of a set: every expectation with its typed parameters, in config order, and the
+        intermediates every column needs. It cannot be modified, so it is compiled once
+        per content of the set and shared by every validation.
+
+        :param content_hash: String with the hash of the expectations it was compiled
+        from.
+        :param expectations: Tuple with CompiledExpectation objects, in config order.
+        :param intermediates: Dictionary whose keys are column names and whose values
+        are the intermediates to compute, in computation order.
+        """
+        self._content_hash = content_hash
+        self._expectations = tuple(expectations)
+        self._intermediates = MappingProxyType(
+            {column: tuple(column_intermediates)
+             for column, column_intermediates in intermediates.items()}
+        )
+
+    @property
+    def content_hash(self) -> str:
+        """
+        self._content_hash getter.
+        """
+        return self._content_hash
+
+    @property
+    def expectations(self) -> tuple:
+        """
+        self._expectations getter.
+        """
+        return self._expectations
+
+    @property
+    def intermediates(self) -> MappingProxyType:
+        """
+        self._intermediates getter. It is a read only view, which can be given to
+        compute_intermediates().
+        """
+        return self._intermediates
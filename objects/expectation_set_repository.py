@@ -0,0 +1,633 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from contextlib import closing, contextmanager
+
+from constants.expectation_set_constants import (
+    PARAMETERS,
+    LAST_EDITED,
+    CONTENT_HASH,
+    EXPECTATIONS,
+    EXPECTATION_NAME,
+    EXPECTATION_COUNT,
+    EXPECTATION_SET_NAME,
+    MULTICOLUMN_CONFIG_SEPARATOR
+)
+
+_REPOSITORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS expectation_sets (
+    name TEXT PRIMARY KEY,
+    last_edited TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    expectation_count INTEGER NOT NULL DEFAULT 0,
+    content_hash INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS expectations (
+    expectation_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    set_name TEXT NOT NULL REFERENCES expectation_sets (name) ON DELETE CASCADE,
+    column_key TEXT NOT NULL,
+    expectation_name TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    row_hash INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS expectations_by_set_and_column
+    ON expectations (set_name, column_key);
+CREATE INDEX IF NOT EXISTS expectation_sets_by_count
+    ON expectation_sets (expectation_count);
+"""
+
+# Row hashes are added modulo 2 ** 62, so that the sum of two of them still fits in a
+# SQLite integer
+_ROW_HASH_MODULUS = 2 ** 62
+
+
+class ExpectationSetRepository:
+    def __init__(self, database_path: os.path, json_directory: os.path = None) -> None:
+        """
+        Initializes ExpectationSetRepository object. Expectation sets are stored in an
+        SQLite database, with one row per expectation indexed by set and column, and
+        every edit is a transaction that only touches the rows it changes. Concurrent
+        editors never overwrite each other's expectations.
+
+        Every set row is also its manifest entry: it keeps the number of expectations,
+        when the set was last edited and a hash of its content, all of them updated in
+        the transaction of every edit. Listings and integrity checks only read the
+        manifest.
+
+        The parsed config of every set that has been read is kept in memory, along with
+        the version of the set it was read at, so a set is only read again once someone
+        edits it. Sets also keep a hashed index of their expectations by expectation ID
+        and columns, in any order, which this object updates along with its own edits.
+
+        :param database_path: Path of the SQLite database.
+        :param json_directory: Path of a directory with sets in JSON format, which are
+        imported when the database is created.
+        """
+        self._database_path = database_path
+        self._json_directory = json_directory
+        self._configs = dict()
+        self._versions = dict()
+        self._key_indexes = dict()
+        self._lock = threading.RLock()
+        self._is_initialized = False
+
+    def exists(self, name: str) -> bool:
+        """
+        Returns if an expectation set exists.
+
+        :param name: String with the name of the set.
+
+        :return: Bool.
+        """
+        with closing(self._connect()) as connection:
+            return self._get_version(connection, name) is not None
+
+    def get(self, name: str) -> dict:
+        """
+        Returns the config of an expectation set, in the same format as its JSON file.
+        Only its version is read, unless it changed since the config was last read.
+
+        :param name: String with the name of the set.
+
+        :return: Dictionary with the config. It is shared, so it must not be modified.
+        """
+        with self._lock, closing(self._connect()) as connection:
+            version = self._get_version(connection, name)
+            if version is None:
+                raise KeyError(f"Expectation set {name} does not exist")
+            if self._versions.get(name) != version:
+                self._configs[name] = self._read_config(connection, name)
+                self._versions[name] = version
+            return self._configs[name]
+
+    def find_column_key(self, name: str, expectation_name: str, columns: list) -> str or None:
+        """
+        Returns the key under which an expectation over the given columns, in any
+        order, is set. It is looked up in the hashed index of the set, which is only
+        read again if someone else edited the set.
+
+        :param name: String with the name of the set.
+        :param expectation_name: String with GE's expectation ID.
+        :param columns: List with column names.
+
+        :return: String with the column key, or None if the set does not have that
+        expectation.
+        """
+        with self._lock, closing(self._connect()) as connection:
+            version = self._get_version(connection, name)
+            if version is None:
+                return None
+            cached = self._key_indexes.get(name)
+            if cached is None or cached[0] != version:
+                cached = (version, self._read_key_index(connection, name))
+                self._key_indexes[name] = cached
+            column_keys = cached[1].get(self._get_expectation_key(expectation_name, columns))
+            return next(iter(column_keys)) if column_keys else None
+
+    def list_names(self) -> list:
+        """
+        Returns the names of all expectation sets, sorted.
+
+        :return: List with set names.
+        """
+        with closing(self._connect()) as connection:
+            return [
+                row[0]
+                for row in connection.execute("SELECT name FROM expectation_sets ORDER BY name")
+            ]
+
+    def list_empty_names(self) -> list:
+        """
+        Returns the names of the expectation sets without expectations.
+
+        :return: List with set names.
+        """
+        with closing(self._connect()) as connection:
+            return [
+                row[0]
+                for row in connection.execute(
+                    "SELECT name FROM expectation_sets WHERE expectation_count = 0"
+                )
+            ]
+
+    def get_manifest(self) -> list:
+        """
+        Returns the manifest entry of every expectation set, sorted by name. No
+        expectation is read.
+
+        :return: List with dictionaries of set name, number of expectations, last
+        edition and content hash.
+        """
+        with closing(self._connect()) as connection:
+            return [
+                {
+                    EXPECTATION_SET_NAME: name,
+                    EXPECTATION_COUNT: expectation_count,
+                    LAST_EDITED: last_edited,
+                    CONTENT_HASH: f"{content_hash:016x}",
+                }
+                for name, expectation_count, last_edited, content_hash in connection.execute(
+                    "SELECT name, expectation_count, last_edited, content_hash "
+                    "FROM expectation_sets ORDER BY name"
+                )
+            ]
+
+    def create(self, name: str, config: dict) -> None:
+        """
+        Writes a whole expectation set, replacing it if it already exists.
+
+        :param name: String with the name of the set.
+        :param config: Dictionary with the config of the set, in JSON format.
+        """
+        with self._transaction() as connection:
+            self._write_config(connection, name, config)
+
+    def create_if_missing(self, name: str) -> None:
+        """
+        Creates an empty expectation set, unless it already exists.
+
+        :param name: String with the name of the set.
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO expectation_sets (name, last_edited, version) "
+                "VALUES (?, ?, ?)",
+                (name, str(datetime.now()), time.time_ns())
+            )
+
+    def add_expectation(
+        self, name: str, column_key: str, expectation_config: dict, skip_if_present=False
+    ) -> None:
+        """
+        Adds an expectation to a set, after the ones it already has.
+
+        :param name: String with the name of the set.
+        :param column_key: String with the key of the expectation in the set config.
+        :param expectation_config: Dictionary with expectation name and parameters.
+        :param skip_if_present: Bool that tells if the expectation is not added when
+        the same one, with the same parameters, is already set for the same key.
+        """
+        self.add_expectations(name, [(column_key, expectation_config)], skip_if_present)
+
+    def add_expectations(
+        self, name: str, expectations: list, skip_if_present=False
+    ) -> None:
+        """
+        Adds expectations to a set, after the ones it already has, all of them in the
+        same transaction. The set is created if it does not exist yet.
+
+        :param name: String with the name of the set.
+        :param expectations: List with tuples of column key and expectation config.
+        :param skip_if_present: Bool that tells if an expectation is not added when the
+        same one, with the same parameters, is already set for the same key.
+        """
+        rows = list()
+        for column_key, expectation_config in expectations:
+            expectation_name = expectation_config[EXPECTATION_NAME]
+            parameters = self._dump_parameters(expectation_config[PARAMETERS])
+            rows.append(
+                (
+                    name,
+                    column_key,
+                    expectation_name,
+                    parameters,
+                    self._get_row_hash(column_key, expectation_name, parameters)
+                )
+            )
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO expectation_sets (name, last_edited, version) "
+                "VALUES (?, ?, ?)",
+                (name, str(datetime.now()), time.time_ns())
+            )
+            previous_version = self._get_version(connection, name)
+            changes = list()
+            added_hash = 0
+            for row in rows:
+                # Rows added earlier in the same transaction are seen too
+                if skip_if_present and connection.execute(
+                    "SELECT 1 FROM expectations WHERE set_name = ? AND column_key = ? "
+                    "AND expectation_name = ? AND parameters = ?",
+                    row[:4]
+                ).fetchone():
+                    continue
+                connection.execute(
+                    "INSERT INTO expectations (set_name, column_key, expectation_name, "
+                    "parameters, row_hash) VALUES (?, ?, ?, ?, ?)",
+                    row
+                )
+                changes.append((row[1], row[2], 1))
+                added_hash += row[4]
+            if not changes:
+                return
+            self._touch(connection, name, len(changes), added_hash)
+            self._update_key_index(connection, name, previous_version, changes)
+
+    def delete_expectations(self, name: str, expectations: list) -> None:
+        """
+        Deletes expectations from a set, all of them in the same transaction. Every
+        expectation with one of the given names and keys is deleted.
+
+        :param name: String with the name of the set.
+        :param expectations: List with tuples of column key and GE's expectation ID.
+        """
+        with self._transaction() as connection:
+            previous_version = self._get_version(connection, name)
+            changes = list()
+            deleted_count = deleted_hash = 0
+            for column_key, expectation_name in expectations:
+                row = (name, column_key, expectation_name)
+                row_hashes = [
+                    row_hash for row_hash, in connection.execute(
+                        "SELECT row_hash FROM expectations WHERE set_name = ? "
+                        "AND column_key = ? AND expectation_name = ?",
+                        row
+                    )
+                ]
+                connection.execute(
+                    "DELETE FROM expectations WHERE set_name = ? AND column_key = ? "
+                    "AND expectation_name = ?",
+                    row
+                )
+                deleted_count += len(row_hashes)
+                deleted_hash += sum(row_hashes)
+                changes.append((column_key, expectation_name, -len(row_hashes)))
+            self._touch(connection, name, -deleted_count, -deleted_hash)
+            self._update_key_index(connection, name, previous_version, changes)
+
+    def delete(self, name: str) -> None:
+        """
+        Deletes an expectation set and its expectations.
+
+        :param name: String with the name of the set.
+        """
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM expectation_sets WHERE name = ?", (name,))
+        with self._lock:
+            self._configs.pop(name, None)
+            self._versions.pop(name, None)
+            self._key_indexes.pop(name, None)
+
+    def import_json(self, path: os.path) -> str:
+        """
+        Imports an expectation set from a file in JSON format, replacing the set with
+        the same name, if any.
+
+        :param path: Path of the JSON file.
+
+        :return: String with the name of the imported set.
+        """
+        with open(path, "r") as fp:
+            config = json.load(fp)
+        name = config.get(EXPECTATION_SET_NAME) or \
+            os.path.splitext(os.path.basename(path))[0]
+        self.create(name, config)
+        return name
+
+    def export_json(self, name: str, path: os.path) -> None:
+        """
+        Exports an expectation set to a file in JSON format.
+
+        :param name: String with the name of the set.
+        :param path: Path of the JSON file.
+        """
+        with open(path, "w") as fp:
+            json.dump(self.get(name), fp)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens the database, creating its tables and indexes the first time. A new
+        database imports the sets found in the JSON directory.
+
+        :return: SQLite connection, in autocommit mode. It has to be closed by the
+        caller.
+        """
+        connection = sqlite3.connect(self._database_path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA foreign_keys = ON")
+        with self._lock:
+            if not self._is_initialized:
+                try:
+                    self._initialize(connection)
+                except BaseException:
+                    connection.close()
+                    raise
+                self._is_initialized = True
+        return connection
+
+    def _initialize(self, connection: sqlite3.Connection) -> None:
+        """
+        Creates the tables and indexes of the database and, if it is new, imports the
+        sets found in the JSON directory, all of it in a single transaction. If it
+        does not commit, the database is left as it was and initialized again by the
+        next connection.
+
+        :param connection: SQLite connection, in autocommit mode.
+        """
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            is_new_database = not connection.execute(
+                "SELECT name FROM sqlite_master WHERE name = 'expectation_sets'"
+            ).fetchone()
+            for statement in _REPOSITORY_SCHEMA.strip().split(";"):
+                if statement.strip():
+                    connection.execute(statement)
+            if is_new_database:
+                self._import_json_directory(connection)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _import_json_directory(self, connection: sqlite3.Connection) -> None:
+        """
+        Imports every set found in the JSON directory. Files that cannot be read as a
+        set are skipped, and the reason is reported.
+
+        :param connection: SQLite connection inside a transaction.
+        """
+        if self._json_directory is None or not os.path.isdir(self._json_directory):
+            return
+        for file_name in sorted(os.listdir(self._json_directory)):
+            if not file_name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self._json_directory, file_name), "r") as fp:
+                    config = json.load(fp)
+                name = config.get(EXPECTATION_SET_NAME) or os.path.splitext(file_name)[0]
+                self._write_config(connection, name, config)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as error:
+                print("ERROR:", f"Expectation set {file_name} was not imported: {error!r}")
+
+    def _write_config(self, connection: sqlite3.Connection, name: str, config: dict) -> None:
+        """
+        Writes a whole expectation set, replacing it if it already exists. Every row is
+        built before anything is written, so a config that is not valid writes nothing.
+
+        :param connection: SQLite connection inside a transaction.
+        :param name: String with the name of the set.
+        :param config: Dictionary with the config of the set, in JSON format.
+        """
+        rows = list()
+        for column_key, expectation_configs in config[EXPECTATIONS].items():
+            for expectation_config in expectation_configs:
+                parameters = self._dump_parameters(expectation_config[PARAMETERS])
+                rows.append(
+                    (
+                        name,
+                        column_key,
+                        expectation_config[EXPECTATION_NAME],
+                        parameters,
+                        self._get_row_hash(
+                            column_key, expectation_config[EXPECTATION_NAME], parameters
+                        )
+                    )
+                )
+        connection.execute("DELETE FROM expectation_sets WHERE name = ?", (name,))
+        connection.execute(
+            "INSERT INTO expectation_sets (name, last_edited, version, "
+            "expectation_count, content_hash) VALUES (?, ?, ?, ?, ?)",
+            (
+                name,
+                config.get(LAST_EDITED) or str(datetime.now()),
+                time.time_ns(),
+                len(rows),
+                sum(row[-1] for row in rows) % _ROW_HASH_MODULUS
+            )
+        )
+        connection.executemany(
+            "INSERT INTO expectations (set_name, column_key, expectation_name, "
+            "parameters, row_hash) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+
+    @contextmanager
+    def _transaction(self) -> sqlite3.Connection:
+        """
+        Yields a connection inside a write transaction, which is committed when the
+        block ends and rolled back if it fails. The write lock is taken at once, so
+        that what is read inside the transaction is still valid when it commits.
+
+        :return: SQLite connection.
+        """
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _touch(
+        self, connection: sqlite3.Connection, name: str, count_delta: int, hash_delta: int
+    ) -> None:
+        """
+        Marks a set as edited, so that its cached config is read again, and updates its
+        manifest entry. The content hash is the sum of the hashes of its expectations,
+        so it is updated without reading them. Versions come from the clock, so that a
+        set that is deleted and created again never gets a version it already had.
+
+        :param connection: SQLite connection inside a transaction.
+        :param name: String with the name of the set.
+        :param count_delta: Integer with the number of added expectations, negative if
+        they were deleted.
+        :param hash_delta: Integer with the sum of the hashes of the added
+        expectations, negative if they were deleted.
+        """
+        connection.execute(
+            "UPDATE expectation_sets SET version = MAX(version + 1, ?), last_edited = ?, "
+            "expectation_count = expectation_count + ?, "
+            "content_hash = (content_hash + ?) % ? WHERE name = ?",
+            (
+                time.time_ns(),
+                str(datetime.now()),
+                count_delta,
+                hash_delta % _ROW_HASH_MODULUS,
+                _ROW_HASH_MODULUS,
+                name
+            )
+        )
+
+    @staticmethod
+    def _get_row_hash(column_key: str, expectation_name: str, parameters: str) -> int:
+        """
+        Returns the hash of an expectation, which the content hash of its set adds up.
+        A sum does not depend on the order of the expectations, and it is updated
+        without reading the rest of the set.
+
+        :param column_key: String with the key of the expectation in the set config.
+        :param expectation_name: String with the expectation name.
+        :param parameters: String with the canonical JSON of its parameters.
+
+        :return: Integer lower than 2 ** 62.
+        """
+        digest = hashlib.sha256(
+            json.dumps([column_key, expectation_name, parameters]).encode()
+        ).digest()
+        return int.from_bytes(digest[:8], "big") % _ROW_HASH_MODULUS
+
+    def _update_key_index(
+        self, connection: sqlite3.Connection, name: str, previous_version: int, changes: list
+    ) -> None:
+        """
+        Applies an edit of this object to the hashed index of a set, so that it does
+        not have to be read again. If the index was not up to date before the edit, it
+        is dropped and read again when needed. The index takes the version the set has
+        inside the transaction, so it is read again if the transaction does not commit.
+
+        :param connection: SQLite connection inside the transaction of the edit.
+        :param name: String with the name of the set.
+        :param previous_version: Integer with the version of the set before the edit.
+        :param changes: List with tuples of column key, GE's expectation ID and the
+        number of added expectations, negative if they were deleted.
+        """
+        with self._lock:
+            cached = self._key_indexes.pop(name, None)
+            if cached is None or cached[0] != previous_version:
+                return
+            index = cached[1]
+            for column_key, expectation_name, count in changes:
+                key = self._get_expectation_key(
+                    expectation_name, column_key.split(MULTICOLUMN_CONFIG_SEPARATOR)
+                )
+                column_keys = index.setdefault(key, dict())
+                column_keys[column_key] = column_keys.get(column_key, 0) + count
+                if column_keys[column_key] <= 0:
+                    del column_keys[column_key]
+                if not column_keys:
+                    del index[key]
+            self._key_indexes[name] = (self._get_version(connection, name), index)
+
+    def _read_key_index(self, connection: sqlite3.Connection, name: str) -> dict:
+        """
+        Reads the hashed index of a set, see find_column_key().
+
+        :param connection: SQLite connection.
+        :param name: String with the name of the set.
+
+        :return: Dictionary whose keys are built by _get_expectation_key() and whose
+        values are dictionaries with the number of expectations under each column key,
+        in the order the keys were added.
+        """
+        index = dict()
+        for column_key, expectation_name, count in connection.execute(
+            "SELECT column_key, expectation_name, COUNT(*) FROM expectations "
+            "WHERE set_name = ? GROUP BY column_key, expectation_name "
+            "ORDER BY MIN(expectation_id)",
+            (name,)
+        ):
+            key = self._get_expectation_key(
+                expectation_name, column_key.split(MULTICOLUMN_CONFIG_SEPARATOR)
+            )
+            index.setdefault(key, dict())[column_key] = count
+        return index
+
+    @staticmethod
+    def _get_expectation_key(expectation_name: str, columns: list) -> tuple:
+        """
+        :param expectation_name: String with GE's expectation ID.
+        :param columns: List with column names.
+
+        :return: Tuple with the expectation ID and the columns, in any order.
+        """
+        return expectation_name, frozenset(columns)
+
+    @staticmethod
+    def _get_version(connection: sqlite3.Connection, name: str) -> int or None:
+        """
+        Returns the version of a set, which grows with every edit.
+
+        :param connection: SQLite connection.
+        :param name: String with the name of the set.
+
+        :return: Integer, or None if the set does not exist.
+        """
+        row = connection.execute(
+            "SELECT version FROM expectation_sets WHERE name = ?", (name,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    @staticmethod
+    def _read_config(connection: sqlite3.Connection, name: str) -> dict:
+        """
+        Reads the config of a set from its rows. Keys and expectations keep the order
+        in which they were added.
+
+        :param connection: SQLite connection.
+        :param name: String with the name of the set.
+
+        :return: Dictionary with the config, in JSON format.
+        """
+        last_edited = connection.execute(
+            "SELECT last_edited FROM expectation_sets WHERE name = ?", (name,)
+        ).fetchone()[0]
+        expectations = dict()
+        for column_key, expectation_name, parameters in connection.execute(
+            "SELECT column_key, expectation_name, parameters FROM expectations "
+            "WHERE set_name = ? ORDER BY expectation_id",
+            (name,)
+        ):
+            expectations.setdefault(column_key, list()).append(
+                {EXPECTATION_NAME: expectation_name, PARAMETERS: json.loads(parameters)}
+            )
+        return {
+            EXPECTATION_SET_NAME: name,
+            LAST_EDITED: last_edited,
+            EXPECTATIONS: expectations
+        }
+
+    @staticmethod
+    def _dump_parameters(parameters: dict) -> str:
+        """
+        Returns the parameters of an expectation as canonical JSON, so that equal
+        parameters are always stored as equal text.
+
+        :param parameters: Dictionary with expectation parameters.
+
+        :return: String.
+        """
+        return json.dumps(parameters, sort_keys=True)
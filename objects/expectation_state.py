@@ -0,0 +1,132 @@
+from objects.hash_counter import HashCounter
+from objects.uniqueness_sketch import UniquenessSketch
+
+
+class ExpectationState:
+    def __init__(self, hash_counter: HashCounter = None) -> None:
+        """
+        Initializes ExpectationState object. It holds the partial statistics of an
+        expectation while a dataset is validated chunk by chunk, and it can be merged
+        with the state computed over another part of the same dataset.
+
+        :param hash_counter: HashCounter object, only needed by those expectations that
+        look for duplicated values. A UniquenessSketch can take its place.
+        """
+        self._element_count = 0
+        self._missing_count = 0
+        self._unexpected_count = 0
+        self._observed_min = None
+        self._observed_max = None
+        self._hash_counter = hash_counter
+
+    @property
+    def element_count(self) -> int:
+        """
+        self._element_count getter.
+        """
+        return self._element_count
+
+    @property
+    def missing_count(self) -> int:
+        """
+        self._missing_count getter.
+        """
+        return self._missing_count
+
+    @property
+    def unexpected_count(self) -> int:
+        """
+        self._unexpected_count getter. Duplicated values are only taken into account
+        once the state has been finalized.
+        """
+        return self._unexpected_count
+
+    @property
+    def observed_min(self) -> any:
+        """
+        self._observed_min getter.
+        """
+        return self._observed_min
+
+    @property
+    def observed_max(self) -> any:
+        """
+        self._observed_max getter.
+        """
+        return self._observed_max
+
+    @property
+    def hash_counter(self) -> HashCounter or None:
+        """
+        self._hash_counter getter.
+        """
+        return self._hash_counter
+
+    def update(
+        self,
+        element_count: int,
+        missing_count: int,
+        unexpected_count: int,
+        observed_min=None,
+        observed_max=None,
+        hashes=None
+    ) -> None:
+        """
+        Updates the state with the statistics of a new chunk.
+
+        :param element_count: Integer with the number of rows in the chunk.
+        :param missing_count: Integer with the number of rows that are not considered.
+        :param unexpected_count: Integer with the number of unexpected rows.
+        :param observed_min: Minimum value observed in the chunk, if any.
+        :param observed_max: Maximum value observed in the chunk, if any.
+        :param hashes: NumPy array with the hashes of the considered values, if any.
+        """
+        self._element_count += element_count
+        self._missing_count += missing_count
+        self._unexpected_count += unexpected_count
+        self._update_observed_range(observed_min, observed_max)
+        if hashes is not None:
+            self._hash_counter.add(hashes)
+
+    def merge(self, other) -> None:
+        """
+        Merges the statistics of another state into this one. States that hold a
+        UniquenessSketch cannot be merged, as a value seen once by each of them would
+        not be a candidate duplicate in either.
+
+        :param other: ExpectationState object.
+        """
+        if isinstance(self._hash_counter, UniquenessSketch) or \
+                isinstance(other.hash_counter, UniquenessSketch):
+            raise TypeError("States with uniqueness sketches cannot be merged")
+        self._element_count += other.element_count
+        self._missing_count += other.missing_count
+        self._unexpected_count += other.unexpected_count
+        self._update_observed_range(other.observed_min, other.observed_max)
+        if other.hash_counter is not None:
+            if self._hash_counter is None:
+                self._hash_counter = HashCounter()
+            self._hash_counter.merge(other.hash_counter)
+
+    def finalize(self) -> None:
+        """
+        Adds duplicated values to the unexpected count and frees their hashes.
+        """
+        if self._hash_counter is not None:
+            self._unexpected_count += self._hash_counter.count_duplicated()
+            self._hash_counter.close()
+            self._hash_counter = None
+
+    def _update_observed_range(self, observed_min, observed_max) -> None:
+        """
+        Updates the minimum and maximum observed values.
+
+        :param observed_min: New minimum candidate, or None.
+        :param observed_max: New maximum candidate, or None.
+        """
+        if observed_min is not None:
+            if self._observed_min is None or observed_min < self._observed_min:
+                self._observed_min = observed_min
+        if observed_max is not None:
+            if self._observed_max is None or observed_max > self._observed_max:
+                self._observed_max = observed_max
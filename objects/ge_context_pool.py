@@ -0,0 +1,41 @@
+import os
+import threading
+from great_expectations.data_context import DataContext
+
+# GE's config file is read when a context is created and written when a datasource is
+# added, so both things never happen at the same time
+GE_CONFIG_LOCK = threading.RLock()
+
+
+class GEContextPool:
+    def __init__(self, context_root_dir: os.path) -> None:
+        """
+        Initializes GEContextPool object. It hands out one Great Expectations' context
+        per worker, that is, per thread of each process, so that concurrent validations
+        never share a context nor its in-memory stores.
+
+        :param context_root_dir: Path of GE's directory.
+        """
+        self._context_root_dir = context_root_dir
+        self._local = threading.local()
+
+    @property
+    def context_root_dir(self) -> os.path:
+        """
+        self._context_root_dir getter.
+        """
+        return self._context_root_dir
+
+    def get_context(self) -> DataContext:
+        """
+        Returns the context of the current worker, creating it the first time. A
+        forked process never reuses the contexts of its parent.
+
+        :return: GE's DataContext object.
+        """
+        pid, context = getattr(self._local, "context", (None, None))
+        if pid != os.getpid():
+            with GE_CONFIG_LOCK:
+                context = DataContext(context_root_dir=self._context_root_dir)
+            self._local.context = (os.getpid(), context)
+        return context
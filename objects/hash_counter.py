@@ -0,0 +1,189 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+
+from constants.validation_constants import HASH_SPILL_BUCKETS, HASH_SPILL_THRESHOLD
+
+
+class HashCounter:
+    def __init__(self, spill_threshold: int = HASH_SPILL_THRESHOLD) -> None:
+        """
+        Initializes HashCounter object. It accumulates 64 bit value hashes, so that
+        duplicated values can be counted once every chunk has been seen. When too many
+        hashes are held in memory, they are spilled to disk, partitioned in buckets, so
+        that each bucket can later be counted on its own.
+
+        :param spill_threshold: Integer with the number of hashes that can be held in
+        memory before spilling them to disk.
+        """
+        self._spill_threshold = spill_threshold
+        self._hashes = list()
+        self._hashes_in_memory = 0
+        self._spill_dir = None
+
+    @property
+    def is_spilled(self) -> bool:
+        """
+        Returns if some hashes have already been spilled to disk.
+
+        :return: Bool.
+        """
+        return self._spill_dir is not None
+
+    def add(self, hashes: np.ndarray) -> None:
+        """
+        Adds new hashes to the counter.
+
+        :param hashes: NumPy array with 64 bit hashes.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not len(hashes):
+            return
+        self._hashes.append(hashes)
+        self._hashes_in_memory += len(hashes)
+        if self._hashes_in_memory > self._spill_threshold:
+            self._spill()
+
+    def merge(self, other) -> None:
+        """
+        Merges the hashes of another counter into this one.
+
+        :param other: HashCounter object.
+        """
+        for hashes in other._hashes:
+            self.add(hashes)
+        if other.is_spilled:
+            for bucket in range(HASH_SPILL_BUCKETS):
+                bucket_path = other._get_bucket_path(bucket)
+                if os.path.exists(bucket_path):
+                    self._append_to_bucket(
+                        bucket, np.fromfile(bucket_path, dtype=np.uint64)
+                    )
+
+    def count_duplicated(self) -> int:
+        """
+        Returns how many of the added hashes appear more than once. Every occurrence of a
+        repeated hash is counted, not only the repetitions.
+
+        :return: Integer.
+        """
+        duplicated = 0
+        for hashes in self._iterate_buckets():
+            _, counts = np.unique(hashes, return_counts=True)
+            duplicated += int(counts[counts > 1].sum())
+        return duplicated
+
+    def get_duplicated(self) -> np.ndarray:
+        """
+        Returns the hashes that have been added more than once.
+
+        :return: NumPy array with unique 64 bit hashes.
+        """
+        duplicated = [np.empty(0, dtype=np.uint64)]
+        for hashes in self._iterate_buckets():
+            unique_hashes, counts = np.unique(hashes, return_counts=True)
+            duplicated.append(unique_hashes[counts > 1])
+        return np.concatenate(duplicated)
+
+    def save(self, path: os.path) -> None:
+        """
+        Appends every added hash to a binary file, so that the counter can be rebuilt
+        later on, see add_from_file().
+
+        :param path: Path of the file.
+        """
+        with open(path, "ab") as fp:
+            for hashes in self._iterate_buckets():
+                hashes.tofile(fp)
+
+    def add_from_file(self, path: os.path) -> None:
+        """
+        Adds the hashes stored in a binary file, reading it in blocks that never exceed
+        the spill threshold.
+
+        :param path: Path of the file.
+        """
+        with open(path, "rb") as fp:
+            while True:
+                hashes = np.fromfile(fp, dtype=np.uint64, count=self._spill_threshold)
+                if not len(hashes):
+                    break
+                self.add(hashes)
+
+    def close(self) -> None:
+        """
+        Frees memory and removes spilled files, if any.
+        """
+        self._hashes = list()
+        self._hashes_in_memory = 0
+        if self.is_spilled:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    def _get_bucket_path(self, bucket: int) -> os.path:
+        """
+        Returns the path of the file where a bucket is spilled.
+
+        :param bucket: Integer with the bucket number.
+
+        :return: Path.
+        """
+        return os.path.join(self._spill_dir, f"bucket_{bucket}.bin")
+
+    def _append_to_bucket(self, bucket: int, hashes: np.ndarray) -> None:
+        """
+        Appends hashes to the file of a bucket.
+
+        :param bucket: Integer with the bucket number.
+        :param hashes: NumPy array with hashes that belong to that bucket.
+        """
+        if not self.is_spilled:
+            self._spill_dir = tempfile.mkdtemp(prefix="deebee_hashes_")
+        with open(self._get_bucket_path(bucket), "ab") as fp:
+            hashes.tofile(fp)
+
+    def _spill(self) -> None:
+        """
+        Moves all hashes held in memory to their bucket files.
+        """
+        if not self._hashes:
+            return
+        hashes = np.concatenate(self._hashes)
+        buckets = hashes % np.uint64(HASH_SPILL_BUCKETS)
+        order = np.argsort(buckets, kind="stable")
+        hashes, buckets = hashes[order], buckets[order]
+        limits = np.searchsorted(
+            buckets, np.arange(HASH_SPILL_BUCKETS + 1, dtype=np.uint64)
+        )
+        for bucket in range(HASH_SPILL_BUCKETS):
+            start, end = limits[bucket], limits[bucket + 1]
+            if start < end:
+                self._append_to_bucket(bucket, hashes[start:end])
+        self._hashes = list()
+        self._hashes_in_memory = 0
+
+    def _iterate_buckets(self):
+        """
+        Yields arrays of hashes, in a way that all occurrences of a hash are always in the
+        same array.
+
+        :return: Generator of NumPy arrays.
+        """
+        if not self.is_spilled:
+            if self._hashes:
+                yield np.concatenate(self._hashes)
+            return
+        self._spill()
+        for bucket in range(HASH_SPILL_BUCKETS):
+            bucket_path = self._get_bucket_path(bucket)
+            if os.path.exists(bucket_path):
+                yield np.fromfile(bucket_path, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of hashes held in memory.
+
+        :return: Integer.
+        """
+        return self._hashes_in_memory
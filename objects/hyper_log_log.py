@@ -0,0 +1,86 @@
+import math
+import numpy as np
+
+from constants.validation_constants import SKETCH_HLL_PRECISION
+
+
+class HyperLogLog:
+    def __init__(self, precision: int = SKETCH_HLL_PRECISION) -> None:
+        """
+        Initializes HyperLogLog object. It estimates how many distinct 64 bit hashes
+        have been added, holding a fixed number of one byte registers no matter how
+        many hashes are added.
+
+        :param precision: Integer with the number of hash bits that choose a register.
+        There are 2 ** precision registers.
+        """
+        self._precision = precision
+        self._registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        """
+        Returns the relative standard error of the estimate.
+
+        :return: Float.
+        """
+        return 1.04 / math.sqrt(len(self._registers))
+
+    def add(self, hashes: np.ndarray) -> None:
+        """
+        Adds new hashes to the sketch. The first bits of a hash choose its register,
+        which keeps the highest position of the first set bit among the remaining ones.
+
+        :param hashes: NumPy array with 64 bit hashes.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not len(hashes):
+            return
+        registers = (hashes >> np.uint64(64 - self._precision)).astype(np.intp)
+        remaining = hashes << np.uint64(self._precision)
+        ranks = np.minimum(
+            _count_leading_zeros(remaining) + 1, 64 - self._precision + 1
+        ).astype(np.uint8)
+        np.maximum.at(self._registers, registers, ranks)
+
+    def merge(self, other) -> None:
+        """
+        Merges the registers of another sketch with the same precision into this one.
+
+        :param other: HyperLogLog object.
+        """
+        np.maximum(self._registers, other._registers, out=self._registers)
+
+    def estimate(self) -> float:
+        """
+        Returns the estimated number of distinct hashes. Small cardinalities are
+        estimated by linear counting of the empty registers.
+
+        :return: Float.
+        """
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw_estimate = alpha * m ** 2 / np.sum(2.0 ** -self._registers.astype(np.float64))
+        empty_registers = int(np.count_nonzero(self._registers == 0))
+        if raw_estimate <= 2.5 * m and empty_registers:
+            return m * math.log(m / empty_registers)
+        return float(raw_estimate)
+
+
+def _count_leading_zeros(values: np.ndarray) -> np.ndarray:
+    """
+    Counts the leading zero bits of 64 bit unsigned integers, halving the searched
+    width at every step.
+
+    :param values: NumPy array of 64 bit unsigned integers.
+
+    :return: NumPy array of integers, 64 where the value is zero.
+    """
+    values = values.copy()
+    zeros = np.zeros(len(values), dtype=np.int64)
+    for width in (32, 16, 8, 4, 2, 1):
+        is_short = values < (np.uint64(1) << np.uint64(64 - width))
+        zeros[is_short] += width
+        values[is_short] <<= np.uint64(width)
+    zeros[values == 0] = 64
+    return zeros
@@ -0,0 +1,138 @@
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from constants.validation_constants import (
+    ROW_HASH,
+    ROW_INDEX,
+    STAGING_EXTENSION,
+    COLUMN_KEY_METADATA,
+    EXPECTATION_METADATA
+)
+
+
+class UnexpectedRowsWriter:
+    def __init__(
+        self,
+        path: os.path,
+        columns: list,
+        expectation_id: str,
+        column_key: str,
+        keep_hashes=False
+    ) -> None:
+        """
+        Initializes UnexpectedRowsWriter object. It writes the unexpected rows of an
+        expectation to a Parquet file while the dataset is read chunk by chunk, one row
+        group per chunk, so that they never have to fit in memory. Every row holds its
+        index in the dataset and the values of the expectation columns, as strings.
+
+        Duplicated values are only known once every chunk has been seen, so uniqueness
+        expectations write every considered row, along with its hash, to a staging
+        file that is filtered when the writer is closed.
+
+        :param path: Path of the Parquet file.
+        :param columns: List with the columns the expectation works with.
+        :param expectation_id: String with GE's expectation ID.
+        :param column_key: String with the key of the expectation in the set config.
+        :param keep_hashes: Bool that tells if rows are staged until duplicated hashes
+        are known.
+        """
+        self._path = path
+        self._columns = columns
+        self._keep_hashes = keep_hashes
+        self._row_count = 0
+
+        fields = [pa.field(ROW_INDEX, pa.int64())]
+        fields += [pa.field(column, pa.string()) for column in columns]
+        self._schema = pa.schema(fields).with_metadata({
+            EXPECTATION_METADATA: expectation_id,
+            COLUMN_KEY_METADATA: column_key,
+        })
+        writer_path, writer_schema = path, self._schema
+        if keep_hashes:
+            writer_path = path + STAGING_EXTENSION
+            writer_schema = self._schema.append(pa.field(ROW_HASH, pa.uint64()))
+        self._writer = pq.ParquetWriter(writer_path, writer_schema)
+
+    @property
+    def path(self) -> os.path:
+        """
+        self._path getter.
+        """
+        return self._path
+
+    @property
+    def row_count(self) -> int:
+        """
+        self._row_count getter. Staged rows are only counted once they are known to be
+        unexpected.
+        """
+        return self._row_count
+
+    def write(self, row_indexes, values: pd.DataFrame, hashes=None) -> None:
+        """
+        Writes the unexpected rows of a chunk, or the staged ones for uniqueness
+        expectations.
+
+        :param row_indexes: Array with the indexes of the rows in the dataset.
+        :param values: Pandas DataFrame with the expectation columns of those rows.
+        :param hashes: NumPy array with the row hashes, only for staged rows.
+        """
+        if not len(values):
+            return
+        arrays = [pa.array(np.asarray(row_indexes, dtype=np.int64))]
+        for column in self._columns:
+            column_values = values[column]
+            arrays.append(pa.array(
+                column_values.astype(str).where(column_values.notna(), None),
+                type=pa.string(),
+                from_pandas=True
+            ))
+        if self._keep_hashes:
+            arrays.append(pa.array(np.asarray(hashes, dtype=np.uint64)))
+        else:
+            self._row_count += len(values)
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._writer.schema))
+
+    def close(self, duplicated_hashes=None) -> None:
+        """
+        Closes the Parquet file. Staged rows are filtered by their hash first, so that
+        only duplicated ones are kept.
+
+        :param duplicated_hashes: NumPy array with the hashes that appear more than
+        once, only for uniqueness expectations.
+        """
+        self._writer.close()
+        self._writer = None
+        if not self._keep_hashes:
+            return
+
+        staging_path = self._path + STAGING_EXTENSION
+        if duplicated_hashes is None:
+            duplicated_hashes = np.empty(0, dtype=np.uint64)
+        duplicated_hashes = pa.array(np.asarray(duplicated_hashes, dtype=np.uint64))
+        with pq.ParquetWriter(self._path, self._schema) as writer:
+            for batch in pq.ParquetFile(staging_path).iter_batches():
+                batch = batch.filter(pc.is_in(
+                    batch.column(ROW_HASH), value_set=duplicated_hashes
+                ))
+                self._row_count += batch.num_rows
+                writer.write_table(
+                    pa.Table.from_batches([batch]).drop_columns([ROW_HASH])
+                )
+        os.remove(staging_path)
+
+    def abort(self) -> None:
+        """
+        Closes the Parquet file, if it is still open, and removes it along with the
+        staging file, so that a validation that fails leaves no partial export.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for path in [self._path, self._path + STAGING_EXTENSION]:
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,163 @@
+import numpy as np
+
+from objects.bloom_filter import BloomFilter
+from objects.hyper_log_log import HyperLogLog
+
+from constants.validation_constants import SKETCH_BLOOM_CAPACITY, SKETCH_MAX_CANDIDATES
+
+
+class UniquenessSketch:
+    def __init__(
+        self, capacity: int = SKETCH_BLOOM_CAPACITY, max_candidates: int = SKETCH_MAX_CANDIDATES
+    ) -> None:
+        """
+        Initializes UniquenessSketch object. It takes the place of a HashCounter when
+        duplicated values have to be found in bounded memory. A HyperLogLog estimates
+        how many distinct hashes there are, and a Bloom filter flags the hashes that may
+        have been seen before. Those candidates are counted exactly in a second pass,
+        see count_candidates(), so that the final count is exact unless there were too
+        many of them to be kept.
+
+        :param capacity: Integer with the number of hashes the Bloom filter is sized
+        for.
+        :param max_candidates: Integer with the maximum number of candidate hashes kept
+        in memory.
+        """
+        self._max_candidates = max_candidates
+        self._hyper_log_log = HyperLogLog()
+        self._bloom_filter = BloomFilter(capacity)
+        self._candidates = list()
+        self._n_candidates = 0
+        self._has_overflowed = False
+        self._candidate_counts = None
+
+    @property
+    def hyper_log_log(self) -> HyperLogLog:
+        """
+        self._hyper_log_log getter.
+        """
+        return self._hyper_log_log
+
+    @property
+    def has_overflowed(self) -> bool:
+        """
+        self._has_overflowed getter.
+        """
+        return self._has_overflowed
+
+    @property
+    def needs_second_pass(self) -> bool:
+        """
+        Returns if the candidates have to be counted before duplicated values are known.
+
+        :return: Bool.
+        """
+        return not self._has_overflowed and self._candidate_counts is None and \
+            self._n_candidates > 0
+
+    @property
+    def is_exact(self) -> bool:
+        """
+        Returns if count_duplicated() returns the exact number of duplicated values.
+
+        :return: Bool.
+        """
+        return not self._has_overflowed and not self.needs_second_pass
+
+    def add(self, hashes: np.ndarray) -> None:
+        """
+        Adds new hashes to the sketch and keeps those that may be duplicated.
+
+        :param hashes: NumPy array with 64 bit hashes.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not len(hashes):
+            return
+        self._hyper_log_log.add(hashes)
+        candidates = hashes[self._bloom_filter.add_and_check(hashes)]
+        if self._has_overflowed or not len(candidates):
+            return
+        self._candidates.append(np.unique(candidates))
+        self._n_candidates += len(self._candidates[-1])
+        if self._n_candidates > self._max_candidates:
+            self._candidates = [np.unique(np.concatenate(self._candidates))]
+            self._n_candidates = len(self._candidates[0])
+            if self._n_candidates > self._max_candidates:
+                self._has_overflowed = True
+                self._candidates = list()
+                self._n_candidates = 0
+
+    def get_candidates(self) -> np.ndarray:
+        """
+        Returns the hashes that may be duplicated, sorted.
+
+        :return: NumPy array with unique 64 bit hashes.
+        """
+        if not self._candidates:
+            return np.empty(0, dtype=np.uint64)
+        self._candidates = [np.unique(np.concatenate(self._candidates))]
+        return self._candidates[0]
+
+    def count_candidates(self, hashes: np.ndarray) -> None:
+        """
+        Counts the occurrences of the candidate hashes among the given ones. Every hash
+        of the dataset has to be passed again, in as many calls as needed. The Bloom
+        filter is no longer needed, so it is freed.
+
+        :param hashes: NumPy array with 64 bit hashes.
+        """
+        candidates = self.get_candidates()
+        if self._candidate_counts is None:
+            self._bloom_filter = None
+            self._candidate_counts = np.zeros(len(candidates), dtype=np.int64)
+        if not len(candidates):
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        positions = np.minimum(np.searchsorted(candidates, hashes), len(candidates) - 1)
+        positions = positions[candidates[positions] == hashes]
+        self._candidate_counts += np.bincount(positions, minlength=len(candidates))
+
+    def count_duplicated(self) -> int:
+        """
+        Returns how many of the added hashes appear more than once, counting every
+        occurrence of a repeated hash. It is only exact once the candidates have been
+        counted and if they never overflowed, otherwise 0 is returned.
+
+        :return: Integer.
+        """
+        if not self.is_exact or self._candidate_counts is None:
+            return 0
+        return int(self._candidate_counts[self._candidate_counts > 1].sum())
+
+    def count_duplicated_values(self) -> int:
+        """
+        Returns how many distinct hashes have been added more than once, when they are
+        known, otherwise 0 is returned.
+
+        :return: Integer.
+        """
+        if not self.is_exact or self._candidate_counts is None:
+            return 0
+        return int(np.count_nonzero(self._candidate_counts > 1))
+
+    def get_duplicated(self) -> np.ndarray:
+        """
+        Returns the hashes that have been added more than once, when they are known and
+        the sketch has not been closed.
+
+        :return: NumPy array with unique 64 bit hashes.
+        """
+        if not self.is_exact or self._candidate_counts is None or not self._candidates:
+            return np.empty(0, dtype=np.uint64)
+        return self.get_candidates()[self._candidate_counts > 1]
+
+    def close(self) -> None:
+        """
+        Frees the Bloom filter and the candidates. The distinct count estimate and the
+        counts of duplicated hashes are kept.
+        """
+        if self._candidate_counts is not None:
+            self._candidate_counts = self._candidate_counts[self._candidate_counts > 1]
+        self._candidates = list()
+        self._n_candidates = 0
+        self._bloom_filter = None
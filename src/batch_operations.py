@@ -1,7 +1,40 @@
 import os
+import weakref
 
+from objects.ge_context_pool import GE_CONFIG_LOCK
+
+from constants.great_expectations_constants import DATASOURCE_NAME, DATASOURCE_CONFIG
+
+from src.hash_operations import get_content_hash
 from src.low_level_operations import ends_with
 
+# Hash of the config of every datasource registered in each context, so that each one
+# is only added once per process, unless its config changes
+_REGISTERED_DATASOURCES = weakref.WeakKeyDictionary()
+
+
+def register_datasource(
+    context, datasource_name=DATASOURCE_NAME, datasource_config=DATASOURCE_CONFIG
+) -> str:
+    """
+    Adds a datasource to Great Expectations' context, only if it has not been added
+    before with the same config. Adding a datasource rewrites GE's config file and
+    instantiates it again, so it is avoided whenever possible.
+
+    :param context: GE object.
+    :param datasource_name: String with the name of the datasource.
+    :param datasource_config: Dictionary with the config of the datasource.
+
+    :return: String with the name of the datasource.
+    """
+    config_hash = get_content_hash(datasource_config)
+    with GE_CONFIG_LOCK:
+        registered = _REGISTERED_DATASOURCES.setdefault(context, dict())
+        if registered.get(datasource_name) != config_hash:
+            context.add_datasource(datasource_name, **datasource_config)
+            registered[datasource_name] = config_hash
+    return datasource_name
+
 
 def get_batch_kwargs(context, dataset_path: os.path) -> dict:
     """
@@ -13,27 +46,12 @@ def get_batch_kwargs(context, dataset_path: os.path) -> dict:
 
     :return: Dictionary that contains GE batch kwargs.
     """
-    context.add_datasource("datasource", class_name="PandasDatasource")
+    datasource_name = register_datasource(context)
     reader_method = "read_csv" if ends_with(".csv", dataset_path) else "read_excel"
     return {
         "data_asset_name": "Dataset",
-        "datasource": "datasource",
+        "datasource": datasource_name,
         "path": dataset_path,
         "reader_method": reader_method,
     }
 
-
-def get_ge_batch(context, expectation_suite: dict, dataset_path: os.path):
-    """
-    Returns data batch, loaded from Expectation Suite name and dataset path.
-
-    :param context: GE object.
-    :param expectation_suite: GE's Expectation Suite object.
-    :param dataset_path: String with the path to the dataset that is used to create the
-    batch.
-
-    :return: GE's batch object.
-    """
-    batch_kwargs = get_batch_kwargs(context, dataset_path)
-    batch = context.get_batch(batch_kwargs, expectation_suite)
-    return batch
@@ -1,13 +1,38 @@
 import dash
+import base64
 import pandas as pd
 from dash import dcc
-import great_expectations as ge
+from dash import html
 from dash import Output, Input, State
 import dash_bootstrap_components as dbc
 from pandas.core.dtypes.common import is_string_dtype, is_numeric_dtype
 
+from objects.ge_context_pool import GEContextPool
+
 from constants.defaults import EMPTY_LIST, EMPTY_STRING
+from constants.expectation_set_constants import EXPECTATION_SET_NAME
 from constants.path_constants import GREAT_EXPECTATIONS_PATH
+from constants.validation_constants import (
+    MODE,
+    CONFIDENCE,
+    TOTAL_ROWS,
+    STATISTICS,
+    DATASET_NAME,
+    SAMPLED_ROWS,
+    SKETCH_MODE,
+    SAMPLING_MODE,
+    VALIDATED_ROWS,
+    EARLY_TERMINATED,
+    UNEXPECTED_ROWS,
+    TERMINATION_REASON,
+    GE_RESULT_EXTENSION,
+    INCREMENTAL_MODE,
+    EVALUATED_EXPECTATIONS,
+    UNDECIDED_EXPECTATIONS,
+    SAMPLE_CONFIDENCE_LEVEL,
+    SKETCH_CONFIDENCE_LEVEL,
+    SUCCESSFUL_EXPECTATIONS
+)
 from constants.supported_constants import SUPPORTED_CORRECTION_DATA_TYPES
 from constants.great_expectations_constants import (
     TYPE,
@@ -20,12 +45,13 @@ from constants.great_expectations_constants import (
     COLUMN_LIST,
     VALUE_SET_MULTI,
     VALUE_SET_SINGLE,
+    REFERENCE_COLUMN,
+    REFERENCE_DATASET,
     EXPECTATION_PARAMS,
     MULTICOLUMN_EXPECTATIONS_MAP,
     SINGLE_COLUMN_EXPECTATIONS_MAP,
 )
 
-from src.expectation_suite_operations import get_expectation_suite_name_object
 from src.dataset_operations import (
     delete_datasets,
     dataset_can_be_imported,
@@ -33,10 +59,25 @@ from src.dataset_operations import (
     get_imported_dataset_names, get_string_matching_dict, build_duplicates_removed_dataset_name,
     build_type_corrected_dataset_name
 )
-from src.validation_operations import (
-    validate_dataset,
-    get_validation_file_names,
-    move_validation_to_app_system
+from src.validation_operations import get_validation_file_names
+from src.validation_run_operations import run_validation
+from src.expectation_set_spec_operations import import_expectation_set_spec
+from src.unexpected_rows_operations import delete_unexpected_rows
+from src.validation_history_operations import (
+    get_expectation_trends,
+    forget_validation_files,
+    get_recorded_validation_file_names
+)
+from src.validation_render_operations import (
+    get_rendered_validation,
+    delete_rendered_validations
+)
+from src.validation_result_operations import (
+    read_validation_result,
+    is_validation_result_name,
+    is_ge_validation_result_name,
+    evaluate_validation_result,
+    get_validation_result_table
 )
 from src.utils import (
     get_value,
@@ -51,17 +92,21 @@ from src.front_end_operations import (
     is_trigger,
     hide_component,
     display_component,
+    get_checklist_values,
     open_file_in_browser,
+    build_expectation_trend_figure,
     refresh_imported_dataset_listing
 )
 from src.expectation_set_operations import (
     delete_expectation,
+    delete_expectation_set,
+    get_expectation_set_options,
     is_numeric_expectation,
+    get_expectation_set_interface_names,
     is_non_numeric_expectation,
     add_multicolumn_expectation,
     add_single_column_expectation,
     is_expectation_set_name_valid,
-    get_expectation_set_name_from_filename,
     check_existing_expectation_sets_integrity,
 )
 from src.low_level_operations import (
@@ -77,12 +122,10 @@ from src.low_level_operations import (
     is_profile_report_name,
     get_profile_report_path,
     get_profile_reports_path,
-    get_expectation_set_path,
     get_imported_dataset_path,
     get_uploaded_dataset_path,
     is_profile_report_available,
-    get_elements_inside_directory,
-    get_available_expectation_sets
+    get_elements_inside_directory
 )
 
 
@@ -95,9 +138,8 @@ def set_callbacks(app) -> dash.Dash:
     :return: Dash object with configured callbacks.
     """
 
-    ge_context = ge.data_context.DataContext(
-        context_root_dir=GREAT_EXPECTATIONS_PATH
-    )
+    # Every worker thread gets its own GE context
+    ge_context_pool = GEContextPool(GREAT_EXPECTATIONS_PATH)
 
     @app.callback(
         [
@@ -441,18 +483,9 @@ def set_callbacks(app) -> dash.Dash:
 
         elif is_trigger("delete_expectation_set_button"):
             for set_name in selected_sets:
-                set_path = get_expectation_set_path(set_name)
-                delete_file(set_path)
+                delete_expectation_set(set_name)
 
-        return (
-            sorted(
-                [
-                    get_expectation_set_name_from_filename(fn)
-                    for fn in get_available_expectation_sets()
-                ]
-            ),
-            EMPTY_LIST
-        )
+        return get_expectation_set_options(), EMPTY_LIST
 
     @app.callback(
         Output("single_column_expectation_definer_modal", "is_open"),
@@ -490,16 +523,16 @@ def set_callbacks(app) -> dash.Dash:
         :param set_name: Current name typed by the user.
         :param dataset_name: Currently selected dataset or table.
         :param current_expectations: List with current expectations.
-        :param sets_in_checklist: List with current expectation set names in expectation
-        sets checklist.
+        :param sets_in_checklist: List with current components of the expectation sets
+        checklist.
         :param modal_state: Current modal state.
 
         :return: Bool.
         """
         if is_trigger("new_single_column_expectation_button"):
             if is_expectation_set_name_valid(set_name):
-                if (set_name not in sets_in_checklist or current_expectations) \
-                        and dataset_name:
+                is_new_set = set_name not in get_checklist_values(sets_in_checklist)
+                if (is_new_set or current_expectations) and dataset_name:
                     modal_state = True
         else:
             modal_state = False
@@ -541,15 +574,16 @@ def set_callbacks(app) -> dash.Dash:
         :param set_name: Current name typed by the user.
         :param dataset_name: Currently selected dataset or table.
         :param current_expectations: List with current expectations.
-        :param sets_in_checklist: List with current expectation set names in expectation
-        sets checklist.
+        :param sets_in_checklist: List with current components of the expectation sets
+        checklist.
         :param modal_state: Current modal state.
 
         :return: Bool.
         """
         if is_trigger("new_multicolumn_expectation_button"):
             if is_expectation_set_name_valid(set_name):
-                if set_name not in sets_in_checklist or bool(current_expectations):
+                is_new_set = set_name not in get_checklist_values(sets_in_checklist)
+                if is_new_set or bool(current_expectations):
                     if dataset_name:
                         modal_state = True
         else:
@@ -583,7 +617,9 @@ def set_callbacks(app) -> dash.Dash:
             Output("table_column_b", "value"),
             Output("values_multicolumn_exp_param_input", "value"),
             Output("or_equal_checklist", "value"),
-            Output("table_columns_checklist", "value")
+            Output("table_columns_checklist", "value"),
+            Output("reference_dataset_exp_param_input", "value"),
+            Output("reference_column_exp_param_input", "value")
         ],
         [
             Input("new_single_column_expectation_button", "n_clicks"),
@@ -601,7 +637,7 @@ def set_callbacks(app) -> dash.Dash:
 
         :return: Empty elements to clear all inputs.
         """
-        return [EMPTY_STRING] * 11 + [EMPTY_LIST] * 2
+        return [EMPTY_STRING] * 11 + [EMPTY_LIST] * 2 + [EMPTY_STRING] * 2
 
     @app.callback(
         [
@@ -642,6 +678,39 @@ def set_callbacks(app) -> dash.Dash:
             table_columns, table_columns, table_column_a_options, table_column_b_options
         )
 
+    @app.callback(
+        Output("reference_dataset_exp_param_input", "options"),
+        Input("new_single_column_expectation_button", "n_clicks")
+    )
+    def find_reference_datasets(new_expectation: int) -> list:
+        """
+        Finds the imported datasets that can be referenced by a new expectation.
+
+        :param new_expectation: Number of clicks.
+
+        :return: List with dataset names.
+        """
+        return sorted(get_imported_dataset_names())
+
+    @app.callback(
+        Output("reference_column_exp_param_input", "options"),
+        Input("reference_dataset_exp_param_input", "value")
+    )
+    def find_reference_columns(reference_dataset_name: str) -> list:
+        """
+        Finds the columns of the dataset referenced by a new expectation.
+
+        :param reference_dataset_name: String with the name of the referenced dataset.
+
+        :return: List with dataset columns, but in case there is no referenced dataset,
+        it returns an empty list.
+        """
+        if not reference_dataset_name:
+            return EMPTY_LIST
+        dataset_path = get_imported_dataset_path(reference_dataset_name)
+        sep = infer_csv_separator(dataset_path)
+        return read_dataset(dataset_path, n_rows=2, sep=sep).columns.tolist()
+
     @app.callback(
         [
             Output("expectations_checklist_div", "style"),
@@ -705,7 +774,9 @@ def set_callbacks(app) -> dash.Dash:
             Output("length_exp_param_div", "style"),
             Output("values_single_column_exp_param_div", "style"),
             Output("min_value_exp_param_div", "style"),
-            Output("max_value_exp_param_div", "style")
+            Output("max_value_exp_param_div", "style"),
+            Output("reference_dataset_exp_param_div", "style"),
+            Output("reference_column_exp_param_div", "style")
         ],
         [
             Input("new_single_column_expectation_button", "n_clicks"),
@@ -716,7 +787,9 @@ def set_callbacks(app) -> dash.Dash:
             State("length_exp_param_div", "style"),
             State("values_single_column_exp_param_div", "style"),
             State("min_value_exp_param_div", "style"),
-            State("max_value_exp_param_div", "style")
+            State("max_value_exp_param_div", "style"),
+            State("reference_dataset_exp_param_div", "style"),
+            State("reference_column_exp_param_div", "style")
         ],
         prevent_initial_call=True
     )
@@ -728,7 +801,9 @@ def set_callbacks(app) -> dash.Dash:
         values_div_style: dict,
         min_value_div_style: dict,
         max_value_div_style: dict,
-    ) -> (dict, dict, dict, dict, dict):
+        reference_dataset_div_style: dict,
+        reference_column_div_style: dict,
+    ) -> (dict, dict, dict, dict, dict, dict, dict):
         """
         Shows or hides Divs that are meant to be the input for expectation parameters.
 
@@ -739,6 +814,8 @@ def set_callbacks(app) -> dash.Dash:
         :param values_div_style: Component style.
         :param min_value_div_style: Component style.
         :param max_value_div_style: Component style.
+        :param reference_dataset_div_style: Component style.
+        :param reference_column_div_style: Component style.
 
         :return: Dictionaries with styles for the mentioned Divs.
         """
@@ -747,7 +824,9 @@ def set_callbacks(app) -> dash.Dash:
             LENGTH: length_div_style,
             VALUE_SET_SINGLE: values_div_style,
             MIN_VALUE: min_value_div_style,
-            MAX_VALUE: max_value_div_style
+            MAX_VALUE: max_value_div_style,
+            REFERENCE_DATASET: reference_dataset_div_style,
+            REFERENCE_COLUMN: reference_column_div_style
         }
 
         if is_trigger("new_single_column_expectation_button") or not selected_expectation:
@@ -849,14 +928,22 @@ def set_callbacks(app) -> dash.Dash:
         return EMPTY_LIST
 
     @app.callback(
-        Output("expectations_checklist", "options"),
+        [
+            Output("expectations_checklist", "options"),
+            Output("expectation_set_spec_errors_div", "children"),
+            Output("expectation_set_spec_errors_div", "style")
+        ],
         [
             Input("open_expectation_set_definer_button", "n_clicks"),
             Input("add_single_column_expectation_button", "n_clicks"),
             Input("add_multicolumn_expectation_button", "n_clicks"),
-            Input("delete_expectation_button", "n_clicks")
+            Input("delete_expectation_button", "n_clicks"),
+            Input("expectation_set_spec_uploader", "contents")
         ],
         [
+            State("expectation_set_spec_uploader", "filename"),
+            State("imported_datasets_dropdown", "value"),
+            State("expectation_set_spec_errors_div", "style"),
             State("expectations_checklist", "options"),
             State("expectation_set_name_input", "value"),
             State("table_columns_dropdown", "value"),
@@ -872,7 +959,9 @@ def set_callbacks(app) -> dash.Dash:
             State("min_value_exp_param_input", "value"),
             State("max_value_exp_param_input", "value"),
             State("or_equal_checklist", "value"),
-            State("expectations_checklist", "value")
+            State("expectations_checklist", "value"),
+            State("reference_dataset_exp_param_input", "value"),
+            State("reference_column_exp_param_input", "value")
         ]
     )
     def update_set_expectations(
@@ -880,6 +969,10 @@ def set_callbacks(app) -> dash.Dash:
         add_single_column: int,
         add_multicolumn: int,
         delete: int,
+        spec_contents: str,
+        spec_file_name: str,
+        dataset_name: str,
+        spec_errors_style: dict,
         current_expectations: list,
         expectation_set_name: str,
         selected_table_column: str,
@@ -896,15 +989,23 @@ def set_callbacks(app) -> dash.Dash:
         max_value_input: str,
         or_equal: list,
         selected_expectations: list,
-    ) -> (list, dict):
+        reference_dataset_input: str,
+        reference_column_input: str,
+    ) -> (list, list, dict):
         """
         This callback adds or deletes expectations from an expectation set, using its
-        config.
+        config. Expectations can also be imported all at once from an uploaded spec,
+        whose errors are all shown together.
 
         :param open_set_definer: Number of clicks.
         :param add_single_column: Number of clicks.
         :param add_multicolumn: Number of clicks.
         :param delete: Number of clicks.
+        :param spec_contents: String with the base64 encoded content of the uploaded
+        spec.
+        :param spec_file_name: String with the name of the uploaded spec.
+        :param dataset_name: String with the name of the dataset the set is defined for.
+        :param spec_errors_style: Dictionary with the style of the spec errors div.
         :param selected_single_column_expectation_name: String with the interface name of
         the expectation that needs one single column.
         :param selected_multicolumn_expectation_name: String with the interface name of
@@ -931,9 +1032,31 @@ def set_callbacks(app) -> dash.Dash:
         :param or_equal: List that can be empty or have one single value.
         :param selected_table_columns: List with column names for those expectations that
         do not need a certain number of columns.
+        :param reference_dataset_input: String with the dataset referenced by the values
+        in another dataset expectation.
+        :param reference_column_input: String with the referenced column.
         """
+        spec_errors = EMPTY_LIST
         if is_trigger("open_expectation_set_definer_button"):
             current_expectations = list()
+        elif is_trigger("expectation_set_spec_uploader") and spec_contents:
+            if not expectation_set_name:
+                spec_errors = ["Give the expectation set a name before importing a spec"]
+            else:
+                _, spec_errors = import_expectation_set_spec(
+                    spec_file_name,
+                    base64.b64decode(spec_contents.split(",", 1)[1]),
+                    expectation_set_name,
+                    dataset_name
+                )
+            if not spec_errors:
+                current_expectations = current_expectations + [
+                    interface_name
+                    for interface_name in get_expectation_set_interface_names(
+                        expectation_set_name
+                    )
+                    if interface_name not in current_expectations
+                ]
         elif is_trigger("add_single_column_expectation_button"):
             add_single_column_expectation(
                 current_expectations,
@@ -944,7 +1067,9 @@ def set_callbacks(app) -> dash.Dash:
                 min_value_input,
                 max_value_input,
                 type_input,
-                values_single_input
+                values_single_input,
+                reference_dataset_input,
+                reference_column_input
             )
 
         elif is_trigger("add_multicolumn_expectation_button"):
@@ -964,7 +1089,13 @@ def set_callbacks(app) -> dash.Dash:
                 current_expectations, expectation_set_name, selected_expectations
             )
 
-        return current_expectations
+        spec_errors_style = dict(spec_errors_style or dict())
+        spec_errors_style["display"] = "block" if spec_errors else "none"
+        return (
+            current_expectations,
+            html.Ul([html.Li(error) for error in spec_errors]),
+            spec_errors_style
+        )
 
     @app.callback(
         Output("compatible_single_column_expectations_dropdown", "options"),
@@ -1005,7 +1136,11 @@ def set_callbacks(app) -> dash.Dash:
         return compatible_expectations
 
     @app.callback(
-        Output("validation_dropdown", "options"),
+        [
+            Output("validation_dropdown", "options"),
+            Output("validation_error_div", "children"),
+            Output("validation_error_div", "style")
+        ],
         [
             Input("validate_dataset_button", "n_clicks"),
             Input("delete_validations_button", "n_clicks")
@@ -1013,7 +1148,10 @@ def set_callbacks(app) -> dash.Dash:
         [
             State("imported_datasets_checklist", "value"),
             State("expectation_sets_checklist", "value"),
-            State("validation_confidence_input", "value")
+            State("validation_confidence_input", "value"),
+            State("validation_mode_dropdown", "value"),
+            State("export_unexpected_rows_checklist", "value"),
+            State("validation_error_div", "style")
         ]
     )
     def update_validation_listing(
@@ -1021,27 +1159,27 @@ def set_callbacks(app) -> dash.Dash:
         delete_validations: int,
         selected_datasets: list,
         selected_expectation_sets: list,
-        confidence: str
-    ) -> (list, str):
+        confidence: str,
+        mode: str,
+        export_unexpected_rows: list,
+        validation_error_style: dict
+    ) -> (list, str, dict):
         validations_path = get_validations_path()
 
-        dataset_name = EMPTY_STRING
+        validation_error = None
         if is_trigger("validate_dataset_button"):
             if list_has_one_item(selected_datasets)\
                     and list_has_one_item(selected_expectation_sets):
                 if not confidence:
                     confidence = "100"
                 if confidence.isnumeric():
-                    dataset_name = get_value(selected_datasets)
-                    expectation_set_name = get_value(selected_expectation_sets)
-                    expectation_name_object = get_expectation_suite_name_object(
-                        expectation_set_name
-                    )
-                    validate_dataset(
-                        ge_context,
-                        dataset_name,
-                        expectation_name_object,
-                        int(confidence)
+                    _, validation_error = run_validation(
+                        ge_context_pool,
+                        get_value(selected_datasets),
+                        get_value(selected_expectation_sets),
+                        int(confidence),
+                        mode,
+                        export_unexpected_rows=not is_list_empty(export_unexpected_rows)
                     )
 
         elif is_trigger("delete_validations_button"):
@@ -1049,12 +1187,17 @@ def set_callbacks(app) -> dash.Dash:
             for validation_name in current_validations:
                 validation_path = join_paths(validations_path, validation_name)
                 delete_file(validation_path)
+            delete_rendered_validations()
+            delete_unexpected_rows()
+            forget_validation_files()
 
-        move_validation_to_app_system(dataset_name, confidence)
-
-        available_validations = sorted(get_validation_file_names())
+        available_validations = get_recorded_validation_file_names()
 
-        return available_validations
+        if validation_error is None:
+            validation_error_style = hide_component(validation_error_style)
+        else:
+            validation_error_style = display_component(validation_error_style)
+        return available_validations, validation_error, validation_error_style
 
     @app.callback(
         Output("validation_operations_div", "style"),
@@ -1129,6 +1272,96 @@ def set_callbacks(app) -> dash.Dash:
         """
         return "100"
 
+    @app.callback(
+        [
+            Output("validation_evaluation_container_div", "style"),
+            Output("validation_evaluation_div", "children")
+        ],
+        [
+            Input("validation_dropdown", "value"),
+            Input("validation_confidence_slider", "value")
+        ],
+        State("validation_evaluation_container_div", "style")
+    )
+    def evaluate_selected_validation(
+        selected_validation: str, confidence: int, container_style: dict
+    ) -> (dict, list):
+        """
+        Evaluates the selected validation result at the confidence chosen with the
+        slider. Only threshold independent results can be evaluated, so no data is read
+        again.
+
+        :param selected_validation: String with selected validation name.
+        :param confidence: Integer with confidence ranging from 0 to 100.
+        :param container_style: Dictionary with current style of the Div containing the
+        slider and the evaluation.
+
+        :return: Dictionary with updated style, and the evaluation components.
+        """
+        if not is_validation_result_name(selected_validation):
+            return hide_component(container_style), EMPTY_LIST
+
+        evaluated_result = evaluate_validation_result(
+            read_validation_result(selected_validation), confidence
+        )
+        statistics = evaluated_result[STATISTICS]
+        summary = (
+            f"{statistics[SUCCESSFUL_EXPECTATIONS]} of "
+            f"{statistics[EVALUATED_EXPECTATIONS]} expectations succeed at "
+            f"{evaluated_result[CONFIDENCE]}% confidence."
+        )
+        if evaluated_result[CONFIDENCE] != confidence:
+            summary += " This result can only be evaluated at the confidence it ran at."
+        if evaluated_result.get(MODE) == SAMPLING_MODE:
+            summary += (
+                f" Estimated from {evaluated_result[SAMPLED_ROWS]} of "
+                f"{evaluated_result[TOTAL_ROWS]} rows, with "
+                f"{round(100 * SAMPLE_CONFIDENCE_LEVEL)}% confidence intervals."
+            )
+        if evaluated_result.get(MODE) == INCREMENTAL_MODE:
+            summary += (
+                f" {evaluated_result[VALIDATED_ROWS]} of "
+                f"{evaluated_result[TOTAL_ROWS]} rows were validated in the last run."
+            )
+        if evaluated_result.get(EARLY_TERMINATED):
+            summary += (
+                f" Validation stopped after {evaluated_result[VALIDATED_ROWS]} rows: "
+                f"{evaluated_result[TERMINATION_REASON]}."
+            )
+        if evaluated_result.get(UNEXPECTED_ROWS):
+            summary += (
+                f" Unexpected rows were exported to "
+                f"{evaluated_result[UNEXPECTED_ROWS]}."
+            )
+        if evaluated_result.get(MODE) == SKETCH_MODE:
+            summary += (
+                f" Uniqueness was checked with sketches, and estimated results come with "
+                f"{round(100 * SKETCH_CONFIDENCE_LEVEL)}% bounds."
+            )
+        if statistics[UNDECIDED_EXPECTATIONS]:
+            undecided_reason = "from their bounds" \
+                if evaluated_result.get(MODE) == SKETCH_MODE else "on a sample"
+            summary += (
+                f" {statistics[UNDECIDED_EXPECTATIONS]} expectations cannot be decided "
+                f"{undecided_reason}."
+            )
+        table = dbc.Table.from_dataframe(
+            get_validation_result_table(evaluated_result),
+            striped=True,
+            bordered=True,
+            hover=True,
+            size="sm"
+        )
+        evaluation = [html.P(summary), table]
+
+        # Past runs of the same dataset and expectation set, if any
+        trends = get_expectation_trends(
+            evaluated_result[DATASET_NAME], evaluated_result[EXPECTATION_SET_NAME]
+        )
+        if trends["run_time"].nunique() > 1:
+            evaluation.append(dcc.Graph(figure=build_expectation_trend_figure(trends)))
+        return display_component(container_style), evaluation
+
     @app.callback(
         Output("open_validation_result_output_div", "children"),
         Input("open_validation_result_button", "n_clicks"),
@@ -1137,12 +1370,16 @@ def set_callbacks(app) -> dash.Dash:
     )
     def open_validation_result(open_validation: int, selected_validation: str) -> None:
         """
-        Opens validation result in a new browser tab.
+        Opens validation result in a new browser tab. Great Expectations' results are
+        rendered as a page the first time they are opened.
 
         :param open_validation: Number of clicks.
         :param selected_validation: String with selected result to be opened.
         """
-        validation_path = get_validation_path(selected_validation)
+        if is_ge_validation_result_name(selected_validation):
+            validation_path = get_rendered_validation(selected_validation)
+        else:
+            validation_path = get_validation_path(selected_validation)
         open_file_in_browser(validation_path)
 
     @app.callback(
@@ -1160,6 +1397,11 @@ def set_callbacks(app) -> dash.Dash:
 
         :return: Downloader data object.
         """
+        if is_ge_validation_result_name(selected_validation):
+            return dcc.send_file(
+                get_rendered_validation(selected_validation),
+                filename=selected_validation[:-len(GE_RESULT_EXTENSION)] + ".html"
+            )
         validation_path = get_validation_path(selected_validation)
         return dcc.send_file(validation_path)
 
@@ -0,0 +1,583 @@
+import os
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+from objects.hash_counter import HashCounter
+from objects.expectation_plan import ExpectationPlan
+from objects.expectation_state import ExpectationState
+from objects.compiled_expectation import CompiledExpectation
+from objects.unexpected_rows_writer import UnexpectedRowsWriter
+from objects.expectation_suite_name import ExpectationSuiteName
+
+from constants.expectation_set_constants import (
+    PARAMETERS,
+    EXPECTATIONS,
+    EXPECTATION_NAME,
+    EXPECTATION_SET_NAME
+)
+from constants.great_expectations_constants import (
+    TYPE,
+    LENGTH,
+    OR_EQUAL,
+    MIN_VALUE,
+    MAX_VALUE,
+    VALUE_SET_MULTI,
+    VALUE_SET_SINGLE,
+    REFERENCE_COLUMN,
+    REFERENCE_DATASET
+)
+from constants.validation_constants import (
+    MODE,
+    RESULT,
+    RESULTS,
+    RUN_TIME,
+    CHUNK_SIZE,
+    COLUMN_KEY,
+    NULL_MASK,
+    CONFIDENCE,
+    NATIVE_TYPES,
+    DATASET_NAME,
+    CHUNKED_MODE,
+    OBSERVED_MIN,
+    OBSERVED_MAX,
+    VALUE_HASHES,
+    ELEMENT_COUNT,
+    MISSING_COUNT,
+    VALUE_LENGTHS,
+    NUMERIC_VALUES,
+    UNEXPECTED_ROWS,
+    UNEXPECTED_COUNT,
+    UNEXPECTED_FRACTION,
+    UNIQUENESS_EXPECTATIONS
+)
+
+from src.parallel_operations import map_in_parallel
+from src.value_set_operations import is_in_value_set
+from src.reference_index_operations import get_reference_index, is_in_reference_index
+from src.validation_operations import is_dataset_compatible
+from src.low_level_operations import get_imported_dataset_path
+from src.validation_result_operations import get_unexpected_fraction
+from src.utils import infer_csv_separator, read_dataset_in_chunks
+from src.expectation_set_operations import get_expectation_set_config
+from src.expectation_plan_operations import compile_expectation_plan
+from src.unexpected_rows_operations import (
+    get_unexpected_rows_path,
+    build_unexpected_rows_writers,
+    abort_unexpected_rows_export
+)
+from src.validation_plan_operations import combine_hashes, compute_intermediates
+
+
+def get_considered_rows_mask(
+    expectation_id: str, columns: list, intermediates: dict
+) -> np.ndarray:
+    """
+    Returns which rows of the chunk have to be considered by an expectation, following
+    Great Expectations' defaults: nulls are ignored by single column expectations, and
+    rows where every value is missing are ignored by multicolumn ones.
+
+    :param expectation_id: String with GE's expectation ID.
+    :param columns: List with the columns the expectation works with.
+    :param intermediates: Dictionary with the intermediates of the chunk.
+
+    :return: Boolean NumPy array.
+    """
+    null_masks = [intermediates[column][NULL_MASK] for column in columns]
+    if expectation_id == "expect_column_values_to_not_be_null":
+        return np.ones(len(null_masks[0]), dtype=bool)
+    return ~np.logical_and.reduce(null_masks)
+
+
+def get_not_null_unexpected_mask(
+    chunk: pd.DataFrame, columns: list, parameters: dict, intermediates: dict
+) -> np.ndarray:
+    """
+    Returns the unexpected rows for "Values to not be null".
+
+    :param chunk: Pandas DataFrame.
+    :param columns: List with column names.
+    :param parameters: Mapping with the typed expectation parameters.
+    :param intermediates: Dictionary with the intermediates of the chunk.
+
+    :return: Boolean NumPy array.
+    """
+    return intermediates[columns[0]][NULL_MASK]
+
+
+def get_in_set_unexpected_mask(
+    chunk: pd.DataFrame, columns: list, parameters: dict, intermediates: dict
+) -> np.ndarray:
+    """
+    Returns the unexpected rows for "Values to be in set".
+
+    :param chunk: Pandas DataFrame.
+    :param columns: List with column names.
+    :param parameters: Mapping with the typed expectation parameters.
+    :param intermediates: Dictionary with the intermediates of the chunk.
+
+    :return: Boolean NumPy array.
+    """
+    return ~is_in_value_set(chunk[columns[0]], parameters[VALUE_SET_SINGLE])
+
+
+def get_of_type_unexpected_mask(
+    chunk: pd.DataFrame, columns: list, parameters: dict, intermediates: dict
+) -> np.ndarray:
+    """
+    Returns the unexpected rows for "Values to be of type". Columns that hold objects
+    are checked value by value, any other column is checked by its data type.
+
+    :param chunk: Pandas DataFrame.
+    :param columns: List with column names.
+    :param parameters: Mapping with the typed expectation parameters.
+    :param intermediates: Dictionary with the intermediates of the chunk.
+
+    :return: Boolean NumPy array.
+    """
+    values = chunk[columns[0]]
+    type_name = parameters[TYPE]
+    if values.dtype == object or pd.api.types.is_string_dtype(values):
+        native_types = NATIVE_TYPES[type_name]
+        return ~values.map(lambda v: isinstance(v, native_types)).astype(bool).to_numpy()
+    return np.full(len(values), values.dtype.type != np.dtype(type_name).type)
+
+
+def get_between_unexpected_mask(
+    chunk: pd.DataFrame, columns: list, parameters: dict, intermediates: dict
+) -> np.ndarray:
+    """
+    Returns the unexpected rows for "Values to be between". Non numeric values are
+    unexpected.
+
+    :param chunk: Pandas DataFrame.
+    :param columns: List with column names.
+    :param parameters: Mapping with the typed expectation parameters.
+    :param intermediates: Dictionary with the intermediates of the chunk.
+
+    :return: Boolean NumPy array.
+    """
+    values = intermediates[columns[0]][NUMERIC_VALUES]
+    mask = values.isna()
+    if parameters.get(MIN_VALUE) is not None:
+        mask |= values < parameters[MIN_VALUE]
+    if parameters.get(MAX_VALUE) is not None:
+        mask |= values > parameters[MAX_VALUE]
+    return mask.to_numpy()
+
+
+def get_lengths_unexpected_mask(
+    chunk: pd.DataFrame, columns: list, parameters: dict, intermediates: dict
+) -> np.ndarray:
+    """
+    Returns the unexpected rows for "Value lengths to equal".
+
+    :param chunk: Pandas DataFrame.
+    :param columns: List with column names.
+    :param parameters: Mapping with the typed expectation parameters.
+    :param intermediates: Dictionary with the intermediates of the chunk.
+
+    :return: Boolean NumPy array.
+    """
+    return (intermediates[columns[0]][VALUE_LENGTHS] != parameters[LENGTH]).to_numpy()
+
+
+def get_a_greater_than_b_unexpected_mask(
+    chunk: pd.DataFrame, columns: list, parameters: dict, intermediates: dict
+) -> np.ndarray:
+    """
+    Returns the unexpected rows for "Values in first to be greater than in second".
+    Values that cannot be compared are unexpected.
+
+    :param chunk: Pandas DataFrame.
+    :param columns: List with column names.
+    :param parameters: Mapping with the typed expectation parameters.
+    :param intermediates: Dictionary with the intermediates of the chunk.
+
+    :return: Boolean NumPy array.
+    """
+    column_a, column_b = chunk[columns[0]], chunk[columns[1]]
+    try:
+        if parameters.get(OR_EQUAL):
+            return ~(column_a >= column_b).to_numpy()
+        return ~(column_a > column_b).to_numpy()
+    except TypeError:
+        return np.ones(len(chunk), dtype=bool)
+
+
+def get_pair_in_set_unexpected_mask(
+    chunk: pd.DataFrame, columns: list, parameters: dict, intermediates: dict
+) -> np.ndarray:
+    """
+    Returns the unexpected rows for "Values from columns to be in set".
+
+    :param chunk: Pandas DataFrame.
+    :param columns: List with column names.
+    :param parameters: Mapping with the typed expectation parameters.
+    :param intermediates: Dictionary with the intermediates of the chunk.
+
+    :return: Boolean NumPy array.
+    """
+    pairs = pd.MultiIndex.from_arrays([chunk[columns[0]], chunk[columns[1]]])
+    return ~pairs.isin(parameters[VALUE_SET_MULTI])
+
+
+def get_in_other_dataset_unexpected_mask(
+    chunk: pd.DataFrame, columns: list, parameters: dict, intermediates: dict
+) -> np.ndarray:
+    """
+    Returns the unexpected rows for "Values to exist in another dataset". Value hashes
+    are looked up in the index of the referenced column.
+
+    :param chunk: Pandas DataFrame.
+    :param columns: List with column names.
+    :param parameters: Mapping with the typed expectation parameters.
+    :param intermediates: Dictionary with the intermediates of the chunk.
+
+    :return: Boolean NumPy array.
+    """
+    reference_index = get_reference_index(
+        parameters[REFERENCE_DATASET], parameters[REFERENCE_COLUMN]
+    )
+    return ~is_in_reference_index(intermediates[columns[0]][VALUE_HASHES], reference_index)
+
+
+UNEXPECTED_MASK_FUNCTIONS = {
+    "expect_column_values_to_not_be_null": get_not_null_unexpected_mask,
+    "expect_column_values_to_be_in_set": get_in_set_unexpected_mask,
+    "expect_column_values_to_be_of_type": get_of_type_unexpected_mask,
+    "expect_column_values_to_be_between": get_between_unexpected_mask,
+    "expect_column_value_lengths_to_equal": get_lengths_unexpected_mask,
+    "expect_column_values_to_be_in_other_dataset": get_in_other_dataset_unexpected_mask,
+    "expect_column_pair_values_A_to_be_greater_than_B": get_a_greater_than_b_unexpected_mask,
+    "expect_column_pair_values_to_be_in_set": get_pair_in_set_unexpected_mask,
+}
+
+
+def get_observed_range(
+    expectation_id: str, columns: list, considered: np.ndarray, intermediates: dict
+) -> tuple:
+    """
+    Returns the minimum and maximum observed values, for those expectations where they
+    are meaningful: numeric values for ranges and lengths for value lengths.
+
+    :param expectation_id: String with GE's expectation ID.
+    :param columns: List with column names.
+    :param considered: Boolean NumPy array with the considered rows.
+    :param intermediates: Dictionary with the intermediates of the chunk.
+
+    :return: Tuple with minimum and maximum, which can be None.
+    """
+    if expectation_id == "expect_column_values_to_be_between":
+        values = intermediates[columns[0]][NUMERIC_VALUES][considered].dropna()
+    elif expectation_id == "expect_column_value_lengths_to_equal":
+        values = intermediates[columns[0]][VALUE_LENGTHS][considered].astype("int64")
+    else:
+        return None, None
+    if values.empty:
+        return None, None
+    return values.min().item(), values.max().item()
+
+
+def get_row_hashes(columns: list, intermediates: dict) -> np.ndarray:
+    """
+    Returns a 64 bit hash for each row of the given columns, made from the value
+    hashes already computed for the chunk.
+
+    :param columns: List with column names.
+    :param intermediates: Dictionary with the intermediates of the chunk.
+
+    :return: NumPy array of unsigned integers.
+    """
+    return combine_hashes([intermediates[column][VALUE_HASHES] for column in columns])
+
+
+def get_empty_expectation_state(expectation_id: str) -> ExpectationState:
+    """
+    Returns a new state for the given expectation.
+
+    :param expectation_id: String with GE's expectation ID.
+
+    :return: ExpectationState object.
+    """
+    if expectation_id in UNIQUENESS_EXPECTATIONS:
+        return ExpectationState(HashCounter())
+    return ExpectationState()
+
+
+def update_expectation_state(
+    state: ExpectationState,
+    chunk: pd.DataFrame,
+    expectation: CompiledExpectation,
+    intermediates: dict,
+    unexpected_rows_writer: UnexpectedRowsWriter = None
+) -> None:
+    """
+    Updates the state of an expectation with the rows of a new chunk.
+
+    :param state: ExpectationState object.
+    :param chunk: Pandas DataFrame.
+    :param expectation: CompiledExpectation object.
+    :param intermediates: Dictionary with the intermediates of the chunk, see
+    compute_intermediates().
+    :param unexpected_rows_writer: UnexpectedRowsWriter object where the unexpected
+    rows of the chunk are written, if any.
+    """
+    expectation_id = expectation.expectation_id
+    columns = list(expectation.columns)
+
+    considered = get_considered_rows_mask(expectation_id, columns, intermediates)
+    missing_count = len(chunk) - int(considered.sum())
+
+    if expectation_id in UNIQUENESS_EXPECTATIONS:
+        hashes = get_row_hashes(columns, intermediates)[considered]
+        state.update(len(chunk), missing_count, 0, hashes=hashes)
+        if unexpected_rows_writer is not None:
+            unexpected_rows_writer.write(
+                chunk.index[considered], chunk[columns][considered], hashes
+            )
+    else:
+        unexpected_mask = UNEXPECTED_MASK_FUNCTIONS[expectation_id](
+            chunk, columns, expectation.parameters, intermediates
+        )
+        unexpected_mask = unexpected_mask & considered
+        observed_min, observed_max = get_observed_range(
+            expectation_id, columns, considered, intermediates
+        )
+        state.update(
+            len(chunk),
+            missing_count,
+            int(unexpected_mask.sum()),
+            observed_min=observed_min,
+            observed_max=observed_max
+        )
+        if unexpected_rows_writer is not None:
+            unexpected_rows_writer.write(
+                chunk.index[unexpected_mask], chunk[columns][unexpected_mask]
+            )
+
+
+def update_expectation_states(
+    chunk: pd.DataFrame, states: list, intermediates: dict, unexpected_rows_writers=None
+) -> None:
+    """
+    Updates the states of the expectations of a set with the rows of a new chunk.
+    Expectations are grouped by their column key and groups run in parallel, while
+    each group runs its expectations in config order. Every state belongs to a single
+    group, so no state is ever updated by two threads.
+
+    :param chunk: Pandas DataFrame.
+    :param states: List with the states, see build_expectation_states().
+    :param intermediates: Dictionary with the intermediates of the chunk.
+    :param unexpected_rows_writers: List with an UnexpectedRowsWriter object for each
+    state, or None if unexpected rows are not exported.
+    """
+    groups = dict()
+    for position, (column_key, _, _) in enumerate(states):
+        groups.setdefault(column_key, list()).append(position)
+
+    def update_group(positions: list) -> None:
+        for position in positions:
+            _, expectation, state = states[position]
+            update_expectation_state(
+                state,
+                chunk,
+                expectation,
+                intermediates,
+                unexpected_rows_writers[position] if unexpected_rows_writers else None
+            )
+
+    map_in_parallel(update_group, list(groups.values()))
+
+
+def build_expectation_result(
+    expectation: CompiledExpectation, state: ExpectationState
+) -> dict:
+    """
+    Builds the threshold independent result of a single expectation from its final
+    state. Whether it succeeds is decided later, for any confidence. Parameters are
+    reported as they are stored in the set.
+
+    :param expectation: CompiledExpectation object.
+    :param state: Finalized ExpectationState object.
+
+    :return: Dictionary with the result.
+    """
+    return {
+        EXPECTATION_NAME: expectation.expectation_id,
+        COLUMN_KEY: expectation.column_key,
+        PARAMETERS: expectation.raw_parameters,
+        RESULT: {
+            ELEMENT_COUNT: state.element_count,
+            MISSING_COUNT: state.missing_count,
+            UNEXPECTED_COUNT: state.unexpected_count,
+            UNEXPECTED_FRACTION: get_unexpected_fraction(
+                state.element_count, state.missing_count, state.unexpected_count
+            ),
+            OBSERVED_MIN: state.observed_min,
+            OBSERVED_MAX: state.observed_max,
+        }
+    }
+
+
+def build_expectation_states(plan: ExpectationPlan) -> list:
+    """
+    Returns an empty state for every expectation of a set, in config order.
+
+    :param plan: ExpectationPlan object of the set.
+
+    :return: List with tuples of column key, CompiledExpectation and ExpectationState.
+    """
+    return [
+        (
+            expectation.column_key,
+            expectation,
+            get_empty_expectation_state(expectation.expectation_id)
+        )
+        for expectation in plan.expectations
+    ]
+
+
+def validate_chunks(
+    chunks, plan: ExpectationPlan, states: list, unexpected_rows_writers=None
+) -> int:
+    """
+    Updates the states of the expectations of a set with a sequence of chunks.
+
+    :param chunks: Iterable of Pandas DataFrames.
+    :param plan: ExpectationPlan object of the set.
+    :param states: List with the states, see build_expectation_states().
+    :param unexpected_rows_writers: List with an UnexpectedRowsWriter object for each
+    state, or None if unexpected rows are not exported.
+
+    :return: Integer with the number of rows read.
+    """
+    # Intermediates shared by several expectations are computed once per chunk
+    n_rows = 0
+    for chunk in chunks:
+        n_rows += len(chunk)
+        intermediates = compute_intermediates(chunk, plan.intermediates)
+        update_expectation_states(chunk, states, intermediates, unexpected_rows_writers)
+    return n_rows
+
+
+def finalize_expectation_states(states: list, unexpected_rows_writers=None) -> list:
+    """
+    Finalizes the states of the expectations of a set and builds their results.
+
+    :param states: List with the states, see build_expectation_states().
+    :param unexpected_rows_writers: List with an UnexpectedRowsWriter object for each
+    state, or None if unexpected rows are not exported. They are closed.
+
+    :return: List with dictionaries of expectation results, in config order.
+    """
+    expectation_results = list()
+    for position, (_, expectation, state) in enumerate(states):
+        if unexpected_rows_writers:
+            # Duplicated hashes have to be known before the state frees them
+            unexpected_rows_writers[position].close(
+                state.hash_counter.get_duplicated()
+                if state.hash_counter is not None else None
+            )
+        state.finalize()
+        expectation_results.append(build_expectation_result(expectation, state))
+    return expectation_results
+
+
+def validate_expectations_in_chunks(
+    dataset_path: os.path, expectations_from_set_config: dict, chunk_size=CHUNK_SIZE
+) -> list:
+    """
+    Validates some expectations on a dataset, reading in chunks only the columns they
+    work with.
+
+    :param dataset_path: Path of the dataset.
+    :param expectations_from_set_config: Dictionary with the expectations, in the same
+    format as the expectations of a set.
+    :param chunk_size: Maximum number of rows in each chunk.
+
+    :return: List with dictionaries of threshold independent expectation results, in
+    config order.
+    """
+    plan = compile_expectation_plan(expectations_from_set_config)
+    states = build_expectation_states(plan)
+    separator = infer_csv_separator(dataset_path)
+    validate_chunks(
+        read_dataset_in_chunks(
+            dataset_path,
+            sep=separator,
+            chunk_size=chunk_size,
+            columns=list(plan.intermediates)
+        ),
+        plan,
+        states
+    )
+    return finalize_expectation_states(states)
+
+
+def validate_dataset_in_chunks(
+    dataset_name: str,
+    expectation_name_object: ExpectationSuiteName,
+    chunk_size=CHUNK_SIZE,
+    export_unexpected_rows=False
+) -> dict or None:
+    """
+    This function validates a dataset against an expectation set without loading the
+    whole dataset in memory. Rows are read in chunks, and each expectation keeps a
+    mergeable state that is finally turned into its result. The result does not
+    depend on any confidence, see evaluate_validation_result().
+
+    Unexpected rows can also be exported, in the same pass, to a Parquet file per
+    expectation, see build_unexpected_rows_writers().
+
+    :param dataset_name: String with the name of the dataset to be validated.
+    :param expectation_name_object: Expectation set name.
+    :param chunk_size: Maximum number of rows in each chunk.
+    :param export_unexpected_rows: Bool that tells if unexpected rows are exported.
+
+    :return: Dictionary with the validation result, or None if the dataset is not
+    compatible with the expectation set.
+    """
+    dataset_path = get_imported_dataset_path(dataset_name)
+
+    config = get_expectation_set_config(expectation_name_object.name)
+    expectations_from_set_config = config.get(EXPECTATIONS)
+
+    if not is_dataset_compatible(dataset_path, expectations_from_set_config):
+        return None
+
+    plan = compile_expectation_plan(expectations_from_set_config)
+    states = build_expectation_states(plan)
+    unexpected_rows_path = unexpected_rows_writers = None
+    if export_unexpected_rows:
+        unexpected_rows_path = get_unexpected_rows_path(
+            dataset_name, expectation_name_object.name
+        )
+        unexpected_rows_writers = build_unexpected_rows_writers(
+            unexpected_rows_path, states
+        )
+
+    # A failed validation closes its Parquet files and removes the partial export
+    separator = infer_csv_separator(dataset_path)
+    try:
+        validate_chunks(
+            read_dataset_in_chunks(dataset_path, sep=separator, chunk_size=chunk_size),
+            plan,
+            states,
+            unexpected_rows_writers
+        )
+        expectation_results = finalize_expectation_states(states, unexpected_rows_writers)
+    except BaseException:
+        if unexpected_rows_writers is not None:
+            abort_unexpected_rows_export(unexpected_rows_path, unexpected_rows_writers)
+        raise
+
+    return {
+        EXPECTATION_SET_NAME: expectation_name_object.name,
+        DATASET_NAME: dataset_name,
+        CONFIDENCE: None,
+        MODE: CHUNKED_MODE,
+        RUN_TIME: str(datetime.now()),
+        UNEXPECTED_ROWS: unexpected_rows_path,
+        RESULTS: expectation_results,
+    }
@@ -1,8 +1,17 @@
+import os
+import threading
 import pandas as pd
 from rapidfuzz import fuzz
 
-from constants.supported_constants import SUPPORTED_DATASET_TYPES
+from constants.supported_constants import (
+    OTHER_COLUMN,
+    STRING_COLUMN,
+    NUMERIC_COLUMN,
+    SCHEMA_SAMPLE_ROWS,
+    SUPPORTED_DATASET_TYPES
+)
 
+from src.utils import read_dataset, infer_csv_separator
 from src.low_level_operations import (
     ends_with,
     delete_file,
@@ -11,6 +20,11 @@ from src.low_level_operations import (
     get_elements_inside_directory
 )
 
+# Schemas of imported datasets, together with the size and modification time of the
+# file they were inferred from
+_SCHEMAS = dict()
+_SCHEMAS_LOCK = threading.Lock()
+
 
 def dataset_can_be_imported(dataset_name: str) -> bool:
     """
@@ -202,3 +216,45 @@ def get_string_matching_dict(
         )
 
     return matching_dict
+
+
+def get_column_kind(values: pd.Series) -> str:
+    """
+    Returns the kind of a dataset column, which tells the expectations it can have.
+
+    :param values: Pandas Series.
+
+    :return: String with the column kind.
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return NUMERIC_COLUMN
+    if pd.api.types.is_string_dtype(values):
+        return STRING_COLUMN
+    return OTHER_COLUMN
+
+
+def get_dataset_schema(dataset_name: str) -> dict:
+    """
+    Returns the kind of every column of an imported dataset. Schemas are inferred from
+    the first rows of the dataset, and inferred again only if its file changes.
+
+    :param dataset_name: String with the name of the dataset.
+
+    :return: Dictionary whose keys are column names and whose values are column kinds,
+    or None if the dataset is not imported.
+    """
+    dataset_path = get_imported_dataset_path(dataset_name)
+    if not os.path.isfile(dataset_path):
+        return None
+    stat = os.stat(dataset_path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    with _SCHEMAS_LOCK:
+        known_signature, schema = _SCHEMAS.get(dataset_path, (None, None))
+        if known_signature == signature:
+            return schema
+
+        separator = infer_csv_separator(dataset_path)
+        sample = read_dataset(dataset_path, sep=separator, n_rows=SCHEMA_SAMPLE_ROWS)
+        schema = {column: get_column_kind(sample[column]) for column in sample.columns}
+        _SCHEMAS[dataset_path] = (signature, schema)
+        return schema
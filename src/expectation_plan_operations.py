@@ -0,0 +1,204 @@
+import threading
+
+from objects.expectation_plan import ExpectationPlan
+from objects.compiled_expectation import CompiledExpectation
+
+from constants.expectation_set_constants import PARAMETERS, EXPECTATION_NAME
+from constants.great_expectations_constants import (
+    TYPE,
+    LENGTH,
+    OR_EQUAL,
+    MIN_VALUE,
+    MAX_VALUE,
+    VALUE_SET_MULTI,
+    VALUE_SET_SINGLE,
+    REFERENCE_COLUMN,
+    REFERENCE_DATASET,
+    SUPPORTED_GE_EXP_TYPES,
+    REQUIRED_EXPECTATION_PARAMETERS
+)
+from constants.validation_constants import (
+    EXPECTATION_INTERMEDIATES,
+    EXPECTATION_PLAN_CACHE_SIZE
+)
+
+from src.hash_operations import get_content_hash
+from src.value_set_operations import is_value_set_reference
+from src.validation_plan_operations import build_validation_plan, get_expectation_columns
+
+# Compiled plans by the hash of the expectations they were compiled from, in least
+# recently used order
+_PLANS = dict()
+_PLANS_LOCK = threading.Lock()
+
+
+def compile_type(value) -> str:
+    """
+    :param value: Type name given to "Values to be of type".
+
+    :return: String with a supported type name.
+    """
+    if value not in SUPPORTED_GE_EXP_TYPES:
+        raise ValueError(f"Type {value!r} is not supported")
+    return value
+
+
+def compile_length(value) -> int:
+    """
+    :param value: Length given to "Value lengths to equal", stored as a numeric string.
+
+    :return: Integer.
+    """
+    if isinstance(value, bool) or not str(value).strip().isnumeric():
+        raise ValueError(f"Length {value!r} is not a non negative integer")
+    return int(value)
+
+
+def compile_bound(value) -> float or None:
+    """
+    :param value: Minimum or maximum given to "Values to be between", or None.
+
+    :return: Float, or None if there is no bound.
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"Bound {value!r} is not a number")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Bound {value!r} is not a number")
+
+
+def compile_or_equal(value) -> bool:
+    """
+    :param value: Flag given to "Values in first to be greater than in second".
+
+    :return: Bool.
+    """
+    return bool(value)
+
+
+def compile_value_set(value) -> tuple or str:
+    """
+    :param value: List with values, or string with a value set reference.
+
+    :return: Tuple with values, or the reference, which is resolved when the dataset
+    is validated because the referenced dataset can change.
+    """
+    if is_value_set_reference(value):
+        return value
+    if not isinstance(value, (list, tuple)) or not value:
+        raise ValueError(f"Value set {value!r} is not a list of values")
+    return tuple(value)
+
+
+def compile_value_pairs(value) -> tuple:
+    """
+    :param value: List with pairs of values.
+
+    :return: Tuple with tuples of two values.
+    """
+    if not isinstance(value, (list, tuple)) or not value or not all(
+        isinstance(pair, (list, tuple)) and len(pair) == 2 for pair in value
+    ):
+        raise ValueError(f"Value pairs {value!r} are not a list of pairs")
+    return tuple(tuple(pair) for pair in value)
+
+
+def compile_name(value) -> str:
+    """
+    :param value: Name of a referenced dataset or column.
+
+    :return: String.
+    """
+    if not isinstance(value, str) or not value:
+        raise ValueError(f"Name {value!r} is not a string")
+    return value
+
+
+PARAMETER_COMPILERS = {
+    TYPE: compile_type,
+    LENGTH: compile_length,
+    MIN_VALUE: compile_bound,
+    MAX_VALUE: compile_bound,
+    OR_EQUAL: compile_or_equal,
+    VALUE_SET_SINGLE: compile_value_set,
+    VALUE_SET_MULTI: compile_value_pairs,
+    REFERENCE_DATASET: compile_name,
+    REFERENCE_COLUMN: compile_name,
+}
+
+
+def compile_expectation(column_key: str, expectation_config: dict) -> CompiledExpectation:
+    """
+    Checks an expectation of a set and gives its parameters the types the validation
+    engines use.
+
+    :param column_key: String with the key of the expectation in the set config.
+    :param expectation_config: Dictionary with expectation name and parameters.
+
+    :return: CompiledExpectation object.
+    """
+    expectation_id = expectation_config.get(EXPECTATION_NAME)
+    if expectation_id not in EXPECTATION_INTERMEDIATES:
+        raise ValueError(f"Expectation {expectation_id!r} cannot be validated")
+    raw_parameters = expectation_config.get(PARAMETERS) or dict()
+    missing = [
+        name for name in REQUIRED_EXPECTATION_PARAMETERS.get(expectation_id, list())
+        if raw_parameters.get(name) is None
+    ]
+    if missing:
+        raise ValueError(
+            f"Expectation {expectation_id!r} over {column_key!r} is missing "
+            f"{', '.join(missing)}"
+        )
+
+    parameters = dict()
+    for name, value in raw_parameters.items():
+        compiler = PARAMETER_COMPILERS.get(name)
+        if compiler is None:
+            raise ValueError(f"Parameter {name!r} of {expectation_id!r} is not known")
+        try:
+            parameters[name] = compiler(value)
+        except ValueError as error:
+            raise ValueError(f"{expectation_id!r} over {column_key!r}: {error}") from None
+    return CompiledExpectation(
+        column_key,
+        expectation_id,
+        tuple(get_expectation_columns(expectation_id, column_key)),
+        parameters,
+        raw_parameters
+    )
+
+
+def compile_expectation_plan(expectations_from_set_config: dict) -> ExpectationPlan:
+    """
+    Returns the compiled plan of the expectations of a set. Plans are cached by the
+    hash of the expectations, so a set is only compiled again after it changes, and
+    every validation of the same content shares the same immutable plan.
+
+    :param expectations_from_set_config: Dictionary with the expectations of the set,
+    as read by get_expectation_set_config().
+
+    :return: ExpectationPlan object.
+    """
+    content_hash = get_content_hash(expectations_from_set_config)
+    with _PLANS_LOCK:
+        plan = _PLANS.pop(content_hash, None)
+        if plan is not None:
+            _PLANS[content_hash] = plan
+            return plan
+
+    expectations = tuple(
+        compile_expectation(column_key, expectation_config)
+        for column_key, expectation_configs in expectations_from_set_config.items()
+        for expectation_config in expectation_configs
+    )
+    plan = ExpectationPlan(content_hash, expectations, build_validation_plan(expectations))
+
+    with _PLANS_LOCK:
+        _PLANS[content_hash] = plan
+        while len(_PLANS) > EXPECTATION_PLAN_CACHE_SIZE:
+            _PLANS.pop(next(iter(_PLANS)))
+    return plan
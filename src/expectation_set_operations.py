@@ -1,11 +1,16 @@
+import os
 from datetime import datetime
 
+from objects.expectation_set_repository import ExpectationSetRepository
+
 from constants.defaults import EMPTY_DICT
+from constants.path_constants import EXPECTATION_SETS_DATABASE_PATH
 from constants.expectation_set_constants import (
     PARAMETERS,
     LAST_EDITED,
     EXPECTATIONS,
     EXPECTATION_NAME,
+    EXPECTATION_COUNT,
     EXPECTATION_SET_NAME,
     MULTICOLUMN_CONFIG_SEPARATOR
 )
@@ -20,8 +25,11 @@ from constants.great_expectations_constants import (
     COLUMN_LIST,
     VALUE_SET_MULTI,
     VALUE_SET_SINGLE,
+    REFERENCE_COLUMN,
+    REFERENCE_DATASET,
     EXPECTATION_PARAMS,
     SUPPORTED_GE_EXP_TYPES,
+    EXPECTATION_INTERFACE_NAMES,
     NUMERIC_ONLY_EXPECTATIONS,
     MULTICOLUMN_EXPECTATIONS_MAP,
     NON_NUMERIC_ONLY_EXPECTATIONS,
@@ -30,33 +38,103 @@ from constants.great_expectations_constants import (
 )
 
 from src.utils import is_list_empty
-from src.json_operations import read_json, write_json
+from src.value_set_operations import (
+    is_value_set_reference,
+    build_value_set_reference,
+    is_value_set_reference_valid
+)
 from src.front_end_operations import (
     build_expectation_interface_name,
+    build_checklist_index,
+    get_checklist_component,
     expectation_is_already_in_checklist,
+    get_expectation_key_from_interface_name,
     get_expectation_id_and_column_name_from_interface_name
 )
-from src.low_level_operations import (
-    exists_path,
-    delete_file,
-    get_expectation_set_path,
-    get_available_expectation_sets
+from src.low_level_operations import get_expectation_sets_path, get_expectation_set_path
+
+# Expectation sets, shared by every callback and validation of the process. Sets that
+# were stored as JSON files are imported when the database is created
+_EXPECTATION_SET_REPOSITORY = ExpectationSetRepository(
+    EXPECTATION_SETS_DATABASE_PATH, get_expectation_sets_path()
 )
 
 
 def get_expectation_set_config(expectation_set_name: str) -> dict:
     """
-    Returns the content of a defined expectation set.
+    Returns the content of a defined expectation set. The set is only read again when
+    it changes, so the returned config is shared and must not be modified.
 
     :param expectation_set_name: String with the name of the expectation set to be
     returned.
 
     :return: Dictionary with configuration.
     """
-    expectation_set_path = get_expectation_set_path(expectation_set_name)
-    with open(expectation_set_path, "r") as fp:
-        config = read_json(fp)
-    return config
+    return _EXPECTATION_SET_REPOSITORY.get(expectation_set_name)
+
+
+def create_expectation_set_if_missing(expectation_set_name: str) -> None:
+    """
+    Creates an empty expectation set, unless it already exists.
+
+    :param expectation_set_name: String with the name of the expectation set.
+    """
+    _EXPECTATION_SET_REPOSITORY.create_if_missing(expectation_set_name)
+
+
+def delete_expectation_set(expectation_set_name: str) -> None:
+    """
+    Deletes an expectation set and all its expectations.
+
+    :param expectation_set_name: String with the name of the expectation set.
+    """
+    _EXPECTATION_SET_REPOSITORY.delete(expectation_set_name)
+
+
+def get_expectation_set_options() -> list:
+    """
+    Returns the checklist components of all defined expectation sets, sorted by name.
+    They are read from the manifest, so no expectation is read, and every label shows
+    how many expectations the set has.
+
+    :return: List with checklist components.
+    """
+    return [
+        get_checklist_component(
+            entry[EXPECTATION_SET_NAME],
+            f"{entry[EXPECTATION_SET_NAME]} ({entry[EXPECTATION_COUNT]} expectations)"
+        )
+        for entry in _EXPECTATION_SET_REPOSITORY.get_manifest()
+    ]
+
+
+def import_expectation_set(path: os.path) -> str:
+    """
+    Imports an expectation set from a JSON file, in the format sets used to be stored
+    in. A set with the same name is replaced.
+
+    :param path: Path of the JSON file.
+
+    :return: String with the name of the imported set.
+    """
+    return _EXPECTATION_SET_REPOSITORY.import_json(path)
+
+
+def export_expectation_set(expectation_set_name: str, path=None) -> os.path:
+    """
+    Exports an expectation set to a JSON file, in the format sets used to be stored
+    in.
+
+    :param expectation_set_name: String with the name of the expectation set.
+    :param path: Path of the JSON file. By default, it is the one the set had as a
+    file.
+
+    :return: Path of the JSON file.
+    """
+    if path is None:
+        path = get_expectation_set_path(expectation_set_name)
+    _EXPECTATION_SET_REPOSITORY.export_json(expectation_set_name, path)
+    return path
 
 
 def get_empty_expectation_set_content(expectation_set_name: str) -> dict:
@@ -93,18 +171,9 @@ def check_all_expectation_sets_are_not_empty() -> None:
     """
     This function checks that no defined set is empty. If it is, it will be removed.
     """
-    # Getting the name of all sets
-    expectation_sets = get_available_expectation_sets()
-    for set_name in expectation_sets:
-
-        # Getting the content of each set
-        content = get_expectation_set_config(set_name)
-
-        # If there is no content, then that is an empty expectation set. Let's delete
-        # it
-        if not content[EXPECTATIONS]:
-            expectation_set_path = get_expectation_set_path(set_name)
-            delete_file(expectation_set_path)
+    # Empty sets are found in the manifest, without reading any expectation
+    for set_name in _EXPECTATION_SET_REPOSITORY.list_empty_names():
+        delete_expectation_set(set_name)
 
 
 def check_existing_expectation_sets_integrity() -> None:
@@ -122,8 +191,8 @@ def write_single_column_expectation_in_config(
     parameters_dict: dict
 ) -> None:
     """
-    This function creates a new file to write down a configuration for an expectation
-    set, or opens a created file to append new expectations and their parameters.
+    This function adds an expectation to an expectation set, creating the set if it
+    does not exist yet.
 
     :param expectation_set_name: String with the name of the expectation set.
     :param column_name: String with the name of the selected table column, where the
@@ -131,23 +200,14 @@ def write_single_column_expectation_in_config(
     :param expectation_id: String with the name of the new expectation to be added.
     :param parameters_dict: Dictionary with parameters of this new expectation.
     """
-    expectation_set_path = get_expectation_set_path(expectation_set_name)
-    if not exists_path(expectation_set_path):
-        empty_expectation_set_content = get_empty_expectation_set_content(expectation_set_name)
-        with open(expectation_set_path, "w") as fp:
-            write_json(empty_expectation_set_content, fp)
-
-    # Getting current expectation set configuration
-    config_dict = get_expectation_set_config(expectation_set_name)
-
-    if column_name not in config_dict[EXPECTATIONS]:
-        config_dict[EXPECTATIONS][column_name] = list()
+    create_expectation_set_if_missing(expectation_set_name)
 
-    expectation_content = get_expectation_config(expectation_id, parameters_dict)
-    config_dict[EXPECTATIONS][column_name].append(expectation_content)
-
-    with open(expectation_set_path, "w") as fp:
-        write_json(config_dict, fp)
+    # Only the new expectation is written
+    _EXPECTATION_SET_REPOSITORY.add_expectation(
+        expectation_set_name,
+        column_name,
+        get_expectation_config(expectation_id, parameters_dict)
+    )
 
 
 def write_multicolumn_expectation_in_config(
@@ -157,8 +217,8 @@ def write_multicolumn_expectation_in_config(
     parameters_dict: dict
 ) -> None:
     """
-    This function creates a new file to write down a configuration for an expectation
-    set, or opens a created file to append new expectations and their parameters.
+    This function adds an expectation to an expectation set, creating the set if it
+    does not exist yet.
 
     :param expectation_set_name: String with the name of the expectation set.
     :param column_names: String with the name of the selected table column, where the
@@ -166,67 +226,102 @@ def write_multicolumn_expectation_in_config(
     :param expectation_id: String with the ID of the new expectation to be added.
     :param parameters_dict: Dictionary with parameters of this new expectation.
     """
-    expectation_set_path = get_expectation_set_path(expectation_set_name)
-    if not exists_path(expectation_set_path):
-        empty_expectation_set_content = get_empty_expectation_set_content(expectation_set_name)
-        with open(expectation_set_path, "w") as fp:
-            write_json(empty_expectation_set_content, fp)
-
-    # Getting current expectation set configuration
-    config_dict = get_expectation_set_config(expectation_set_name)
+    create_expectation_set_if_missing(expectation_set_name)
 
     # Getting new column names key in expectation set config
     column_names = MULTICOLUMN_CONFIG_SEPARATOR.join(column_names)
 
-    # If the new expectations already exist in the config but with another order, then
-    # keep the existing order rather than the new one
+    # If the new expectation already exists in the config but with another order, then
+    # keep the existing order rather than the new one. It is looked up by its hashed key
     if MULTICOLUMN_EXPECTATIONS_N_COLUMNS[expectation_id] != 2:
-        new_columns = set(column_names.split(MULTICOLUMN_CONFIG_SEPARATOR))
-        for existing_columns in config_dict[EXPECTATIONS]:
-            if new_columns == set(existing_columns.split(MULTICOLUMN_CONFIG_SEPARATOR)):
-                column_names = existing_columns
+        column_names = _EXPECTATION_SET_REPOSITORY.find_column_key(
+            expectation_set_name,
+            expectation_id,
+            column_names.split(MULTICOLUMN_CONFIG_SEPARATOR)
+        ) or column_names
+
+    # Only the new expectation is written, unless it is already in the set
+    _EXPECTATION_SET_REPOSITORY.add_expectation(
+        expectation_set_name,
+        column_names,
+        get_expectation_config(expectation_id, parameters_dict),
+        skip_if_present=True
+    )
 
-    if column_names not in config_dict[EXPECTATIONS]:
-        print("column set already exists in config")
-        config_dict[EXPECTATIONS][column_names] = list()
 
-    expectation_content = get_expectation_config(expectation_id, parameters_dict)
-    if expectation_content not in config_dict[EXPECTATIONS][column_names]:
-        config_dict[EXPECTATIONS][column_names].append(expectation_content)
+def write_expectations_in_config(expectation_set_name: str, expectations: list) -> None:
+    """
+    This function adds many expectations to an expectation set in a single
+    transaction, creating the set if it does not exist yet. Expectations already in
+    the set, with the same parameters, are not added again.
+
+    :param expectation_set_name: String with the name of the expectation set.
+    :param expectations: List with tuples of column names, expectation ID and
+    parameters.
+    """
+    column_keys = dict()
+    rows = list()
+    for column_names, expectation_id, parameters_dict in expectations:
+        column_key = MULTICOLUMN_CONFIG_SEPARATOR.join(column_names)
 
-    with open(expectation_set_path, "w") as fp:
-        write_json(config_dict, fp)
+        # Multicolumn expectations keep the column order they already have
+        if MULTICOLUMN_EXPECTATIONS_N_COLUMNS.get(expectation_id, 2) != 2:
+            key = (expectation_id, frozenset(column_names))
+            if key not in column_keys:
+                column_keys[key] = _EXPECTATION_SET_REPOSITORY.find_column_key(
+                    expectation_set_name, expectation_id, column_names
+                ) or column_key
+            column_key = column_keys[key]
+        rows.append((column_key, get_expectation_config(expectation_id, parameters_dict)))
+
+    _EXPECTATION_SET_REPOSITORY.add_expectations(
+        expectation_set_name, rows, skip_if_present=True
+    )
+
+
+def get_expectation_set_interface_names(expectation_set_name: str) -> list:
+    """
+    Returns the interface names of the expectations of a set, as the definer
+    checklist shows them, without repetitions.
+
+    :param expectation_set_name: String with the name of the expectation set.
+
+    :return: List with expectation interface names, in config order.
+    """
+    interface_names = list()
+    checklist_index = set()
+    config = get_expectation_set_config(expectation_set_name)
+    for column_key, expectation_configs in config[EXPECTATIONS].items():
+        for expectation_config in expectation_configs:
+            interface_name = build_expectation_interface_name(
+                EXPECTATION_INTERFACE_NAMES[expectation_config[EXPECTATION_NAME]],
+                column_key.split(MULTICOLUMN_CONFIG_SEPARATOR)
+            )
+            if not expectation_is_already_in_checklist(interface_name, checklist_index):
+                checklist_index.add(get_expectation_key_from_interface_name(interface_name))
+                interface_names.append(interface_name)
+    return interface_names
 
 
 def delete_expectations_in_config(
     expectation_set_name: str, column_names: list, expectation_ids: list
 ) -> None:
     """
-    This function creates a new file to write down a configuration for an expectation
-    set, or opens a created file to append new expectations and their parameters.
+    This function deletes expectations from an expectation set.
 
     :param expectation_set_name: String with the name of the expectation set.
     :param column_names: List with column names.
     :param expectation_ids: List with names of expectations to be deleted.
     """
-    expectation_set_config_path = get_expectation_set_path(expectation_set_name)
-    with open(expectation_set_config_path, "r") as fp:
-        config_dict = read_json(fp)
-
-    # Deleting all expectations from configuration
-    for column_name, expectation_id in zip(column_names, expectation_ids):
-        built_column_name = MULTICOLUMN_CONFIG_SEPARATOR.join(column_name)
-        for idx in range(len(config_dict[EXPECTATIONS][built_column_name])-1, -1, -1):
-            expectation_content = config_dict[EXPECTATIONS][built_column_name][idx]
-            if expectation_content[EXPECTATION_NAME] == expectation_id:
-                config_dict[EXPECTATIONS][built_column_name].pop(idx)
-
-        # If that column has no expectations, delete it from configuration
-        if not config_dict[EXPECTATIONS][built_column_name]:
-            del config_dict[EXPECTATIONS][built_column_name]
-
-    with open(expectation_set_config_path, "w") as fp:
-        write_json(config_dict, fp)
+    # Deleting all expectations from configuration, in a single transaction. Columns
+    # without expectations are no longer in the config, as they have no rows
+    _EXPECTATION_SET_REPOSITORY.delete_expectations(
+        expectation_set_name,
+        [
+            (MULTICOLUMN_CONFIG_SEPARATOR.join(column_name), expectation_id)
+            for column_name, expectation_id in zip(column_names, expectation_ids)
+        ]
+    )
 
 
 def get_numeric_only_expectations() -> list:
@@ -365,6 +460,9 @@ def parse_parameter(param_name: str, value) -> any or None:
     elif param_name == LENGTH:
         if value.isnumeric():
             parsed_param = value
+    elif param_name == VALUE_SET_SINGLE and is_value_set_reference(value.strip()):
+        if is_value_set_reference_valid(value.strip()):
+            parsed_param = value.strip()
     elif param_name == VALUE_SET_SINGLE:
         value = value.replace(" ", "")
         parsed_param = value.split(",")
@@ -406,6 +504,9 @@ def parse_parameter(param_name: str, value) -> any or None:
                     parsed_param = [tuple(pair) for pair in parsed_param]
     elif param_name == OR_EQUAL:
         parsed_param = False if is_list_empty(value) else True
+    elif param_name == REFERENCE_DATASET or param_name == REFERENCE_COLUMN:
+        if value:
+            parsed_param = value
     return parsed_param
 
 
@@ -418,7 +519,9 @@ def add_single_column_expectation(
     min_value_input: str,
     max_value_input: str,
     type_input: str,
-    values_input: str
+    values_input: str,
+    reference_dataset_input=None,
+    reference_column_input=None
 ) -> None:
     """
     Adds an expectation working for a single table column, to expectation set config.
@@ -437,13 +540,18 @@ def add_single_column_expectation(
     :param type_input: String with the parameter for type expectation.
     :param values_input: String with the parameter for the values in set
     expectation.
+    :param reference_dataset_input: String with the name of the dataset referenced by
+    the values in another dataset expectation.
+    :param reference_column_input: String with the name of the referenced column.
     """
     params_map = {
         TYPE: type_input,
         LENGTH: length_input,
         VALUE_SET_SINGLE: values_input,
         MIN_VALUE: min_value_input,
-        MAX_VALUE: max_value_input
+        MAX_VALUE: max_value_input,
+        REFERENCE_DATASET: reference_dataset_input,
+        REFERENCE_COLUMN: reference_column_input
     }
     all_params_are_set = True
     expectation_id = SINGLE_COLUMN_EXPECTATIONS_MAP[expectation_name]
@@ -460,6 +568,14 @@ def add_single_column_expectation(
         if MIN_VALUE in params_of_interest and MAX_VALUE in params_of_interest:
             if params_of_interest[MIN_VALUE] > params_of_interest[MAX_VALUE]:
                 all_params_are_set = False
+
+    # The referenced column has to exist
+    if all_params_are_set and REFERENCE_DATASET in params_of_interest:
+        all_params_are_set = is_value_set_reference_valid(
+            build_value_set_reference(
+                params_of_interest[REFERENCE_DATASET], params_of_interest[REFERENCE_COLUMN]
+            )
+        )
     if all_params_are_set:
         write_single_column_expectation_in_config(
             expectation_set_name, selected_table_column, expectation_id, params_of_interest
@@ -468,7 +584,7 @@ def add_single_column_expectation(
             expectation_name, [selected_table_column]
         )
         if not expectation_is_already_in_checklist(
-                expectation_interface_name, current_expectations
+                expectation_interface_name, build_checklist_index(current_expectations)
         ):
             current_expectations.append(expectation_interface_name)
 
@@ -538,7 +654,7 @@ def add_multicolumn_expectation(
             expectation_name, list(table_columns)
         )
         if not expectation_is_already_in_checklist(
-                expectation_interface_name, current_expectations
+                expectation_interface_name, build_checklist_index(current_expectations)
         ):
             current_expectations.append(expectation_interface_name)
 
@@ -0,0 +1,409 @@
+import io
+import os
+import json
+import yaml
+import pandas as pd
+
+from constants.expectation_set_constants import (
+    PARAMETERS,
+    SPEC_COLUMNS,
+    SPEC_DATASET,
+    EXPECTATIONS,
+    SPEC_EXPECTATION,
+    CSV_SPEC_EXTENSIONS,
+    EXPECTATION_SET_NAME,
+    EXPECTATION_NAME,
+    JSON_SPEC_EXTENSIONS,
+    YAML_SPEC_EXTENSIONS,
+    MULTICOLUMN_CONFIG_SEPARATOR
+)
+from constants.great_expectations_constants import (
+    COLUMN,
+    LENGTH,
+    COLUMN_A,
+    COLUMN_B,
+    OR_EQUAL,
+    MIN_VALUE,
+    MAX_VALUE,
+    COLUMN_LIST,
+    REFERENCE_COLUMN,
+    REFERENCE_DATASET,
+    EXPECTATION_PARAMS,
+    NUMERIC_ONLY_EXPECTATIONS,
+    MULTICOLUMN_EXPECTATIONS_MAP,
+    REQUIRED_EXPECTATION_PARAMETERS,
+    NON_NUMERIC_ONLY_EXPECTATIONS,
+    SINGLE_COLUMN_EXPECTATIONS_MAP,
+    MULTICOLUMN_EXPECTATIONS_N_COLUMNS
+)
+from constants.supported_constants import NUMERIC_COLUMN
+
+from src.dataset_operations import get_dataset_schema
+from src.expectation_plan_operations import compile_expectation
+from src.value_set_operations import (
+    build_value_set_reference,
+    is_value_set_reference_valid
+)
+from src.expectation_set_operations import parse_parameter, write_expectations_in_config
+
+# Keys of a spec row that are not expectation parameters
+_SPEC_ROW_KEYS = [SPEC_COLUMNS, COLUMN, SPEC_EXPECTATION, PARAMETERS]
+
+# Spec rows as a table
+_ROW = "row"
+_COLUMNS = "columns"
+_EXPECTATION_ID = "expectation_id"
+_PARAMETERS = "parameters"
+
+
+def read_expectation_set_spec(file_name: str, content: bytes) -> dict:
+    """
+    Reads an expectation set spec, in YAML, JSON or CSV format. YAML and JSON specs
+    can be a list of rows, or a mapping with the rows under "expectations" and,
+    optionally, the set name and the dataset they are written against. CSV specs have
+    a row per expectation, with a column for its columns, one for the expectation and
+    one per parameter.
+
+    :param file_name: String with the name of the spec file, which tells its format.
+    :param content: Bytes with the content of the file.
+
+    :return: Dictionary with the set name, the dataset name and the rows, which can be
+    None if the spec does not give them.
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension in CSV_SPEC_EXTENSIONS:
+        table = pd.read_csv(io.BytesIO(content), sep=None, engine="python", dtype=str)
+        spec = table.to_dict("records")
+    elif extension in JSON_SPEC_EXTENSIONS:
+        spec = json.loads(content)
+    elif extension in YAML_SPEC_EXTENSIONS:
+        spec = yaml.safe_load(content)
+    else:
+        raise ValueError(f"{file_name} is not a YAML, JSON or CSV spec")
+
+    if isinstance(spec, list):
+        spec = {EXPECTATIONS: spec}
+    if not isinstance(spec, dict) or not isinstance(spec.get(EXPECTATIONS), list):
+        raise ValueError(f"{file_name} does not have a list of expectations")
+    return {
+        EXPECTATION_SET_NAME: spec.get(EXPECTATION_SET_NAME),
+        SPEC_DATASET: spec.get(SPEC_DATASET),
+        EXPECTATIONS: spec[EXPECTATIONS],
+    }
+
+
+def is_missing(value) -> bool:
+    """
+    Returns if a spec value is missing, like the empty cells of a CSV spec.
+
+    :param value: Any value.
+
+    :return: Bool.
+    """
+    if isinstance(value, (list, tuple, dict)):
+        return False
+    return value is None or pd.isna(value) or value == ""
+
+
+def get_expectation_id(expectation) -> str or None:
+    """
+    Returns GE's expectation ID of a spec row, which can give either the ID or the
+    interface name.
+
+    :param expectation: Expectation of a spec row.
+
+    :return: String with the expectation ID, or None if it is not known.
+    """
+    if not isinstance(expectation, str):
+        return None
+    expectation = expectation.strip()
+    if expectation in EXPECTATION_PARAMS:
+        return expectation
+    return SINGLE_COLUMN_EXPECTATIONS_MAP.get(
+        expectation, MULTICOLUMN_EXPECTATIONS_MAP.get(expectation)
+    )
+
+
+def build_spec_table(rows: list) -> pd.DataFrame:
+    """
+    Turns the rows of a spec into a table, with their columns as lists, their
+    expectation IDs and their parameters, without checking any of them.
+
+    :param rows: List with spec rows.
+
+    :return: Pandas DataFrame with a row per spec row.
+    """
+    records = list()
+    for position, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            row = dict()
+        columns = row.get(SPEC_COLUMNS)
+        if is_missing(columns):
+            columns = row.get(COLUMN)
+        if isinstance(columns, str):
+            columns = columns.split(MULTICOLUMN_CONFIG_SEPARATOR)
+        elif not isinstance(columns, (list, tuple)):
+            columns = list()
+
+        parameters = row.get(PARAMETERS)
+        parameters = dict(parameters) if isinstance(parameters, dict) else dict()
+        parameters.update(
+            {key: value for key, value in row.items() if key not in _SPEC_ROW_KEYS}
+        )
+        records.append(
+            {
+                _ROW: position,
+                _COLUMNS: [str(column).strip() for column in columns],
+                _EXPECTATION_ID: get_expectation_id(row.get(SPEC_EXPECTATION)),
+                _PARAMETERS: {
+                    name: value for name, value in parameters.items()
+                    if not is_missing(value)
+                },
+            }
+        )
+    return pd.DataFrame(records, columns=[_ROW, _COLUMNS, _EXPECTATION_ID, _PARAMETERS])
+
+
+def find_structure_errors(specs: pd.DataFrame, schema: dict) -> pd.Series:
+    """
+    Checks, for every row at once, that its expectation is known, that it has as many
+    columns as its expectation needs, that its columns are in the dataset and that
+    their kind suits the expectation.
+
+    :param specs: Pandas DataFrame, see build_spec_table().
+    :param schema: Dictionary with the kind of every dataset column.
+
+    :return: Pandas Series with the error messages, indexed by spec row.
+    """
+    errors = list()
+    is_known = specs[_EXPECTATION_ID].notna()
+    errors.append(
+        pd.Series("Expectation is not known", index=specs.loc[~is_known, _ROW])
+    )
+
+    # Single column expectations need a column, pairs two and the rest at least two
+    n_columns = specs[_COLUMNS].str.len()
+    is_multicolumn = specs[_EXPECTATION_ID].isin(
+        list(MULTICOLUMN_EXPECTATIONS_N_COLUMNS)
+    )
+    expected_columns = specs[_EXPECTATION_ID].map(MULTICOLUMN_EXPECTATIONS_N_COLUMNS)
+    wrong_columns = is_known & (
+        (~is_multicolumn & (n_columns != 1)) |
+        (is_multicolumn & expected_columns.notna() & (n_columns != expected_columns)) |
+        (is_multicolumn & expected_columns.isna() & (n_columns < 2))
+    )
+    errors.append(
+        pd.Series(
+            "Wrong number of columns for the expectation",
+            index=specs.loc[wrong_columns, _ROW]
+        )
+    )
+
+    columns = specs[[_ROW, _COLUMNS]].explode(_COLUMNS).dropna()
+    unknown_columns = columns[~columns[_COLUMNS].isin(list(schema))]
+    errors.append(
+        "Columns not in the dataset: "
+        + unknown_columns.groupby(_ROW)[_COLUMNS].agg(", ".join)
+    )
+
+    # Columns have to suit numeric only and non numeric only expectations
+    column_kinds = specs[_COLUMNS].str[0].map(schema)
+    numeric_only = [
+        SINGLE_COLUMN_EXPECTATIONS_MAP[e] for e in NUMERIC_ONLY_EXPECTATIONS
+    ]
+    non_numeric_only = [
+        SINGLE_COLUMN_EXPECTATIONS_MAP[e] for e in NON_NUMERIC_ONLY_EXPECTATIONS
+    ]
+    is_numeric = column_kinds == NUMERIC_COLUMN
+    wrong_kind = ~wrong_columns & column_kinds.notna() & (
+        (specs[_EXPECTATION_ID].isin(numeric_only) & ~is_numeric) |
+        (specs[_EXPECTATION_ID].isin(non_numeric_only) & is_numeric)
+    )
+    errors.append(
+        pd.Series(
+            "Column kind does not suit the expectation",
+            index=specs.loc[wrong_kind, _ROW]
+        )
+    )
+    return pd.concat(errors)
+
+
+def find_parameter_errors(specs: pd.DataFrame) -> pd.Series:
+    """
+    Checks, for every row at once, that it has every parameter its expectation needs
+    and no other one, and that minimum values are not greater than maximum values.
+
+    :param specs: Pandas DataFrame, see build_spec_table().
+
+    :return: Pandas Series with the error messages, indexed by spec row.
+    """
+    errors = list()
+    is_known = specs[_EXPECTATION_ID].notna()
+    parameters = pd.DataFrame(list(specs[_PARAMETERS]), index=specs.index)
+    expectation_params = specs[_EXPECTATION_ID].map(
+        lambda expectation_id: [
+            param for param in EXPECTATION_PARAMS.get(expectation_id, dict())
+            if param not in [COLUMN_A, COLUMN_B, COLUMN_LIST]
+        ]
+    )
+    required_params = specs[_EXPECTATION_ID].map(
+        lambda expectation_id:
+        REQUIRED_EXPECTATION_PARAMETERS.get(expectation_id, list())
+    )
+    for param in set(parameters.columns).union(*expectation_params):
+        is_set = parameters[param].notna() if param in parameters else \
+            pd.Series(False, index=specs.index)
+        is_expected = expectation_params.map(lambda params: param in params)
+        is_required = required_params.map(lambda params: param in params)
+        errors.append(
+            pd.Series(
+                f"Missing parameter {param}",
+                index=specs.loc[is_known & is_required & ~is_set, _ROW]
+            )
+        )
+        errors.append(
+            pd.Series(
+                f"Unexpected parameter {param}",
+                index=specs.loc[is_known & ~is_expected & is_set, _ROW]
+            )
+        )
+
+    if MIN_VALUE in parameters and MAX_VALUE in parameters:
+        min_values = pd.to_numeric(
+            parameters[MIN_VALUE].astype(str).str.replace(",", "."), errors="coerce"
+        )
+        max_values = pd.to_numeric(
+            parameters[MAX_VALUE].astype(str).str.replace(",", "."), errors="coerce"
+        )
+        errors.append(
+            pd.Series(
+                "Minimum value is greater than maximum value",
+                index=specs.loc[min_values > max_values, _ROW]
+            )
+        )
+    return pd.concat(errors)
+
+
+def parse_spec_parameters(parameters: dict) -> dict:
+    """
+    Gives the parameters of a spec row the format the definer stores them in. Text
+    values are parsed like the definer inputs, and numeric bounds are stored as
+    floats, as the definer does, so that equal expectations are stored equally
+    whatever the format of their spec. Any other value is kept.
+
+    :param parameters: Dictionary with the parameters of the row.
+
+    :return: Dictionary with the parsed parameters.
+    """
+    parsed_parameters = dict()
+    for param, value in parameters.items():
+        if param == OR_EQUAL and isinstance(value, str):
+            parsed_param = value.strip().lower() in ["true", "yes", "1"]
+        elif param == LENGTH and isinstance(value, int) and not isinstance(value, bool):
+            parsed_param = str(value)
+        elif param in [MIN_VALUE, MAX_VALUE] and isinstance(value, (int, float)) \
+                and not isinstance(value, bool):
+            parsed_param = float(value)
+        elif isinstance(value, str):
+            parsed_param = parse_parameter(param, value)
+        else:
+            parsed_param = value
+        if parsed_param is None:
+            raise ValueError(f"Parameter {param} has a wrong value")
+        parsed_parameters[param] = parsed_param
+
+    # Every referenced column has to exist
+    if REFERENCE_DATASET in parsed_parameters and not is_value_set_reference_valid(
+        build_value_set_reference(
+            parsed_parameters[REFERENCE_DATASET], parsed_parameters[REFERENCE_COLUMN]
+        )
+    ):
+        raise ValueError("Referenced column does not exist")
+    return parsed_parameters
+
+
+def author_expectation_set(
+    expectation_set_name: str, dataset_name: str, rows: list
+) -> list:
+    """
+    Adds many expectations to an expectation set at once, creating the set if needed.
+    Every row is checked against the cached schema of the dataset before anything is
+    written, and the set is then written in a single transaction. Nothing is written
+    if any row is wrong.
+
+    Each row is a dictionary with its columns (a list, or a string with the columns
+    separated by commas), its expectation (GE's ID or its interface name) and its
+    parameters, either under "parameters" or as other keys of the row.
+
+    :param expectation_set_name: String with the name of the expectation set.
+    :param dataset_name: String with the name of the dataset the set is written for.
+    :param rows: List with spec rows.
+
+    :return: List with an error message per wrong row, empty if the set was written.
+    """
+    if not expectation_set_name:
+        return ["The expectation set has no name"]
+    schema = get_dataset_schema(dataset_name) if dataset_name else None
+    if schema is None:
+        return [f"Dataset {dataset_name} is not imported"]
+    if not rows:
+        return ["The spec has no expectations"]
+
+    specs = build_spec_table(rows)
+    errors = pd.concat(
+        [find_structure_errors(specs, schema), find_parameter_errors(specs)]
+    )
+
+    # Only well formed rows have their values parsed and typed
+    expectations = list()
+    for row, columns, expectation_id, parameters in specs[
+        ~specs[_ROW].isin(errors.index)
+    ].itertuples(index=False):
+        try:
+            parsed_parameters = parse_spec_parameters(parameters)
+            # The definer always stores the flag, so equal expectations hash equally
+            if OR_EQUAL in EXPECTATION_PARAMS[expectation_id]:
+                parsed_parameters.setdefault(OR_EQUAL, False)
+            compile_expectation(
+                MULTICOLUMN_CONFIG_SEPARATOR.join(columns),
+                {EXPECTATION_NAME: expectation_id, PARAMETERS: parsed_parameters}
+            )
+        except ValueError as error:
+            errors = pd.concat([errors, pd.Series(str(error), index=[row])])
+            continue
+        expectations.append((columns, expectation_id, parsed_parameters))
+
+    if not errors.empty:
+        return [
+            f"Row {row}: {message}"
+            for row, message in errors.sort_index(kind="stable").items()
+        ]
+    write_expectations_in_config(expectation_set_name, expectations)
+    return list()
+
+
+def import_expectation_set_spec(
+    file_name: str, content: bytes, expectation_set_name=None, dataset_name=None
+) -> (str, list):
+    """
+    Imports an expectation set spec file, see read_expectation_set_spec() and
+    author_expectation_set(). The given set and dataset names take the place of the
+    ones in the spec.
+
+    :param file_name: String with the name of the spec file.
+    :param content: Bytes with the content of the file.
+    :param expectation_set_name: String with the name of the expectation set, or None.
+    :param dataset_name: String with the name of the dataset, or None.
+
+    :return: Tuple with the name of the expectation set and a list with an error
+    message per wrong row, empty if the set was written.
+    """
+    try:
+        spec = read_expectation_set_spec(file_name, content)
+    except (ValueError, yaml.YAMLError, pd.errors.ParserError) as error:
+        return expectation_set_name, [str(error)]
+    expectation_set_name = expectation_set_name or spec[EXPECTATION_SET_NAME]
+    dataset_name = dataset_name or spec[SPEC_DATASET]
+    return expectation_set_name, author_expectation_set(
+        expectation_set_name, dataset_name, spec[EXPECTATIONS]
+    )
@@ -1,5 +1,36 @@
+import copy
+import threading
+from great_expectations.core import ExpectationConfiguration
+from great_expectations.data_context.types.resource_identifiers import (
+    ExpectationSuiteIdentifier
+)
+
 from objects.expectation_suite_name import ExpectationSuiteName
 
+from constants.expectation_set_constants import (
+    PARAMETERS,
+    EXPECTATION_NAME,
+    MULTICOLUMN_CONFIG_SEPARATOR
+)
+from constants.great_expectations_constants import (
+    MOSTLY,
+    COLUMN,
+    COLUMN_A,
+    COLUMN_B,
+    COLUMN_LIST,
+    COMPILED_SUITE_SEPARATOR,
+    MULTICOLUMN_EXPECTATIONS_N_COLUMNS
+)
+
+from src.value_set_operations import get_expectation_set_version
+
+# Suites are compiled by a single thread at a time, so that no thread reads a suite
+# while another one is still writing it
+_COMPILE_LOCK = threading.Lock()
+
+# Number of running validations that use each compiled suite, which are never deleted
+_SUITES_IN_USE = dict()
+
 
 def create_empty_ge_expectation_suite(context, name_object: ExpectationSuiteName):
     """
@@ -22,3 +53,169 @@ def get_expectation_suite_name_object(name: str) -> ExpectationSuiteName:
     :return: Expectation Suite name object.
     """
     return ExpectationSuiteName(name)
+
+
+def build_ge_expectation_kwargs(
+    column_name: str, expectation_config: dict, confidence: int
+) -> dict:
+    """
+    Builds the kwargs of a GE expectation from its configuration in an expectation
+    set. The configuration is not modified. Expectations that reference a column of
+    another dataset are never compiled into GE suites, see validate_dataset().
+
+    :param column_name: String with the key of the expectation in the set config.
+    :param expectation_config: Dictionary with expectation name and parameters.
+    :param confidence: Integer with confidence ranging from 0 to 100.
+
+    :return: Dictionary with GE's expectation kwargs.
+    """
+    expectation_id = expectation_config.get(EXPECTATION_NAME)
+
+    kwargs = copy.deepcopy(expectation_config.get(PARAMETERS))
+    kwargs[MOSTLY] = confidence / 100
+
+    if expectation_id not in MULTICOLUMN_EXPECTATIONS_N_COLUMNS:
+        kwargs[COLUMN] = column_name
+    elif MULTICOLUMN_EXPECTATIONS_N_COLUMNS[expectation_id] == 2:
+        kwargs[COLUMN_A], kwargs[COLUMN_B] = column_name.split(MULTICOLUMN_CONFIG_SEPARATOR)
+    else:
+        kwargs[COLUMN_LIST] = column_name.split(MULTICOLUMN_CONFIG_SEPARATOR)
+    return kwargs
+
+
+def build_compiled_suite_name(
+    expectation_set_name: str, expectations_from_set_config: dict, confidence: int
+) -> str:
+    """
+    Builds the name of the GE suite compiled from an expectation set. It changes with
+    the content of the set and with the confidence, so a compiled suite never has to
+    be modified. Suites never hold expectations that reference other datasets, so
+    changes in those datasets never rename them.
+
+    :param expectation_set_name: String with the name of the expectation set.
+    :param expectations_from_set_config: Dictionary with the expectations of the set.
+    :param confidence: Integer with confidence ranging from 0 to 100.
+
+    :return: String with the name of the suite.
+    """
+    return COMPILED_SUITE_SEPARATOR.join(
+        [
+            expectation_set_name,
+            get_expectation_set_version(expectations_from_set_config)[:16],
+            str(confidence),
+        ]
+    )
+
+
+def delete_stale_compiled_suites(
+    context, expectation_set_name: str, expectations_from_set_config: dict
+) -> None:
+    """
+    Deletes the suites compiled from previous versions of an expectation set, except
+    the ones that a running validation still uses. It has to be called holding
+    _COMPILE_LOCK.
+
+    :param context: Great Expectations' context object.
+    :param expectation_set_name: String with the name of the expectation set.
+    :param expectations_from_set_config: Dictionary with the current expectations of
+    the set.
+    """
+    current_hash = get_expectation_set_version(expectations_from_set_config)[:16]
+    for suite_name in context.list_expectation_suite_names():
+        name_parts = suite_name.rsplit(COMPILED_SUITE_SEPARATOR, 2)
+        if len(name_parts) == 3 and name_parts[0] == expectation_set_name \
+                and name_parts[1] != current_hash \
+                and not _SUITES_IN_USE.get(suite_name):
+            context.delete_expectation_suite(suite_name)
+
+
+def compile_expectation_suite(
+    context,
+    expectation_set_name: str,
+    expectations_from_set_config: dict,
+    confidence: int
+) -> ExpectationSuiteName:
+    """
+    Returns the GE suite compiled from the given version of an expectation set,
+    compiling and storing it only if it is not in GE's suite store yet. Expectations
+    are added to the suite as configurations, without evaluating them on any batch.
+    The suite is marked as in use until release_expectation_suite is called.
+
+    :param context: Great Expectations' context object.
+    :param expectation_set_name: String with the name of the expectation set.
+    :param expectations_from_set_config: Dictionary with the expectations of the set.
+    :param confidence: Integer with confidence ranging from 0 to 100.
+
+    :return: ExpectationSuiteName object with the name of the compiled suite.
+    """
+    suite_name_object = ExpectationSuiteName(
+        build_compiled_suite_name(
+            expectation_set_name, expectations_from_set_config, confidence
+        )
+    )
+
+    with _COMPILE_LOCK:
+        if not context.expectations_store.has_key(
+            ExpectationSuiteIdentifier(suite_name_object.name)
+        ):
+            save_compiled_expectation_suite(
+                context,
+                suite_name_object,
+                expectation_set_name,
+                expectations_from_set_config,
+                confidence
+            )
+        _SUITES_IN_USE[suite_name_object.name] = \
+            _SUITES_IN_USE.get(suite_name_object.name, 0) + 1
+
+    return suite_name_object
+
+
+def save_compiled_expectation_suite(
+    context,
+    suite_name_object: ExpectationSuiteName,
+    expectation_set_name: str,
+    expectations_from_set_config: dict,
+    confidence: int
+) -> None:
+    """
+    Compiles an expectation set into a new GE suite and stores it, deleting the
+    suites compiled from previous versions of the set. It has to be called holding
+    _COMPILE_LOCK.
+
+    :param context: Great Expectations' context object.
+    :param suite_name_object: ExpectationSuiteName object with the name of the suite.
+    :param expectation_set_name: String with the name of the expectation set.
+    :param expectations_from_set_config: Dictionary with the expectations of the set.
+    :param confidence: Integer with confidence ranging from 0 to 100.
+    """
+    delete_stale_compiled_suites(
+        context, expectation_set_name, expectations_from_set_config
+    )
+    expectation_suite = create_empty_ge_expectation_suite(context, suite_name_object)
+    for column_name in expectations_from_set_config:
+        for expectation_config in expectations_from_set_config.get(column_name):
+            expectation_suite.add_expectation(
+                ExpectationConfiguration(
+                    expectation_type=expectation_config.get(EXPECTATION_NAME),
+                    kwargs=build_ge_expectation_kwargs(
+                        column_name, expectation_config, confidence
+                    )
+                )
+            )
+    context.save_expectation_suite(expectation_suite)
+
+
+def release_expectation_suite(suite_name_object: ExpectationSuiteName) -> None:
+    """
+    Marks a compiled suite as no longer used by a validation, so that it can be deleted
+    once its expectation set changes.
+
+    :param suite_name_object: ExpectationSuiteName object with the name of the suite.
+    """
+    with _COMPILE_LOCK:
+        remaining_uses = _SUITES_IN_USE.get(suite_name_object.name, 0) - 1
+        if remaining_uses > 0:
+            _SUITES_IN_USE[suite_name_object.name] = remaining_uses
+        else:
+            _SUITES_IN_USE.pop(suite_name_object.name, None)
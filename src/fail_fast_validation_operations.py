@@ -0,0 +1,156 @@
+from datetime import datetime
+
+from objects.expectation_state import ExpectationState
+from objects.expectation_suite_name import ExpectationSuiteName
+
+from constants.expectation_set_constants import EXPECTATIONS, EXPECTATION_SET_NAME
+from constants.validation_constants import (
+    MODE,
+    RESULT,
+    RESULTS,
+    RUN_TIME,
+    DECIDABLE,
+    CHUNK_SIZE,
+    CONFIDENCE,
+    TOTAL_ROWS,
+    DATASET_NAME,
+    FAIL_FAST_MODE,
+    VALIDATED_ROWS,
+    EARLY_TERMINATED,
+    TERMINATION_REASON,
+    FAIL_FAST_MAX_FAILURES
+)
+
+from src.validation_operations import is_dataset_compatible
+from src.validation_result_operations import is_mostly_successful
+from src.expectation_set_operations import get_expectation_set_config
+from src.validation_plan_operations import compute_intermediates
+from src.expectation_plan_operations import compile_expectation_plan
+from src.low_level_operations import (
+    is_csv_file_by_name,
+    get_file_name_by_path,
+    get_imported_dataset_path
+)
+from src.utils import count_csv_rows, infer_csv_separator, read_dataset_in_chunks
+from src.chunked_validation_operations import (
+    build_expectation_states,
+    update_expectation_states,
+    finalize_expectation_states
+)
+
+
+def is_expectation_certainly_failed(
+    state: ExpectationState, mostly: float, remaining_rows: int or None
+) -> bool:
+    """
+    Returns if an expectation can no longer reach its "mostly" threshold, whatever the
+    rows that remain to be read. Duplicated values are only known at the end, so
+    uniqueness expectations never fail early.
+
+    :param state: ExpectationState object that has not been finalized.
+    :param mostly: Float ranging from 0 to 1.
+    :param remaining_rows: Integer with an upper bound of the rows that remain to be
+    read, or None if it is unknown.
+
+    :return: Bool.
+    """
+    if state.hash_counter is not None or not state.unexpected_count:
+        return False
+    if remaining_rows is None:
+        return mostly >= 1
+    rows_considered = state.element_count - state.missing_count
+    # Best case: every remaining row is considered and none of them is unexpected
+    return not is_mostly_successful(
+        rows_considered + remaining_rows, state.unexpected_count, mostly
+    )
+
+
+def validate_dataset_failing_fast(
+    dataset_name: str,
+    expectation_name_object: ExpectationSuiteName,
+    confidence: int,
+    max_failures=FAIL_FAST_MAX_FAILURES,
+    chunk_size=CHUNK_SIZE
+) -> dict or None:
+    """
+    This function validates a dataset chunk by chunk, and stops as soon as an
+    expectation can no longer succeed at the given confidence, or once the number of
+    unexpected values reaches a limit. The result of a stopped validation is partial:
+    only the expectations that certainly failed are decided.
+
+    :param dataset_name: String with the name of the dataset to be validated.
+    :param expectation_name_object: Expectation set name.
+    :param confidence: Integer with confidence ranging from 0 to 100.
+    :param max_failures: Integer with the number of unexpected values that stops the
+    validation, 0 for no limit.
+    :param chunk_size: Maximum number of rows in each chunk.
+
+    :return: Dictionary with the validation result, or None if the dataset is not
+    compatible with the expectation set.
+    """
+    dataset_path = get_imported_dataset_path(dataset_name)
+
+    config = get_expectation_set_config(expectation_name_object.name)
+    expectations_from_set_config = config.get(EXPECTATIONS)
+
+    if not is_dataset_compatible(dataset_path, expectations_from_set_config):
+        return None
+
+    mostly = confidence / 100
+    total_rows = None
+    if is_csv_file_by_name(get_file_name_by_path(dataset_path)):
+        total_rows = count_csv_rows(dataset_path)
+
+    plan = compile_expectation_plan(expectations_from_set_config)
+    states = build_expectation_states(plan)
+    failed_positions = list()
+    termination_reason = None
+    validated_rows = 0
+
+    separator = infer_csv_separator(dataset_path)
+    chunks = read_dataset_in_chunks(dataset_path, sep=separator, chunk_size=chunk_size)
+    for chunk in chunks:
+        validated_rows += len(chunk)
+        intermediates = compute_intermediates(chunk, plan.intermediates)
+        update_expectation_states(chunk, states, intermediates)
+
+        remaining_rows = None
+        if total_rows is not None:
+            remaining_rows = max(total_rows - validated_rows, 0)
+        failed_positions = [
+            position for position, (_, _, state) in enumerate(states)
+            if is_expectation_certainly_failed(state, mostly, remaining_rows)
+        ]
+        unexpected_count = sum([state.unexpected_count for _, _, state in states])
+        if failed_positions:
+            termination_reason = (
+                f"{len(failed_positions)} expectations cannot succeed at "
+                f"{confidence}% confidence"
+            )
+        elif max_failures and unexpected_count >= max_failures:
+            termination_reason = f"{unexpected_count} unexpected values were found"
+        if termination_reason is not None:
+            # A dataset that has been read in full is not terminated early. Counted
+            # rows are an upper bound, so the reader tells if any row remains
+            if validated_rows == total_rows or next(chunks, None) is None:
+                termination_reason = None
+            break
+
+    expectation_results = finalize_expectation_states(states)
+    early_terminated = termination_reason is not None
+    if early_terminated:
+        for position, expectation_result in enumerate(expectation_results):
+            expectation_result[RESULT][DECIDABLE] = position in failed_positions
+
+    return {
+        EXPECTATION_SET_NAME: expectation_name_object.name,
+        DATASET_NAME: dataset_name,
+        CONFIDENCE: confidence,
+        MODE: FAIL_FAST_MODE,
+        RUN_TIME: str(datetime.now()),
+        VALIDATED_ROWS: validated_rows,
+        TOTAL_ROWS: validated_rows if not early_terminated else total_rows,
+        EARLY_TERMINATED: early_terminated,
+        TERMINATION_REASON: termination_reason,
+        RESULTS: expectation_results,
+    }
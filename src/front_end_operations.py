@@ -1,7 +1,11 @@
 import os
 import dash
 import webbrowser
+import pandas as pd
+import plotly.graph_objects as go
+from functools import lru_cache
 
+from constants.expectation_set_constants import INTERFACE_NAME_CACHE_SIZE
 from constants.great_expectations_constants import (
     EXPECTATION_CONJUNCTION,
     MULTICOLUMN_EXPECTATIONS_MAP,
@@ -53,15 +57,16 @@ def is_trigger(component_name) -> bool:
     return component_name in [tc["prop_id"].split(".")[0] for tc in ctx.triggered]
 
 
-def get_checklist_component(item_name: str) -> dict:
+def get_checklist_component(item_name: str, label=None) -> dict:
     """
     Returns a dcc.Checklist component.
 
     :param item_name: String with the name of the item.
+    :param label: String shown instead of the name of the item, or None.
 
     :return: Dictionary.
     """
-    return {"label": item_name, "value": item_name}
+    return {"label": item_name if label is None else label, "value": item_name}
 
 
 def get_checklist_components(item_names: list) -> list:
@@ -73,6 +78,20 @@ def get_checklist_components(item_names: list) -> list:
     return [get_checklist_component(item_name) for item_name in item_names]
 
 
+def get_checklist_values(checklist_components: list) -> list:
+    """
+    Returns the names of the items of some checklist components.
+
+    :param checklist_components: List with checklist components, or with item names.
+
+    :return: List with item names.
+    """
+    return [
+        component["value"] if isinstance(component, dict) else component
+        for component in checklist_components
+    ]
+
+
 def hide_component(current_style: dict) -> dict:
     """
     Allows a component to be hidden in the interface.
@@ -144,31 +163,90 @@ def get_expectation_id_and_column_name_from_interface_name(interface_name: str)
     return expectation_id, column_name.split(", ")
 
 
+def get_expectation_key(expectation_id: str, column_names: list) -> tuple:
+    """
+    Returns the key that identifies an expectation in the definer checklist, whatever
+    the order of its columns.
+
+    :param expectation_id: String with GE's expectation ID.
+    :param column_names: List with column names.
+
+    :return: Tuple with the expectation ID and the columns, in any order.
+    """
+    return expectation_id, frozenset(column_names)
+
+
+@lru_cache(maxsize=INTERFACE_NAME_CACHE_SIZE)
+def get_expectation_key_from_interface_name(interface_name: str) -> tuple:
+    """
+    Returns the key of an expectation given its interface name. Names are parsed once
+    and their keys are kept in memory.
+
+    :param interface_name: String with expectation interface name.
+
+    :return: Tuple, see get_expectation_key().
+    """
+    return get_expectation_key(
+        *get_expectation_id_and_column_name_from_interface_name(interface_name)
+    )
+
+
+def build_checklist_index(current_expectations: list) -> set:
+    """
+    Returns the hashed index of the definer checklist, with the keys of its
+    expectations.
+
+    :param current_expectations: List with existing expectation interface names.
+
+    :return: Set with expectation keys.
+    """
+    return {
+        get_expectation_key_from_interface_name(interface_name)
+        for interface_name in current_expectations
+    }
+
+
 def expectation_is_already_in_checklist(
-    new_interface_name: str, current_expectations: list
+    new_interface_name: str, checklist_index: set
 ) -> bool:
     """
-    Returns if an expectation interface name, for a multicolumn expectation, does
-    already exist.
+    Returns if an expectation interface name does already exist, whatever the order
+    of its columns.
 
     :param new_interface_name: String with the interface name of the new expectation.
-    :param current_expectations: List with existing expectation interface names.
+    :param checklist_index: Set with the keys of the existing expectations, see
+    build_checklist_index().
 
     :return Bool.
     """
-    exists = False
-    (
-        new_expectation_id,
-        new_column_name
-    ) = get_expectation_id_and_column_name_from_interface_name(new_interface_name)
-
-    for interface_name in current_expectations:
-        (
-            expectation_id,
-            column_name
-        ) = get_expectation_id_and_column_name_from_interface_name(interface_name)
-        if new_expectation_id == expectation_id:
-            if set(new_column_name) == set(column_name):
-                exists = True
-
-    return exists
+    return get_expectation_key_from_interface_name(new_interface_name) in checklist_index
+
+
+def build_expectation_trend_figure(trends: pd.DataFrame) -> go.Figure:
+    """
+    Builds a chart with the unexpected percentage of every expectation over time, with
+    a line per expectation.
+
+    :param trends: Pandas DataFrame, see get_expectation_trends().
+
+    :return: Plotly Figure.
+    """
+    figure = go.Figure()
+    for (column_key, expectation_name), expectation_trend in trends.groupby(
+        ["column_key", "expectation_name"], sort=False
+    ):
+        figure.add_trace(
+            go.Scatter(
+                x=expectation_trend["run_time"],
+                y=100 * expectation_trend["unexpected_fraction"],
+                mode="lines+markers",
+                name=f"{expectation_name} ({column_key})"
+            )
+        )
+    figure.update_layout(
+        xaxis_title="Run time",
+        yaxis_title="Unexpected (%)",
+        legend={"orientation": "h"},
+        margin={"l": 0, "r": 0, "t": 20, "b": 0}
+    )
+    return figure
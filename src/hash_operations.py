@@ -0,0 +1,96 @@
+import os
+import json
+import hashlib
+
+# File hashes are remembered by path, together with the size and modification time
+# they were computed for, so that unchanged files are not read again
+_FILE_HASHES = dict()
+
+
+def get_text_hash(text: str) -> str:
+    """
+    Returns the SHA-256 hash of a string.
+
+    :param text: String to be hashed.
+
+    :return: String with the hexadecimal hash.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def get_canonical_json(content) -> str:
+    """
+    Returns a canonical JSON representation of a Python object, where dictionary keys
+    are sorted and no whitespace is used. Equal contents always give the same string.
+
+    :param content: Python object that can be converted to JSON.
+
+    :return: String with JSON.
+    """
+    return json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def get_content_hash(content) -> str:
+    """
+    Returns the hash of the canonical JSON representation of a Python object.
+
+    :param content: Python object that can be converted to JSON.
+
+    :return: String with the hexadecimal hash.
+    """
+    return get_text_hash(get_canonical_json(content))
+
+
+def get_file_hash(path: os.path, block_size=1024 * 1024) -> str:
+    """
+    Returns the SHA-256 hash of the content of a file. The file is read in blocks, so
+    it never has to fit in memory.
+
+    :param path: Path of the file.
+    :param block_size: Integer with the number of bytes read at once.
+
+    :return: String with the hexadecimal hash.
+    """
+    stat = os.stat(path)
+    absolute_path = os.path.abspath(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    known_signature, known_hash = _FILE_HASHES.get(absolute_path, (None, None))
+    if known_signature == signature:
+        return known_hash
+
+    file_hash = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for block in iter(lambda: fp.read(block_size), b""):
+            file_hash.update(block)
+    _FILE_HASHES[absolute_path] = (signature, file_hash.hexdigest())
+    return file_hash.hexdigest()
+
+
+def get_file_prefix_hashes(path: os.path, prefix_size: int, block_size=1024 * 1024) -> tuple:
+    """
+    Returns, in a single pass, the SHA-256 hash of the first bytes of a file and the
+    hash of the whole file. It tells if a file has only grown since its prefix was
+    hashed, without reading it twice.
+
+    :param path: Path of the file.
+    :param prefix_size: Integer with the number of bytes of the prefix.
+    :param block_size: Integer with the number of bytes read at once.
+
+    :return: Tuple with the hexadecimal hashes of the prefix and of the whole file. The
+    first one is None if the file is shorter than the prefix.
+    """
+    prefix_hash = None
+    file_hash = hashlib.sha256()
+    read_size = 0
+    with open(path, "rb") as fp:
+        if prefix_size:
+            for block in iter(lambda: fp.read(min(block_size, prefix_size - read_size)), b""):
+                file_hash.update(block)
+                read_size += len(block)
+                if read_size == prefix_size:
+                    break
+        if read_size == prefix_size:
+            prefix_hash = file_hash.hexdigest()
+        for block in iter(lambda: fp.read(block_size), b""):
+            file_hash.update(block)
+    return prefix_hash, file_hash.hexdigest()
@@ -0,0 +1,357 @@
+import os
+import threading
+from datetime import datetime
+
+from objects.hash_counter import HashCounter
+from objects.expectation_state import ExpectationState
+from objects.expectation_suite_name import ExpectationSuiteName
+
+from constants.path_constants import INCREMENTAL_STATES_PATH
+from constants.expectation_set_constants import EXPECTATIONS, EXPECTATION_SET_NAME
+from constants.validation_constants import (
+    MODE,
+    ENGINE,
+    STATES,
+    RESULTS,
+    RUN_TIME,
+    CHUNK_SIZE,
+    CONFIDENCE,
+    TOTAL_ROWS,
+    HASHES_SIZE,
+    PREFIX_HASH,
+    DATASET_NAME,
+    OBSERVED_MIN,
+    OBSERVED_MAX,
+    ELEMENT_COUNT,
+    MISSING_COUNT,
+    ROW_WATERMARK,
+    BYTE_WATERMARK,
+    VALIDATED_ROWS,
+    INCREMENTAL_MODE,
+    UNEXPECTED_COUNT,
+    ENDS_WITH_NEWLINE,
+    WATERMARK_FILE_NAME,
+    EXPECTATION_SET_HASH
+)
+
+from src.json_operations import read_json, write_json
+from src.validation_operations import is_dataset_compatible
+from src.validation_cache_operations import get_engine_version
+from src.expectation_set_operations import get_expectation_set_config
+from src.expectation_plan_operations import compile_expectation_plan
+from src.hash_operations import get_text_hash, get_file_prefix_hashes
+from src.value_set_operations import get_expectation_set_version
+from src.utils import (
+    infer_csv_separator,
+    read_dataset_in_chunks,
+    read_csv_in_chunks_from_offset
+)
+from src.chunked_validation_operations import (
+    validate_chunks,
+    build_expectation_states,
+    finalize_expectation_states
+)
+from src.low_level_operations import (
+    make_dir,
+    join_paths,
+    exists_path,
+    delete_directory,
+    is_csv_file_by_name,
+    get_file_name_by_path,
+    get_imported_dataset_path
+)
+
+_STATES_LOCK = threading.Lock()
+
+
+def get_incremental_state_path(dataset_name: str, expectation_set_name: str) -> os.path:
+    """
+    Returns the directory where the state of the last incremental validation of a
+    dataset against an expectation set is kept. It is named after a hash of both names,
+    since any separator could also be part of them.
+
+    :param dataset_name: String with the name of the dataset.
+    :param expectation_set_name: String with the name of the expectation set.
+
+    :return: Path.
+    """
+    return join_paths(
+        INCREMENTAL_STATES_PATH,
+        get_text_hash(expectation_set_name + "\n" + dataset_name)[:32]
+    )
+
+
+def get_hashes_path(state_path: os.path, position: int) -> os.path:
+    """
+    Returns the file where the value hashes of an expectation are kept.
+
+    :param state_path: Path of the state directory.
+    :param position: Integer with the position of the expectation in the set config.
+
+    :return: Path.
+    """
+    return join_paths(state_path, f"hashes_{position}.bin")
+
+
+def read_watermark(state_path: os.path) -> dict or None:
+    """
+    Reads the watermark of the last incremental validation, which holds how far the
+    dataset was read and the states of the expectations at that point.
+
+    :param state_path: Path of the state directory.
+
+    :return: Dictionary, or None if there is no previous validation.
+    """
+    watermark_path = join_paths(state_path, WATERMARK_FILE_NAME)
+    if not exists_path(watermark_path):
+        return None
+    with open(watermark_path, "r") as fp:
+        return read_json(fp)
+
+
+def write_watermark(state_path: os.path, watermark: dict) -> None:
+    """
+    Writes the watermark of an incremental validation. It is written under a temporary
+    name first, so that a watermark is never read half written.
+
+    :param state_path: Path of the state directory.
+    :param watermark: Dictionary with the watermark.
+    """
+    watermark_path = join_paths(state_path, WATERMARK_FILE_NAME)
+    temporary_path = watermark_path + ".tmp"
+    with open(temporary_path, "w") as fp:
+        write_json(watermark, fp)
+    os.replace(temporary_path, watermark_path)
+
+
+def truncate_hashes(state_path: os.path, saved_states: list) -> None:
+    """
+    Truncates the hash files of the expectations to the size they had when the
+    watermark was written. Hashes appended by a validation that failed before writing
+    its watermark belong to rows that will be read again, so they are dropped.
+
+    :param state_path: Path of the state directory.
+    :param saved_states: List with the saved states of the watermark.
+    """
+    for position, saved_state in enumerate(saved_states):
+        hashes_path = get_hashes_path(state_path, position)
+        if saved_state.get(HASHES_SIZE) is not None and exists_path(hashes_path):
+            os.truncate(hashes_path, saved_state[HASHES_SIZE])
+
+
+def read_byte(path: os.path, position: int) -> bytes:
+    """
+    :param path: Path of a file.
+    :param position: Integer with the position of the byte.
+
+    :return: Bytes with the byte at the given position, empty if there is none.
+    """
+    if position < 0:
+        return b""
+    with open(path, "rb") as fp:
+        fp.seek(position)
+        return fp.read(1)
+
+
+def can_resume_validation(
+    dataset_path: os.path,
+    watermark: dict or None,
+    expectation_set_hash: str,
+    prefix_hash: str or None
+) -> bool:
+    """
+    Returns if a validation can start where the previous one stopped. That is only the
+    case if the expectation set and the engine did not change, and the dataset has
+    only grown since then. Rows can only be appended to CSV files.
+
+    :param dataset_path: Path of the dataset.
+    :param watermark: Dictionary with the watermark of the previous validation, if any.
+    :param expectation_set_hash: String with the hash of the expectation set.
+    :param prefix_hash: String with the hash of the part of the dataset that was
+    already validated, or None if the dataset is now shorter.
+
+    :return: Bool.
+    """
+    if watermark is None:
+        return False
+    if watermark[EXPECTATION_SET_HASH] != expectation_set_hash:
+        return False
+    if watermark[ENGINE] != get_engine_version(INCREMENTAL_MODE):
+        return False
+    if prefix_hash is None or prefix_hash != watermark[PREFIX_HASH]:
+        return False
+    if os.path.getsize(dataset_path) == watermark[BYTE_WATERMARK]:
+        return True
+    if not is_csv_file_by_name(get_file_name_by_path(dataset_path)):
+        return False
+    # New rows have to start on a new line
+    return watermark[ENDS_WITH_NEWLINE] or \
+        read_byte(dataset_path, watermark[BYTE_WATERMARK]) in [b"\n", b"\r"]
+
+
+def serialize_expectation_state(state: ExpectationState, hashes_path=None) -> dict:
+    """
+    Returns the counts of a state that has not been finalized, so that they can be
+    written as JSON. Hashes are kept in their own file, whose size is saved too.
+
+    :param state: ExpectationState object.
+    :param hashes_path: Path of the file with the value hashes, only for those
+    expectations that look for duplicated values.
+
+    :return: Dictionary.
+    """
+    return {
+        ELEMENT_COUNT: state.element_count,
+        MISSING_COUNT: state.missing_count,
+        UNEXPECTED_COUNT: state.unexpected_count,
+        OBSERVED_MIN: state.observed_min,
+        OBSERVED_MAX: state.observed_max,
+        HASHES_SIZE: os.path.getsize(hashes_path)
+        if hashes_path is not None and exists_path(hashes_path) else None,
+    }
+
+
+def load_expectation_state(saved_state: dict or None, hashes_path=None) -> ExpectationState:
+    """
+    Rebuilds the state of an expectation from its saved counts and hashes.
+
+    :param saved_state: Dictionary with saved counts, or None to start from scratch.
+    :param hashes_path: Path of the file with the value hashes, only for those
+    expectations that look for duplicated values.
+
+    :return: ExpectationState object.
+    """
+    hash_counter = None
+    if hashes_path is not None:
+        hash_counter = HashCounter()
+        if exists_path(hashes_path):
+            hash_counter.add_from_file(hashes_path)
+    state = ExpectationState(hash_counter)
+    if saved_state is not None:
+        state.update(
+            saved_state[ELEMENT_COUNT],
+            saved_state[MISSING_COUNT],
+            saved_state[UNEXPECTED_COUNT],
+            observed_min=saved_state[OBSERVED_MIN],
+            observed_max=saved_state[OBSERVED_MAX]
+        )
+    return state
+
+
+def validate_dataset_incrementally(
+    dataset_name: str,
+    expectation_name_object: ExpectationSuiteName,
+    chunk_size=CHUNK_SIZE
+) -> dict or None:
+    """
+    This function validates a dataset that only grows. The rows read, the bytes read
+    and the mergeable state of every expectation are kept after each run, so that the
+    next run only validates appended rows and merges them with the previous state. If
+    the part already validated changed, the whole dataset is validated again.
+
+    :param dataset_name: String with the name of the dataset to be validated.
+    :param expectation_name_object: Expectation set name.
+    :param chunk_size: Maximum number of rows in each chunk.
+
+    :return: Dictionary with the validation result, or None if the dataset is not
+    compatible with the expectation set.
+    """
+    dataset_path = get_imported_dataset_path(dataset_name)
+
+    config = get_expectation_set_config(expectation_name_object.name)
+    expectations_from_set_config = config.get(EXPECTATIONS)
+
+    if not is_dataset_compatible(dataset_path, expectations_from_set_config):
+        return None
+
+    expectation_set_hash = get_expectation_set_version(expectations_from_set_config)
+    state_path = get_incremental_state_path(dataset_name, expectation_name_object.name)
+
+    with _STATES_LOCK:
+        watermark = read_watermark(state_path)
+        file_size = os.path.getsize(dataset_path)
+        prefix_hash, file_hash = get_file_prefix_hashes(
+            dataset_path, watermark[BYTE_WATERMARK] if watermark else 0
+        )
+        if not can_resume_validation(
+            dataset_path, watermark, expectation_set_hash, prefix_hash
+        ):
+            delete_directory(state_path)
+            make_dir(state_path)
+            watermark = {ROW_WATERMARK: 0, BYTE_WATERMARK: 0, STATES: None}
+        else:
+            truncate_hashes(state_path, watermark[STATES])
+
+        # Only the rows after the watermark are read
+        plan = compile_expectation_plan(expectations_from_set_config)
+        new_states = build_expectation_states(plan)
+        separator = infer_csv_separator(dataset_path)
+        validated_rows = 0
+        if not watermark[BYTE_WATERMARK]:
+            validated_rows = validate_chunks(
+                read_dataset_in_chunks(dataset_path, sep=separator, chunk_size=chunk_size),
+                plan,
+                new_states
+            )
+        elif file_size > watermark[BYTE_WATERMARK]:
+            validated_rows = validate_chunks(
+                read_csv_in_chunks_from_offset(
+                    dataset_path,
+                    watermark[BYTE_WATERMARK],
+                    watermark[ROW_WATERMARK],
+                    sep=separator,
+                    chunk_size=chunk_size
+                ),
+                plan,
+                new_states
+            )
+
+        # Merging the new rows with the previous state
+        states = list()
+        hashes_paths = list()
+        for position, (column_key, expectation, new_state) in enumerate(new_states):
+            hashes_path = None
+            if new_state.hash_counter is not None:
+                hashes_path = get_hashes_path(state_path, position)
+                new_state.hash_counter.save(hashes_path)
+                new_state.hash_counter.close()
+            state = load_expectation_state(
+                watermark[STATES][position] if watermark[STATES] else None, hashes_path
+            )
+            state.update(
+                new_state.element_count,
+                new_state.missing_count,
+                new_state.unexpected_count,
+                observed_min=new_state.observed_min,
+                observed_max=new_state.observed_max
+            )
+            states.append((column_key, expectation, state))
+            hashes_paths.append(hashes_path)
+
+        write_watermark(
+            state_path,
+            {
+                ROW_WATERMARK: watermark[ROW_WATERMARK] + validated_rows,
+                BYTE_WATERMARK: file_size,
+                PREFIX_HASH: file_hash,
+                ENDS_WITH_NEWLINE: read_byte(dataset_path, file_size - 1) in [b"\n", b"\r"],
+                EXPECTATION_SET_HASH: expectation_set_hash,
+                ENGINE: get_engine_version(INCREMENTAL_MODE),
+                STATES: [
+                    serialize_expectation_state(state, hashes_path)
+                    for (_, _, state), hashes_path in zip(states, hashes_paths)
+                ],
+            }
+        )
+        expectation_results = finalize_expectation_states(states)
+
+    return {
+        EXPECTATION_SET_NAME: expectation_name_object.name,
+        DATASET_NAME: dataset_name,
+        CONFIDENCE: None,
+        MODE: INCREMENTAL_MODE,
+        RUN_TIME: str(datetime.now()),
+        VALIDATED_ROWS: validated_rows,
+        TOTAL_ROWS: watermark[ROW_WATERMARK] + validated_rows,
+        RESULTS: expectation_results,
+    }
@@ -6,6 +6,7 @@ import dash_bootstrap_components as dbc
 
 from constants.defaults import EMPTY_LIST, EMPTY_STRING
 from constants.supported_constants import SUPPORTED_CORRECTION_DATA_TYPES
+from constants.validation_constants import VALIDATION_MODES, DEFAULT_VALIDATION_MODE
 from constants.layout_shortcut_constants import (
     INPUT_STYLE,
     MAIN_COL_STYLE,
@@ -373,6 +374,60 @@ def create_layout(app: dash.Dash) -> dash.Dash:
                                         justify="start",
                                         style={"marginTop": "20px"},
                                     ),
+                                    dbc.Row(
+                                        [
+                                            dbc.Col(
+                                                [
+                                                    html.H6(
+                                                        "Mode:",
+                                                        style={"marginTop": "10px"}
+                                                    )
+                                                ],
+                                                width=4
+                                            ),
+                                            dbc.Col(
+                                                [
+                                                    dcc.Dropdown(
+                                                        VALIDATION_MODES,
+                                                        value=DEFAULT_VALIDATION_MODE,
+                                                        id="validation_mode_dropdown",
+                                                        clearable=False,
+                                                        style={"marginBottom": "15px"}
+                                                    )
+                                                ],
+                                                width=8
+                                            ),
+                                        ],
+                                        justify="start",
+                                    ),
+                                    dbc.Row(
+                                        [
+                                            dbc.Col(
+                                                [
+                                                    dcc.Checklist(
+                                                        value=EMPTY_LIST,
+                                                        options=[
+                                                            "Export unexpected rows "
+                                                            "(Chunked mode)"
+                                                        ],
+                                                        id="export_unexpected_rows_checklist",
+                                                        labelStyle={"display": "block"},
+                                                        inputStyle={"marginRight": "15px"},
+                                                        style={"marginBottom": "15px"}
+                                                    )
+                                                ],
+                                            ),
+                                        ],
+                                        justify="start",
+                                    ),
+                                    html.Div(
+                                        id="validation_error_div",
+                                        style={
+                                            "marginBottom": "15px",
+                                            "color": "red",
+                                            "display": "none"
+                                        }
+                                    ),
                                     html.Div(
                                         [
                                             dbc.Row(
@@ -398,6 +453,36 @@ def create_layout(app: dash.Dash) -> dash.Dash:
                                                     ),
                                                 ],
                                                 justify="between"
+                                            ),
+                                            html.Div(
+                                                [
+                                                    html.H6(
+                                                        "Evaluate at confidence (%):",
+                                                        style={"marginTop": "20px"}
+                                                    ),
+                                                    dcc.Slider(
+                                                        0,
+                                                        100,
+                                                        1,
+                                                        value=100,
+                                                        marks=None,
+                                                        tooltip={
+                                                            "placement": "bottom",
+                                                            "always_visible": True
+                                                        },
+                                                        id="validation_confidence_slider"
+                                                    ),
+                                                    html.Div(
+                                                        id="validation_evaluation_div",
+                                                        style={
+                                                            "marginTop": "10px",
+                                                            "maxHeight": "25vh",
+                                                            "overflow": "scroll"
+                                                        }
+                                                    )
+                                                ],
+                                                id="validation_evaluation_container_div",
+                                                style={"display": "none"}
                                             )
                                         ],
                                         id="validation_operations_div",
@@ -532,6 +617,32 @@ def create_layout(app: dash.Dash) -> dash.Dash:
                                 ],
                                 justify="between"
                             ),
+                            dcc.Upload(
+                                [
+                                    "Drop or select a YAML, JSON or CSV spec to "
+                                    "import many expectations at once"
+                                ],
+                                id="expectation_set_spec_uploader",
+                                accept=".yaml,.yml,.json,.csv",
+                                style={
+                                    "marginTop": "20px",
+                                    "padding": "10px",
+                                    "textAlign": "center",
+                                    "border": "2px black dashed",
+                                    "borderRadius": "10px",
+                                    "cursor": "pointer"
+                                }
+                            ),
+                            html.Div(
+                                id="expectation_set_spec_errors_div",
+                                style={
+                                    "marginTop": "10px",
+                                    "maxHeight": "15vh",
+                                    "overflow": "scroll",
+                                    "color": "red",
+                                    "display": "none"
+                                }
+                            ),
                             html.Div(
                                 [
                                     dcc.Checklist(
@@ -630,7 +741,7 @@ def create_layout(app: dash.Dash) -> dash.Dash:
                             ),
                             html.Div(
                                 [
-                                    html.H5("Values (v1,v2,...)"),
+                                    html.H5("Values (v1,v2,... or @dataset:column)"),
                                     dcc.Input(
                                         id="values_single_column_exp_param_input",
                                         style=INPUT_STYLE
@@ -639,6 +750,30 @@ def create_layout(app: dash.Dash) -> dash.Dash:
                                 id="values_single_column_exp_param_div",
                                 style={"display": "none"}
                             ),
+                            html.Div(
+                                [
+                                    html.H5("Referenced dataset"),
+                                    dcc.Dropdown(
+                                        id="reference_dataset_exp_param_input",
+                                        options=EMPTY_LIST,
+                                        style={"marginBottom": "20px"}
+                                    )
+                                ],
+                                id="reference_dataset_exp_param_div",
+                                style={"display": "none"}
+                            ),
+                            html.Div(
+                                [
+                                    html.H5("Referenced column"),
+                                    dcc.Dropdown(
+                                        id="reference_column_exp_param_input",
+                                        options=EMPTY_LIST,
+                                        style={"marginBottom": "20px"}
+                                    )
+                                ],
+                                id="reference_column_exp_param_div",
+                                style={"display": "none"}
+                            ),
                             dbc.Row(
                                 [
                                     dbc.Col(
@@ -129,7 +129,7 @@ def is_validation_name(name: str) -> bool:
 
     :return: Bool.
     """
-    return ends_with(".html", name)
+    return any([ends_with(ending, name) for ending in [".html", ".json"]])
 
 
 def is_directory(path: os.path) -> bool:
@@ -0,0 +1,42 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from constants.validation_constants import VALIDATION_THREADS
+
+# A single pool is shared by every validation of the process, so that concurrent
+# validations never run more threads than configured
+_VALIDATION_EXECUTOR = None
+_VALIDATION_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_validation_executor() -> ThreadPoolExecutor:
+    """
+    Returns the thread pool where independent parts of a validation are run, creating
+    it the first time.
+
+    :return: ThreadPoolExecutor object.
+    """
+    global _VALIDATION_EXECUTOR
+    with _VALIDATION_EXECUTOR_LOCK:
+        if _VALIDATION_EXECUTOR is None:
+            _VALIDATION_EXECUTOR = ThreadPoolExecutor(
+                max_workers=VALIDATION_THREADS, thread_name_prefix="deebee_validation"
+            )
+        return _VALIDATION_EXECUTOR
+
+
+def map_in_parallel(function, items: list) -> list:
+    """
+    Applies a function to every item, in the validation thread pool. NumPy and Pandas
+    release the GIL for most of their work, so items run concurrently. Results keep the
+    order of the items, whatever the order in which they finish. The function must not
+    use the pool itself, or it could wait forever for a free thread.
+
+    :param function: Function that takes a single item.
+    :param items: List with the items.
+
+    :return: List with the results, in item order.
+    """
+    if VALIDATION_THREADS <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+    return list(get_validation_executor().map(function, items))
@@ -0,0 +1,137 @@
+import os
+import threading
+import numpy as np
+
+from constants.path_constants import REFERENCE_INDEXES_PATH
+
+from src.hash_operations import get_file_hash, get_text_hash
+from src.utils import infer_csv_separator, read_dataset_in_chunks
+from src.validation_plan_operations import compute_value_hashes
+from src.low_level_operations import (
+    make_dir,
+    join_paths,
+    delete_file,
+    exists_path,
+    get_imported_dataset_path,
+    get_elements_inside_directory
+)
+
+# Loaded indexes, together with the hash of the dataset content they were built from
+_REFERENCE_INDEXES = dict()
+_REFERENCE_INDEXES_LOCK = threading.Lock()
+
+
+def get_reference_index_prefix(dataset_name: str, column: str) -> str:
+    """
+    Returns the prefix shared by every index file built from a column, whatever the
+    version of its dataset.
+
+    :param dataset_name: String with the name of the referenced dataset.
+    :param column: String with the name of the referenced column.
+
+    :return: String.
+    """
+    return get_text_hash(dataset_name + "\n" + column)[:16] + "_"
+
+
+def get_reference_index_path(dataset_name: str, column: str, dataset_hash: str) -> os.path:
+    """
+    Returns the file where the index of a column is kept, for a given content of its
+    dataset.
+
+    :param dataset_name: String with the name of the referenced dataset.
+    :param column: String with the name of the referenced column.
+    :param dataset_hash: String with the hash of the dataset content.
+
+    :return: Path.
+    """
+    return join_paths(
+        REFERENCE_INDEXES_PATH,
+        get_reference_index_prefix(dataset_name, column) + dataset_hash[:16] + ".npy"
+    )
+
+
+def build_reference_index(dataset_path: os.path, column: str) -> np.ndarray:
+    """
+    Builds the index of a column: the sorted, unique 64 bit hashes of its values. It
+    takes 8 bytes per distinct value, and the column is read in chunks.
+
+    :param dataset_path: Path of the referenced dataset.
+    :param column: String with the name of the referenced column.
+
+    :return: Sorted NumPy array of unsigned integers.
+    """
+    hashes = [np.empty(0, dtype=np.uint64)]
+    separator = infer_csv_separator(dataset_path)
+    for chunk in read_dataset_in_chunks(dataset_path, sep=separator, columns=[column]):
+        hashes.append(np.unique(compute_value_hashes(chunk[column].dropna())))
+    return np.unique(np.concatenate(hashes))
+
+
+def save_reference_index(index_path: os.path, reference_index: np.ndarray) -> None:
+    """
+    Writes an index to disk and deletes the indexes built from previous versions of
+    the same column. The file is written under a temporary name first, so that an
+    index is never read half written.
+
+    :param index_path: Path of the index file.
+    :param reference_index: Sorted NumPy array of unsigned integers.
+    """
+    if not exists_path(REFERENCE_INDEXES_PATH):
+        make_dir(REFERENCE_INDEXES_PATH)
+    temporary_path = index_path + ".tmp"
+    with open(temporary_path, "wb") as fp:
+        np.save(fp, reference_index)
+    os.replace(temporary_path, index_path)
+
+    index_name = os.path.basename(index_path)
+    prefix = index_name[:index_name.index("_") + 1]
+    for name in get_elements_inside_directory(REFERENCE_INDEXES_PATH):
+        if name.startswith(prefix) and name != index_name:
+            delete_file(join_paths(REFERENCE_INDEXES_PATH, name))
+
+
+def get_reference_index(dataset_name: str, column: str) -> np.ndarray:
+    """
+    Returns the index of a referenced column. It is only rebuilt when the content of
+    its dataset changes. Otherwise it is reused from memory or from disk, where it is
+    memory mapped.
+
+    :param dataset_name: String with the name of the referenced dataset.
+    :param column: String with the name of the referenced column.
+
+    :return: Sorted NumPy array of unsigned integers.
+    """
+    dataset_path = get_imported_dataset_path(dataset_name)
+    dataset_hash = get_file_hash(dataset_path)
+    with _REFERENCE_INDEXES_LOCK:
+        known_hash, reference_index = _REFERENCE_INDEXES.get(
+            (dataset_name, column), (None, None)
+        )
+        if known_hash == dataset_hash:
+            return reference_index
+
+        index_path = get_reference_index_path(dataset_name, column, dataset_hash)
+        if exists_path(index_path):
+            reference_index = np.load(index_path, mmap_mode="r")
+        else:
+            reference_index = build_reference_index(dataset_path, column)
+            save_reference_index(index_path, reference_index)
+        _REFERENCE_INDEXES[(dataset_name, column)] = (dataset_hash, reference_index)
+        return reference_index
+
+
+def is_in_reference_index(hashes: np.ndarray, reference_index: np.ndarray) -> np.ndarray:
+    """
+    Returns which hashes are in an index, with a binary search for each of them.
+
+    :param hashes: NumPy array of 64 bit unsigned hashes.
+    :param reference_index: Sorted NumPy array of unsigned integers.
+
+    :return: Boolean NumPy array.
+    """
+    if not len(reference_index):
+        return np.zeros(len(hashes), dtype=bool)
+    positions = np.searchsorted(reference_index, hashes)
+    positions[positions == len(reference_index)] = 0
+    return reference_index[positions] == hashes
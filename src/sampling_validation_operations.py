@@ -0,0 +1,193 @@
+import os
+import math
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from statistics import NormalDist
+
+from objects.expectation_suite_name import ExpectationSuiteName
+
+from constants.expectation_set_constants import (
+    EXPECTATIONS,
+    EXPECTATION_NAME,
+    EXPECTATION_SET_NAME
+)
+from constants.validation_constants import (
+    MODE,
+    RESULT,
+    RESULTS,
+    RUN_TIME,
+    DECIDABLE,
+    CHUNK_SIZE,
+    CONFIDENCE,
+    TOTAL_ROWS,
+    SAMPLE_SIZE,
+    SAMPLE_SEED,
+    DATASET_NAME,
+    SAMPLED_ROWS,
+    SAMPLING_MODE,
+    ELEMENT_COUNT,
+    MISSING_COUNT,
+    UNEXPECTED_COUNT,
+    UNEXPECTED_FRACTION,
+    SAMPLE_CONFIDENCE_LEVEL,
+    UNIQUENESS_EXPECTATIONS,
+    UNEXPECTED_FRACTION_LOWER,
+    UNEXPECTED_FRACTION_UPPER
+)
+
+from src.validation_operations import is_dataset_compatible
+from src.low_level_operations import get_imported_dataset_path
+from src.utils import infer_csv_separator, read_dataset_in_chunks
+from src.expectation_set_operations import get_expectation_set_config
+from src.validation_plan_operations import compute_intermediates
+from src.expectation_plan_operations import compile_expectation_plan
+from src.chunked_validation_operations import (
+    build_expectation_result,
+    build_expectation_states,
+    update_expectation_states
+)
+
+
+def sample_dataset(
+    dataset_path: os.path,
+    columns: list,
+    sample_size=SAMPLE_SIZE,
+    seed=SAMPLE_SEED,
+    chunk_size=CHUNK_SIZE
+) -> (pd.DataFrame, int):
+    """
+    Draws a uniform sample of rows, without replacement, in a single pass over the
+    dataset. Every row gets a random priority and the rows with the lowest priorities
+    are kept, so the sample never holds more than sample_size rows plus one chunk.
+
+    :param dataset_path: Path of the dataset.
+    :param columns: List with the columns to be read.
+    :param sample_size: Maximum number of rows in the sample.
+    :param seed: Integer that makes the sample reproducible.
+    :param chunk_size: Maximum number of rows read at once.
+
+    :return: Tuple with the sample, as a Pandas DataFrame, and the number of rows of
+    the dataset.
+    """
+    random_generator = np.random.default_rng(seed)
+    sample = pd.DataFrame(columns=columns)
+    priorities = np.empty(0)
+    total_rows = 0
+
+    separator = infer_csv_separator(dataset_path)
+    for chunk in read_dataset_in_chunks(
+        dataset_path, sep=separator, chunk_size=chunk_size, columns=columns
+    ):
+        total_rows += len(chunk)
+        chunk_priorities = random_generator.random(len(chunk))
+        if sample.empty:
+            sample, priorities = chunk, chunk_priorities
+        else:
+            sample = pd.concat([sample, chunk])
+            priorities = np.concatenate([priorities, chunk_priorities])
+        if len(sample) > sample_size:
+            kept = np.argpartition(priorities, sample_size)[:sample_size]
+            sample, priorities = sample.iloc[kept], priorities[kept]
+
+    return sample.sort_index(), total_rows
+
+
+def get_confidence_interval(
+    unexpected_count: int, rows_considered: int, confidence_level=SAMPLE_CONFIDENCE_LEVEL
+) -> (float, float):
+    """
+    Returns the Wilson score interval of an unexpected fraction estimated on a sample.
+
+    :param unexpected_count: Integer with the number of unexpected rows in the sample.
+    :param rows_considered: Integer with the number of considered rows in the sample.
+    :param confidence_level: Float with the confidence level of the interval.
+
+    :return: Tuple with the lower and upper bounds, ranging from 0 to 1.
+    """
+    if not rows_considered:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence_level / 2)
+    fraction = unexpected_count / rows_considered
+    denominator = 1 + z ** 2 / rows_considered
+    center = (fraction + z ** 2 / (2 * rows_considered)) / denominator
+    margin = z * math.sqrt(
+        fraction * (1 - fraction) / rows_considered + z ** 2 / (4 * rows_considered ** 2)
+    ) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def add_sample_estimate(expectation_result: dict, is_whole_dataset: bool) -> None:
+    """
+    Adds the confidence interval of the unexpected fraction to an expectation result
+    computed on a sample. The result only succeeds or fails at the confidences the
+    whole interval agrees on, see evaluate_expectation_result(). Expectations that
+    depend on every row, such as uniqueness, are flagged as not decidable unless the
+    sample holds the whole dataset.
+
+    :param expectation_result: Dictionary with an expectation result. It is updated in
+    place.
+    :param is_whole_dataset: Bool that tells if every row of the dataset was sampled.
+    """
+    result = expectation_result[RESULT]
+    if is_whole_dataset:
+        lower = upper = result[UNEXPECTED_FRACTION]
+    else:
+        lower, upper = get_confidence_interval(
+            result[UNEXPECTED_COUNT], result[ELEMENT_COUNT] - result[MISSING_COUNT]
+        )
+    result[UNEXPECTED_FRACTION_LOWER] = lower
+    result[UNEXPECTED_FRACTION_UPPER] = upper
+    result[DECIDABLE] = is_whole_dataset or \
+        expectation_result[EXPECTATION_NAME] not in UNIQUENESS_EXPECTATIONS
+
+
+def validate_dataset_on_sample(
+    dataset_name: str,
+    expectation_name_object: ExpectationSuiteName,
+    sample_size=SAMPLE_SIZE
+) -> dict or None:
+    """
+    This function estimates the validation of a dataset against an expectation set
+    from a random sample of its rows. Only the columns with expectations are read, and
+    every unexpected fraction comes with a confidence interval.
+
+    :param dataset_name: String with the name of the dataset to be validated.
+    :param expectation_name_object: Expectation set name.
+    :param sample_size: Maximum number of rows in the sample.
+
+    :return: Dictionary with the validation result, or None if the dataset is not
+    compatible with the expectation set.
+    """
+    dataset_path = get_imported_dataset_path(dataset_name)
+
+    config = get_expectation_set_config(expectation_name_object.name)
+    expectations_from_set_config = config.get(EXPECTATIONS)
+
+    if not is_dataset_compatible(dataset_path, expectations_from_set_config):
+        return None
+
+    plan = compile_expectation_plan(expectations_from_set_config)
+    sample, total_rows = sample_dataset(dataset_path, list(plan.intermediates), sample_size)
+    intermediates = compute_intermediates(sample, plan.intermediates)
+
+    states = build_expectation_states(plan)
+    update_expectation_states(sample, states, intermediates)
+
+    expectation_results = list()
+    for _, expectation, state in states:
+        state.finalize()
+        expectation_result = build_expectation_result(expectation, state)
+        add_sample_estimate(expectation_result, len(sample) == total_rows)
+        expectation_results.append(expectation_result)
+
+    return {
+        EXPECTATION_SET_NAME: expectation_name_object.name,
+        DATASET_NAME: dataset_name,
+        CONFIDENCE: None,
+        MODE: SAMPLING_MODE,
+        RUN_TIME: str(datetime.now()),
+        SAMPLED_ROWS: len(sample),
+        TOTAL_ROWS: total_rows,
+        RESULTS: expectation_results,
+    }
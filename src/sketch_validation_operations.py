@@ -0,0 +1,255 @@
+import os
+from datetime import datetime
+from statistics import NormalDist
+
+from objects.expectation_plan import ExpectationPlan
+from objects.expectation_state import ExpectationState
+from objects.uniqueness_sketch import UniquenessSketch
+from objects.compiled_expectation import CompiledExpectation
+from objects.expectation_suite_name import ExpectationSuiteName
+
+from constants.expectation_set_constants import EXPECTATIONS, EXPECTATION_SET_NAME
+from constants.validation_constants import (
+    MODE,
+    EXACT,
+    RESULT,
+    RESULTS,
+    RUN_TIME,
+    CHUNK_SIZE,
+    CONFIDENCE,
+    SKETCH_MODE,
+    DATASET_NAME,
+    ELEMENT_COUNT,
+    MISSING_COUNT,
+    DISTINCT_COUNT,
+    UNEXPECTED_COUNT,
+    UNEXPECTED_FRACTION,
+    DISTINCT_COUNT_LOWER,
+    DISTINCT_COUNT_UPPER,
+    SKETCH_BLOOM_CAPACITY,
+    UNIQUENESS_EXPECTATIONS,
+    SKETCH_CONFIDENCE_LEVEL,
+    UNEXPECTED_FRACTION_LOWER,
+    UNEXPECTED_FRACTION_UPPER
+)
+
+from src.parallel_operations import map_in_parallel
+from src.validation_operations import is_dataset_compatible
+from src.validation_plan_operations import compute_intermediates, build_validation_plan
+from src.expectation_set_operations import get_expectation_set_config
+from src.expectation_plan_operations import compile_expectation_plan
+from src.low_level_operations import is_csv_file_by_name, get_imported_dataset_path
+from src.utils import (
+    count_csv_rows,
+    count_excel_rows,
+    infer_csv_separator,
+    read_dataset_in_chunks
+)
+from src.chunked_validation_operations import (
+    get_row_hashes,
+    validate_chunks,
+    build_expectation_result,
+    get_considered_rows_mask,
+    get_empty_expectation_state
+)
+
+
+def get_sketch_capacity(dataset_path: os.path) -> int:
+    """
+    Returns the number of hashes the Bloom filters of a dataset are sized for: its
+    number of rows, but never more than the configured capacity, which bounds the
+    memory of each filter.
+
+    :param dataset_path: Path of the dataset.
+
+    :return: Integer.
+    """
+    if is_csv_file_by_name(os.path.basename(dataset_path)):
+        n_rows = count_csv_rows(dataset_path)
+    else:
+        n_rows = count_excel_rows(dataset_path)
+    return max(1, min(n_rows, SKETCH_BLOOM_CAPACITY))
+
+
+def build_sketch_expectation_states(plan: ExpectationPlan, capacity: int) -> list:
+    """
+    Returns an empty state for every expectation of a set, in config order. Uniqueness
+    expectations keep a UniquenessSketch instead of every hash.
+
+    :param plan: ExpectationPlan object of the set.
+    :param capacity: Integer with the number of hashes each Bloom filter is sized for.
+
+    :return: List with tuples of column key, CompiledExpectation and ExpectationState.
+    """
+    states = list()
+    for expectation in plan.expectations:
+        if expectation.expectation_id in UNIQUENESS_EXPECTATIONS:
+            state = ExpectationState(UniquenessSketch(capacity))
+        else:
+            state = get_empty_expectation_state(expectation.expectation_id)
+        states.append((expectation.column_key, expectation, state))
+    return states
+
+
+def count_chunk_candidates(
+    expectation: CompiledExpectation, sketch: UniquenessSketch, intermediates: dict
+) -> None:
+    """
+    Counts the candidates of a uniqueness expectation among the rows of a chunk.
+
+    :param expectation: CompiledExpectation object.
+    :param sketch: UniquenessSketch object of the expectation.
+    :param intermediates: Dictionary with the intermediates of the chunk.
+    """
+    columns = list(expectation.columns)
+    considered = get_considered_rows_mask(expectation.expectation_id, columns, intermediates)
+    sketch.count_candidates(get_row_hashes(columns, intermediates)[considered])
+
+
+def count_sketch_candidates(
+    dataset_path: os.path, states: list, chunk_size=CHUNK_SIZE
+) -> None:
+    """
+    Reads the dataset a second time, only the columns of the uniqueness expectations
+    that have candidate duplicates, and counts those candidates exactly. Expectations
+    are counted in parallel.
+
+    :param dataset_path: Path of the dataset.
+    :param states: List with the states, see build_sketch_expectation_states().
+    :param chunk_size: Maximum number of rows in each chunk.
+    """
+    pending = [
+        (expectation, state.hash_counter)
+        for _, expectation, state in states
+        if isinstance(state.hash_counter, UniquenessSketch)
+        and state.hash_counter.needs_second_pass
+    ]
+    if not pending:
+        return
+
+    plan = build_validation_plan([expectation for expectation, _ in pending])
+
+    separator = infer_csv_separator(dataset_path)
+    for chunk in read_dataset_in_chunks(
+        dataset_path, sep=separator, chunk_size=chunk_size, columns=list(plan)
+    ):
+        intermediates = compute_intermediates(chunk, plan)
+        map_in_parallel(
+            lambda pending_sketch: count_chunk_candidates(*pending_sketch, intermediates),
+            pending
+        )
+
+
+def get_distinct_count_bounds(
+    sketch: UniquenessSketch, rows_considered: int, confidence_level=SKETCH_CONFIDENCE_LEVEL
+) -> (float, float, float):
+    """
+    Returns the distinct count estimated by the HyperLogLog of a sketch, with its
+    bounds at the given confidence level. No bound goes beyond the considered rows.
+
+    :param sketch: UniquenessSketch object.
+    :param rows_considered: Integer with the number of considered rows.
+    :param confidence_level: Float with the confidence level of the bounds.
+
+    :return: Tuple with the estimate, the lower bound and the upper bound.
+    """
+    if not rows_considered:
+        return 0.0, 0.0, 0.0
+    hyper_log_log = sketch.hyper_log_log
+    margin = NormalDist().inv_cdf(0.5 + confidence_level / 2) * hyper_log_log.relative_error
+    estimate = min(max(hyper_log_log.estimate(), 1.0), rows_considered)
+    lower = max(estimate * (1 - margin), 1.0)
+    upper = min(estimate * (1 + margin), rows_considered)
+    return estimate, lower, upper
+
+
+def add_sketch_estimate(expectation_result: dict, sketch: UniquenessSketch) -> None:
+    """
+    Adds the distinct count of a uniqueness expectation to its result. When the
+    candidates were counted the result is exact. Otherwise the unexpected count is only
+    known to be between the repeated values, n - distinct, and twice as many, because
+    every occurrence of a repeated value is unexpected. Those bounds come from the
+    bounds of the distinct count.
+
+    :param expectation_result: Dictionary with the result of a uniqueness expectation,
+    built from its finalized state. It is updated in place.
+    :param sketch: UniquenessSketch object of the expectation.
+    """
+    result = expectation_result[RESULT]
+    rows_considered = result[ELEMENT_COUNT] - result[MISSING_COUNT]
+    result[EXACT] = sketch.is_exact
+
+    if sketch.is_exact:
+        # Rows without duplicates are distinct, and each duplicated value counts once
+        distinct = rows_considered - sketch.count_duplicated() + \
+            sketch.count_duplicated_values()
+        result[DISTINCT_COUNT] = result[DISTINCT_COUNT_LOWER] = \
+            result[DISTINCT_COUNT_UPPER] = distinct
+        return
+
+    estimate, lower, upper = get_distinct_count_bounds(sketch, rows_considered)
+    result[DISTINCT_COUNT] = round(estimate)
+    result[DISTINCT_COUNT_LOWER] = round(lower)
+    result[DISTINCT_COUNT_UPPER] = round(upper)
+
+    unexpected_lower = max(rows_considered - upper, 0.0) / rows_considered
+    unexpected_upper = min(2 * (rows_considered - lower), rows_considered) / rows_considered
+    result[UNEXPECTED_COUNT] = None
+    result[UNEXPECTED_FRACTION] = (unexpected_lower + unexpected_upper) / 2
+    result[UNEXPECTED_FRACTION_LOWER] = unexpected_lower
+    result[UNEXPECTED_FRACTION_UPPER] = unexpected_upper
+
+
+def validate_dataset_with_sketches(
+    dataset_name: str, expectation_name_object: ExpectationSuiteName, chunk_size=CHUNK_SIZE
+) -> dict or None:
+    """
+    This function validates a dataset against an expectation set like
+    validate_dataset_in_chunks() does, but uniqueness expectations run in bounded
+    memory. A first pass fills a HyperLogLog and a Bloom filter per uniqueness
+    expectation, and a second pass, over their columns only, counts the candidate
+    duplicates flagged by the filter. Results are exact unless there were too many
+    candidates, in which case they come with bounds estimated from the distinct count.
+
+    :param dataset_name: String with the name of the dataset to be validated.
+    :param expectation_name_object: Expectation set name.
+    :param chunk_size: Maximum number of rows in each chunk.
+
+    :return: Dictionary with the validation result, or None if the dataset is not
+    compatible with the expectation set.
+    """
+    dataset_path = get_imported_dataset_path(dataset_name)
+
+    config = get_expectation_set_config(expectation_name_object.name)
+    expectations_from_set_config = config.get(EXPECTATIONS)
+
+    if not is_dataset_compatible(dataset_path, expectations_from_set_config):
+        return None
+
+    plan = compile_expectation_plan(expectations_from_set_config)
+    states = build_sketch_expectation_states(plan, get_sketch_capacity(dataset_path))
+    separator = infer_csv_separator(dataset_path)
+    validate_chunks(
+        read_dataset_in_chunks(dataset_path, sep=separator, chunk_size=chunk_size),
+        plan,
+        states
+    )
+    count_sketch_candidates(dataset_path, states, chunk_size)
+
+    expectation_results = list()
+    for _, expectation, state in states:
+        sketch = state.hash_counter
+        state.finalize()
+        expectation_result = build_expectation_result(expectation, state)
+        if isinstance(sketch, UniquenessSketch):
+            add_sketch_estimate(expectation_result, sketch)
+        expectation_results.append(expectation_result)
+
+    return {
+        EXPECTATION_SET_NAME: expectation_name_object.name,
+        DATASET_NAME: dataset_name,
+        CONFIDENCE: None,
+        MODE: SKETCH_MODE,
+        RUN_TIME: str(datetime.now()),
+        RESULTS: expectation_results,
+    }
@@ -0,0 +1,98 @@
+import os
+
+from objects.unexpected_rows_writer import UnexpectedRowsWriter
+
+from constants.path_constants import UNEXPECTED_ROWS_PATH
+from constants.validation_constants import UNEXPECTED_ROWS_EXTENSION, UNIQUENESS_EXPECTATIONS
+
+from src.validation_operations import build_new_validation_file_name
+from src.low_level_operations import make_dir, join_paths, delete_directory
+
+
+def get_unexpected_rows_path(dataset_name: str, expectation_set_name: str) -> os.path:
+    """
+    Returns the directory where the unexpected rows of a dataset, validated against an
+    expectation set, are exported.
+
+    :param dataset_name: String with the name of the dataset.
+    :param expectation_set_name: String with the name of the expectation set.
+
+    :return: Path.
+    """
+    return join_paths(
+        UNEXPECTED_ROWS_PATH,
+        build_new_validation_file_name(expectation_set_name, dataset_name, extension="")
+    )
+
+
+def get_unexpected_rows_file_path(
+    unexpected_rows_path: os.path, position: int, expectation_id: str
+) -> os.path:
+    """
+    Returns the Parquet file where the unexpected rows of an expectation are exported.
+
+    :param unexpected_rows_path: Path of the export directory.
+    :param position: Integer with the position of the expectation in the set config.
+    :param expectation_id: String with GE's expectation ID.
+
+    :return: Path.
+    """
+    return join_paths(
+        unexpected_rows_path, f"{position}_{expectation_id}{UNEXPECTED_ROWS_EXTENSION}"
+    )
+
+
+def build_unexpected_rows_writers(unexpected_rows_path: os.path, states: list) -> list:
+    """
+    Returns a writer for each expectation of a set, so that their unexpected rows are
+    exported while the dataset is validated. Rows exported by a previous validation
+    are deleted.
+
+    :param unexpected_rows_path: Path of the export directory.
+    :param states: List with the states, see build_expectation_states().
+
+    :return: List with UnexpectedRowsWriter objects, in config order.
+    """
+    delete_directory(unexpected_rows_path)
+    make_dir(unexpected_rows_path)
+
+    unexpected_rows_writers = list()
+    try:
+        for position, (column_key, expectation, _) in enumerate(states):
+            expectation_id = expectation.expectation_id
+            unexpected_rows_writers.append(
+                UnexpectedRowsWriter(
+                    get_unexpected_rows_file_path(
+                        unexpected_rows_path, position, expectation_id
+                    ),
+                    list(expectation.columns),
+                    expectation_id,
+                    column_key,
+                    keep_hashes=expectation_id in UNIQUENESS_EXPECTATIONS
+                )
+            )
+    except BaseException:
+        abort_unexpected_rows_export(unexpected_rows_path, unexpected_rows_writers)
+        raise
+    return unexpected_rows_writers
+
+
+def abort_unexpected_rows_export(
+    unexpected_rows_path: os.path, unexpected_rows_writers: list
+) -> None:
+    """
+    Closes the writers of an export that failed and deletes what they wrote.
+
+    :param unexpected_rows_path: Path of the export directory.
+    :param unexpected_rows_writers: List with UnexpectedRowsWriter objects.
+    """
+    for unexpected_rows_writer in unexpected_rows_writers:
+        unexpected_rows_writer.abort()
+    delete_directory(unexpected_rows_path)
+
+
+def delete_unexpected_rows() -> None:
+    """
+    Deletes every exported unexpected row.
+    """
+    delete_directory(UNEXPECTED_ROWS_PATH)
@@ -1,8 +1,11 @@
 import os
 import csv
+import openpyxl
 import pandas as pd
 from pandas_profiling import ProfileReport
 
+from constants.validation_constants import CHUNK_SIZE
+
 from src.low_level_operations import (
     is_csv_file_by_name,
     is_excel_file_by_name,
@@ -103,6 +106,114 @@ def read_dataset(path: os.path, sep=";", n_rows=None, type_dict=None) -> pd.Data
     return dataset
 
 
+def read_dataset_in_chunks(
+    path: os.path, sep=";", chunk_size=CHUNK_SIZE, type_dict=None, columns=None
+):
+    """
+    This function reads a dataset as a sequence of Pandas DataFrames, so that it never
+    has to fit in memory as a whole. Row indexes keep counting from one chunk to the
+    next. Pandas cannot stream Excel files, so those are read at once and then sliced.
+
+    :param path: Path where the dataset can be found.
+    :param sep: Separator character.
+    :param chunk_size: Maximum number of rows in each chunk.
+    :param type_dict: Dictionary with types.
+    :param columns: List with the columns to be read. All of them are read by default.
+
+    :return: Generator of Pandas DataFrames.
+    """
+    file_name = get_file_name_by_path(path)
+
+    if is_csv_file_by_name(file_name):
+        yield from pd.read_csv(
+            path, sep=sep, chunksize=chunk_size, dtype=type_dict, usecols=columns
+        )
+    elif is_excel_file_by_name(file_name):
+        dataset = read_excel_dataset(path, type_dict=type_dict)
+        if columns is not None:
+            dataset = dataset[columns]
+        for start in range(0, len(dataset), chunk_size):
+            yield dataset.iloc[start:start + chunk_size]
+
+
+def read_csv_in_chunks_from_offset(
+    path: os.path, byte_offset: int, first_row: int, sep=";", chunk_size=CHUNK_SIZE
+):
+    """
+    This function reads the rows of a CSV file that start at the given byte, as a
+    sequence of Pandas DataFrames. Column names are taken from the header of the file,
+    and row indexes start at the given row, as if the whole file had been read.
+
+    :param path: Path where the dataset can be found.
+    :param byte_offset: Integer with the byte where the rows to be read start. It has
+    to be the beginning of a line.
+    :param first_row: Integer with the index of the first row to be read.
+    :param sep: Separator character.
+    :param chunk_size: Maximum number of rows in each chunk.
+
+    :return: Generator of Pandas DataFrames.
+    """
+    column_names = read_csv_dataset(path, sep=sep, n_rows=0).columns
+    with open(path, "rb") as fp:
+        # Line breaks right at the offset would be read as an empty first line
+        fp.seek(byte_offset)
+        next_byte = fp.read(1)
+        while next_byte in [b"\n", b"\r"]:
+            byte_offset += 1
+            next_byte = fp.read(1)
+        if not next_byte:
+            return
+        fp.seek(byte_offset)
+        for chunk in pd.read_csv(
+            fp, sep=sep, chunksize=chunk_size, header=None, names=column_names
+        ):
+            chunk.index += first_row
+            yield chunk
+
+
+def count_csv_rows(path: os.path, block_size=1024 * 1024) -> int:
+    """
+    Counts the rows of a CSV file by counting its line breaks, without parsing it.
+    Values that hold line breaks are counted as several rows, so the result is an upper
+    bound of the number of rows.
+
+    :param path: Path where the dataset can be found.
+    :param block_size: Integer with the number of bytes read at once.
+
+    :return: Integer with the number of rows, without the header.
+    """
+    n_lines = 0
+    last_block = b""
+    with open(path, "rb") as fp:
+        for block in iter(lambda: fp.read(block_size), b""):
+            n_lines += block.count(b"\n")
+            last_block = block
+    if last_block and not last_block.endswith(b"\n"):
+        n_lines += 1
+    return max(n_lines - 1, 0)
+
+
+def count_excel_rows(path: os.path) -> int:
+    """
+    Counts the rows of the first sheet of an Excel file, which is the one Pandas reads,
+    without loading its values into a DataFrame.
+
+    :param path: Path where the dataset can be found.
+
+    :return: Integer with the number of rows, without the header.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        # Sheets saved without their dimensions have to be walked through
+        n_rows = sheet.max_row
+        if n_rows is None:
+            n_rows = sum(1 for _ in sheet.iter_rows(values_only=True))
+    finally:
+        workbook.close()
+    return max(n_rows - 1, 0)
+
+
 def write_csv_dataset(dataset: pd.DataFrame, path: os.path, sep=";") -> None:
     """
     Writes Pandas DataFrame to CSV format.
@@ -0,0 +1,217 @@
+import os
+import time
+import threading
+import great_expectations as ge
+
+from constants.expectation_set_constants import EXPECTATIONS
+from constants.path_constants import VALIDATION_CACHE_PATH
+from constants.validation_constants import (
+    CACHE_SIZE,
+    SAMPLE_SEED,
+    SAMPLE_SIZE,
+    SKETCH_MODE,
+    SAMPLING_MODE,
+    FAIL_FAST_MODE,
+    ENGINE_VERSION,
+    CACHE_FILE_NAME,
+    CACHE_LAST_ACCESS,
+    SKETCH_BLOOM_CAPACITY,
+    SKETCH_MAX_CANDIDATES,
+    FAIL_FAST_MAX_FAILURES,
+    VALIDATION_CACHE_INDEX,
+    VALIDATION_CACHE_DISK_BUDGET
+)
+
+from src.json_operations import read_json, write_json
+from src.expectation_set_operations import get_expectation_set_config
+from src.hash_operations import get_file_hash, get_text_hash
+from src.value_set_operations import get_expectation_set_version
+from src.low_level_operations import (
+    make_dir,
+    make_copy,
+    join_paths,
+    delete_file,
+    exists_path,
+    get_imported_dataset_path
+)
+
+_CACHE_LOCK = threading.Lock()
+
+
+def get_validation_cache_path() -> os.path:
+    """
+    Returns the directory where cached validation results are stored.
+
+    :return: Path.
+    """
+    return VALIDATION_CACHE_PATH
+
+
+def get_validation_cache_index_path() -> os.path:
+    """
+    Returns the path of the cache index, which keeps size and last access of every
+    cached result.
+
+    :return: Path.
+    """
+    return join_paths(get_validation_cache_path(), VALIDATION_CACHE_INDEX)
+
+
+def get_engine_version(mode: str) -> str:
+    """
+    Returns a string that identifies the engine producing validation results. Results
+    from different engines, or from different versions of them, are never mixed. The
+    same goes for samples of different size, for different failure limits and for
+    sketches of different size.
+
+    :param mode: String with the validation mode.
+
+    :return: String.
+    """
+    if mode == SAMPLING_MODE:
+        return f"{mode}-{SAMPLE_SIZE}-{SAMPLE_SEED}-{ENGINE_VERSION}-{ge.__version__}"
+    if mode == FAIL_FAST_MODE:
+        return f"{mode}-{FAIL_FAST_MAX_FAILURES}-{ENGINE_VERSION}-{ge.__version__}"
+    if mode == SKETCH_MODE:
+        return (
+            f"{mode}-{SKETCH_BLOOM_CAPACITY}-{SKETCH_MAX_CANDIDATES}-{ENGINE_VERSION}-"
+            f"{ge.__version__}"
+        )
+    return f"{mode}-{ENGINE_VERSION}-{ge.__version__}"
+
+
+def build_validation_cache_key(
+    dataset_name: str, expectation_set_name: str, confidence, mode: str
+) -> str:
+    """
+    Builds the key of a validation result, from the content of the dataset, the
+    canonical content of the expectation set, the confidence and the engine version.
+
+    :param dataset_name: String with the name of the dataset.
+    :param expectation_set_name: String with the name of the expectation set.
+    :param confidence: Confidence ranging from 0 to 100.
+    :param mode: String with the validation mode.
+
+    :return: String with the key.
+    """
+    dataset_hash = get_file_hash(get_imported_dataset_path(dataset_name))
+    config = get_expectation_set_config(expectation_set_name)
+    expectation_set_hash = get_expectation_set_version(config.get(EXPECTATIONS))
+    return get_text_hash(
+        "|".join(
+            [dataset_hash, expectation_set_hash, str(confidence), get_engine_version(mode)]
+        )
+    )
+
+
+def get_cache_entry_name(cache_key: str, validation_path: os.path) -> str:
+    """
+    Returns the name a validation file has in the cache. A single validation can
+    produce several files, which share the key but not the file name.
+
+    :param cache_key: String with the key of the validation result.
+    :param validation_path: Path of the validation file.
+
+    :return: String with the name of the cache entry.
+    """
+    return cache_key + "_" + os.path.basename(validation_path)
+
+
+def read_validation_cache_index() -> dict:
+    """
+    Returns the content of the cache index.
+
+    :return: Dictionary whose keys are cache keys.
+    """
+    index_path = get_validation_cache_index_path()
+    if not exists_path(index_path):
+        return dict()
+    with open(index_path, "r") as fp:
+        return read_json(fp)
+
+
+def write_validation_cache_index(index: dict) -> None:
+    """
+    Writes the cache index to disk.
+
+    :param index: Dictionary whose keys are cache keys.
+    """
+    with open(get_validation_cache_index_path(), "w") as fp:
+        write_json(index, fp)
+
+
+def evict_least_recently_used(index: dict, disk_budget: int) -> None:
+    """
+    Removes the least recently used results until the cache fits in its disk budget.
+
+    :param index: Dictionary whose keys are cache keys. It is updated in place.
+    :param disk_budget: Integer with the maximum number of bytes of the cache.
+    """
+    total_size = sum([entry[CACHE_SIZE] for entry in index.values()])
+    for key in sorted(index, key=lambda k: index[k][CACHE_LAST_ACCESS]):
+        if total_size <= disk_budget:
+            break
+        delete_file(join_paths(get_validation_cache_path(), index[key][CACHE_FILE_NAME]))
+        total_size -= index[key][CACHE_SIZE]
+        del index[key]
+
+
+def restore_cached_validation(cache_key: str, validation_paths: list) -> bool:
+    """
+    Copies cached validation files to the given paths, only if all of them are in the
+    cache.
+
+    :param cache_key: String with the key of the validation result.
+    :param validation_paths: List with the paths where validation files have to be
+    written.
+
+    :return: Bool that tells if the result was found in the cache.
+    """
+    cache_path = get_validation_cache_path()
+    with _CACHE_LOCK:
+        index = read_validation_cache_index()
+        entry_names = [get_cache_entry_name(cache_key, p) for p in validation_paths]
+        for entry_name in entry_names:
+            if entry_name not in index:
+                return False
+            cached_path = join_paths(cache_path, index[entry_name][CACHE_FILE_NAME])
+            if not exists_path(cached_path):
+                del index[entry_name]
+                write_validation_cache_index(index)
+                return False
+        for entry_name, validation_path in zip(entry_names, validation_paths):
+            cached_path = join_paths(cache_path, index[entry_name][CACHE_FILE_NAME])
+            make_copy(cached_path, validation_path)
+            index[entry_name][CACHE_LAST_ACCESS] = time.time()
+        write_validation_cache_index(index)
+    return True
+
+
+def store_validation_in_cache(
+    cache_key: str, validation_paths: list, disk_budget=VALIDATION_CACHE_DISK_BUDGET
+) -> None:
+    """
+    Stores a copy of validation files in the cache, evicting the least recently used
+    ones if the cache does not fit in its disk budget.
+
+    :param cache_key: String with the key of the validation result.
+    :param validation_paths: List with the paths of the validation files.
+    :param disk_budget: Integer with the maximum number of bytes of the cache.
+    """
+    cache_path = get_validation_cache_path()
+    with _CACHE_LOCK:
+        if not exists_path(cache_path):
+            make_dir(cache_path)
+        index = read_validation_cache_index()
+        for validation_path in validation_paths:
+            if not exists_path(validation_path):
+                continue
+            entry_name = get_cache_entry_name(cache_key, validation_path)
+            make_copy(validation_path, join_paths(cache_path, entry_name))
+            index[entry_name] = {
+                CACHE_FILE_NAME: entry_name,
+                CACHE_SIZE: os.path.getsize(validation_path),
+                CACHE_LAST_ACCESS: time.time(),
+            }
+        evict_least_recently_used(index, disk_budget)
+        write_validation_cache_index(index)
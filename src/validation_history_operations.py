@@ -0,0 +1,239 @@
+import sqlite3
+import threading
+import pandas as pd
+from datetime import datetime
+from contextlib import closing
+
+from constants.path_constants import VALIDATION_HISTORY_PATH
+from constants.expectation_set_constants import (
+    EXPECTATIONS,
+    EXPECTATION_NAME,
+    EXPECTATION_SET_NAME
+)
+from constants.validation_constants import (
+    MODE,
+    RESULT,
+    SUCCESS,
+    RESULTS,
+    RUN_TIME,
+    COLUMN_KEY,
+    STATISTICS,
+    DATASET_NAME,
+    ELEMENT_COUNT,
+    MISSING_COUNT,
+    UNEXPECTED_COUNT,
+    UNEXPECTED_FRACTION,
+    EVALUATED_EXPECTATIONS,
+    SUCCESSFUL_EXPECTATIONS
+)
+
+from src.validation_operations import get_validation_file_names
+from src.hash_operations import get_file_hash
+from src.value_set_operations import get_expectation_set_version
+from src.expectation_set_operations import get_expectation_set_config
+from src.validation_result_operations import evaluate_validation_result
+from src.low_level_operations import exists_path, get_imported_dataset_path
+
+_HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS validation_runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dataset_name TEXT NOT NULL,
+    dataset_hash TEXT,
+    expectation_set_name TEXT NOT NULL,
+    expectation_set_hash TEXT,
+    mode TEXT,
+    confidence INTEGER,
+    run_time TEXT NOT NULL,
+    duration REAL,
+    from_cache INTEGER NOT NULL DEFAULT 0,
+    evaluated_expectations INTEGER,
+    successful_expectations INTEGER
+);
+CREATE TABLE IF NOT EXISTS expectation_results (
+    run_id INTEGER NOT NULL REFERENCES validation_runs (run_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    expectation_name TEXT NOT NULL,
+    column_key TEXT NOT NULL,
+    element_count INTEGER,
+    missing_count INTEGER,
+    unexpected_count INTEGER,
+    unexpected_fraction REAL,
+    success INTEGER,
+    PRIMARY KEY (run_id, position)
+);
+CREATE TABLE IF NOT EXISTS validation_files (
+    file_name TEXT PRIMARY KEY,
+    run_id INTEGER REFERENCES validation_runs (run_id) ON DELETE SET NULL
+);
+CREATE INDEX IF NOT EXISTS validation_runs_by_dataset
+    ON validation_runs (dataset_name, run_time);
+CREATE INDEX IF NOT EXISTS validation_runs_by_set
+    ON validation_runs (expectation_set_name, run_time);
+CREATE INDEX IF NOT EXISTS validation_runs_by_dataset_and_set
+    ON validation_runs (dataset_name, expectation_set_name, run_time);
+CREATE INDEX IF NOT EXISTS validation_runs_by_time
+    ON validation_runs (run_time);
+"""
+
+# Paths whose schema has already been created by this process
+_INITIALIZED_HISTORIES = set()
+_HISTORY_LOCK = threading.Lock()
+
+
+def get_history_connection(history_path=VALIDATION_HISTORY_PATH) -> sqlite3.Connection:
+    """
+    Opens the validation history, creating its tables and indexes the first time. A new
+    history registers the validation files that already exist, so that they are still
+    listed.
+
+    :param history_path: Path of the SQLite database.
+
+    :return: SQLite connection. It has to be closed by the caller.
+    """
+    connection = sqlite3.connect(history_path, timeout=30)
+    connection.execute("PRAGMA foreign_keys = ON")
+    with _HISTORY_LOCK:
+        if history_path not in _INITIALIZED_HISTORIES:
+            is_new_history = not connection.execute(
+                "SELECT name FROM sqlite_master WHERE name = 'validation_files'"
+            ).fetchone()
+            connection.executescript(_HISTORY_SCHEMA)
+            if is_new_history:
+                with connection:
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO validation_files (file_name) VALUES (?)",
+                        [(name,) for name in get_validation_file_names()]
+                    )
+            _INITIALIZED_HISTORIES.add(history_path)
+    return connection
+
+
+def record_validation_run(
+    file_names: list,
+    validation_result: dict,
+    confidence: int,
+    duration: float,
+    from_cache=False,
+    history_path=VALIDATION_HISTORY_PATH
+) -> int:
+    """
+    Records a validation run in the history, with the statistics of every expectation
+    evaluated at the given confidence, and makes its files the listed ones. The run
+    also keeps the hashes of the dataset and the expectation set it was computed for.
+    Everything is written in a single transaction.
+
+    :param file_names: List with the names of the files the validation produced.
+    :param validation_result: Dictionary with a threshold independent validation
+    result.
+    :param confidence: Integer with confidence ranging from 0 to 100.
+    :param duration: Float with the seconds the validation took.
+    :param from_cache: Bool that tells if the result was restored from the cache.
+    :param history_path: Path of the SQLite database.
+
+    :return: Integer with the ID of the run.
+    """
+    evaluated_result = evaluate_validation_result(validation_result, confidence)
+    statistics = evaluated_result[STATISTICS]
+    dataset_hash = get_file_hash(
+        get_imported_dataset_path(evaluated_result[DATASET_NAME])
+    )
+    expectation_set_hash = get_expectation_set_version(
+        get_expectation_set_config(evaluated_result[EXPECTATION_SET_NAME]).get(EXPECTATIONS)
+    )
+    with closing(get_history_connection(history_path)) as connection, connection:
+        run_id = connection.execute(
+            "INSERT INTO validation_runs (dataset_name, dataset_hash, "
+            "expectation_set_name, expectation_set_hash, mode, confidence, run_time, "
+            "duration, from_cache, evaluated_expectations, successful_expectations) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                evaluated_result[DATASET_NAME],
+                dataset_hash,
+                evaluated_result[EXPECTATION_SET_NAME],
+                expectation_set_hash,
+                evaluated_result.get(MODE),
+                confidence,
+                evaluated_result.get(RUN_TIME) or str(datetime.now()),
+                duration,
+                int(from_cache),
+                statistics[EVALUATED_EXPECTATIONS],
+                statistics[SUCCESSFUL_EXPECTATIONS],
+            )
+        ).lastrowid
+        connection.executemany(
+            "INSERT INTO expectation_results (run_id, position, expectation_name, "
+            "column_key, element_count, missing_count, unexpected_count, "
+            "unexpected_fraction, success) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id,
+                    position,
+                    expectation_result[EXPECTATION_NAME],
+                    expectation_result[COLUMN_KEY],
+                    expectation_result[RESULT][ELEMENT_COUNT],
+                    expectation_result[RESULT][MISSING_COUNT],
+                    expectation_result[RESULT][UNEXPECTED_COUNT],
+                    expectation_result[RESULT][UNEXPECTED_FRACTION],
+                    expectation_result[SUCCESS],
+                )
+                for position, expectation_result in enumerate(evaluated_result[RESULTS])
+            ]
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO validation_files (file_name, run_id) VALUES (?, ?)",
+            [(file_name, run_id) for file_name in file_names]
+        )
+    return run_id
+
+
+def get_recorded_validation_file_names(history_path=VALIDATION_HISTORY_PATH) -> list:
+    """
+    Returns the names of the available validation files, as recorded in the history.
+
+    :param history_path: Path of the SQLite database.
+
+    :return: List with file names, sorted.
+    """
+    with closing(get_history_connection(history_path)) as connection:
+        rows = connection.execute(
+            "SELECT file_name FROM validation_files ORDER BY file_name"
+        ).fetchall()
+    return [file_name for file_name, in rows]
+
+
+def forget_validation_files(history_path=VALIDATION_HISTORY_PATH) -> None:
+    """
+    Stops listing every validation file. Past runs are kept, so trends are not lost.
+
+    :param history_path: Path of the SQLite database.
+    """
+    if not exists_path(history_path):
+        return
+    with closing(get_history_connection(history_path)) as connection, connection:
+        connection.execute("DELETE FROM validation_files")
+
+
+def get_expectation_trends(
+    dataset_name: str, expectation_set_name: str, history_path=VALIDATION_HISTORY_PATH
+) -> pd.DataFrame:
+    """
+    Returns the unexpected fraction of every expectation over the recorded runs of a
+    dataset against an expectation set, oldest first.
+
+    :param dataset_name: String with the name of the dataset.
+    :param expectation_set_name: String with the name of the expectation set.
+    :param history_path: Path of the SQLite database.
+
+    :return: Pandas DataFrame with run time, mode, column key, expectation name and
+    unexpected fraction.
+    """
+    with closing(get_history_connection(history_path)) as connection:
+        return pd.read_sql_query(
+            "SELECT r.run_time, r.mode, e.column_key, e.expectation_name, "
+            "e.unexpected_fraction FROM validation_runs AS r "
+            "JOIN expectation_results AS e ON e.run_id = r.run_id "
+            "WHERE r.dataset_name = ? AND r.expectation_set_name = ? "
+            "ORDER BY r.run_time, e.position",
+            connection,
+            params=(dataset_name, expectation_set_name)
+        )
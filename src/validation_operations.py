@@ -1,35 +1,33 @@
 import os
+from uuid import uuid4
 from great_expectations.checkpoint import LegacyCheckpoint
 
+from objects.ge_context_pool import GEContextPool
 from objects.expectation_suite_name import ExpectationSuiteName
 
-from constants.path_constants import GE_VALIDATIONS_PATH, VALIDATION_RESULTS_PATH
-from constants.expectation_set_constants import (
-    PARAMETERS,
-    EXPECTATIONS,
-    EXPECTATION_NAME,
-    MULTICOLUMN_CONFIG_SEPARATOR
-)
+from constants.expectation_set_constants import EXPECTATIONS, MULTICOLUMN_CONFIG_SEPARATOR
 from constants.great_expectations_constants import (
-    COLUMN,
-    COLUMN_A,
-    COLUMN_B,
-    COLUMN_LIST,
     BATCH_KWARGS,
+    DATA_DOCS_MODE,
+    TEMP_CHECKPOINT_NAME,
     EXPECTATION_SUITE_NAMES,
-    MULTICOLUMN_EXPECTATIONS_N_COLUMNS, MOSTLY
+    INCREMENTAL_DATA_DOCS,
+    VALIDATION_OPERATOR_NAME,
+    VALIDATION_OPERATOR_CONFIG
 )
 
-from src.batch_operations import get_ge_batch, get_batch_kwargs
-from src.utils import get_value, read_dataset, infer_csv_separator
+from src.batch_operations import get_batch_kwargs
+from src.value_set_operations import (
+    split_referencing_expectations,
+    are_value_set_references_available
+)
+from src.utils import read_dataset, infer_csv_separator
 from src.expectation_set_operations import get_expectation_set_config
-from src.expectation_suite_operations import create_empty_ge_expectation_suite
+from src.expectation_suite_operations import (
+    compile_expectation_suite,
+    release_expectation_suite
+)
 from src.low_level_operations import (
-    move,
-    rename,
-    join_paths,
-    is_directory,
-    delete_directory,
     is_validation_name,
     get_validations_path,
     get_imported_dataset_path,
@@ -59,79 +57,82 @@ def is_dataset_compatible(
         columns_with_expectations += column_name.split(MULTICOLUMN_CONFIG_SEPARATOR)
     columns_with_expectations = set(columns_with_expectations)
 
-    return columns_with_expectations.issubset(dataset_columns)
+    # Datasets referenced by value sets have to be imported too
+    return columns_with_expectations.issubset(dataset_columns) and \
+        are_value_set_references_available(expectations_from_set_config)
 
 
 def save_validation(
         context,
         expectation_name_object: ExpectationSuiteName,
         batch_kwargs: dict,
+        checkpoint_name=TEMP_CHECKPOINT_NAME,
+        data_docs_mode=DATA_DOCS_MODE,
+        run_name=None
 ):
     """
-    This function is used to save the validation as a file.
+    This function is used to save the validation as a file. The whole data docs site is
+    never rebuilt, so the cost of a validation does not grow with the number of stored
+    results.
 
     :param context: GE's context object.
     :param expectation_name_object: ExpectationSuiteName object.
     :param batch_kwargs: Dictionary with batch_kwargs.
+    :param checkpoint_name: String with the name of the temporary checkpoint.
+    :param data_docs_mode: String that tells if the data docs page of the new result
+    is built, see DATA_DOCS_MODE.
+    :param run_name: String with the name GE gives to the run, or None to use the
+    current time.
 
     :return: GE's ValidationResultIdentifier object.
     """
+    # Results are stored without running GE's data docs action, which rebuilds the site
+    if VALIDATION_OPERATOR_NAME not in context.list_validation_operator_names():
+        context.add_validation_operator(
+            VALIDATION_OPERATOR_NAME, VALIDATION_OPERATOR_CONFIG
+        )
     results = LegacyCheckpoint(
-        name="_temp_checkpoint",
+        name=checkpoint_name,
         data_context=context,
+        validation_operator_name=VALIDATION_OPERATOR_NAME,
         batches=[
             {
                 BATCH_KWARGS: batch_kwargs,
                 EXPECTATION_SUITE_NAMES: [expectation_name_object.name],
             }
         ],
-    ).run()
+    ).run(run_name=run_name)
     validation_result_identifier = results.list_validation_result_identifiers()[0]
+    if data_docs_mode == INCREMENTAL_DATA_DOCS:
+        context.build_data_docs(
+            resource_identifiers=[validation_result_identifier], build_index=False
+        )
     return validation_result_identifier
 
 
-def apply_expectation_to_dataset(
-    batch, column_name: str, expectation_config: dict, confidence: int
-) -> None:
-    """
-    Applies individual expectations to the batch.
-
-    :param batch: GE's batch object.
-    :param column_name: String with the name of the column where the expectation has to
-    be applied.
-    :param expectation_config: Dictionary that provides configuration for the expectation
-    itself, that comes in the format of expectation set configuration.
-    :param confidence: Integer with confidence ranging from 0 to 100.
-    """
-    expectation_id = expectation_config.get(EXPECTATION_NAME)
-
-    parameters = expectation_config.get(PARAMETERS)
-    parameters[MOSTLY] = confidence / 100
-
-    if expectation_id not in MULTICOLUMN_EXPECTATIONS_N_COLUMNS:
-        parameters[COLUMN] = column_name
-    elif MULTICOLUMN_EXPECTATIONS_N_COLUMNS[expectation_id] == 2:
-        parameters[COLUMN_A], parameters[COLUMN_B] = column_name.split(MULTICOLUMN_CONFIG_SEPARATOR)
-    else:
-        parameters[COLUMN_LIST] = column_name.split(MULTICOLUMN_CONFIG_SEPARATOR)
-
-    getattr(batch, expectation_id)(**parameters)
-
-
 def validate_dataset(
-    context,
+    context_pool: GEContextPool,
     dataset_name: str,
     expectation_name_object: ExpectationSuiteName,
     confidence: int
-) -> None:
+):
     """
     This function is used to compute validation results when applying an Expectation
-    Suite to a dataset.
-
-    :param context: GE's context object.
+    Suite to a dataset. The suite compiled from the current version of the set is
+    reused and kept while the validation runs. The checkpoint and the run are named
+    after the set, the dataset and a new run id, so that concurrent validations never
+    overwrite each other and every result can be traced back to what was validated.
+    Expectations that reference a column of another dataset are left out of the suite,
+    so that its values are never copied into suites nor results, see
+    validate_dataset_with_ge().
+
+    :param context_pool: GEContextPool object that provides the worker's context.
     :param dataset_name: String with the name of the dataset to be validated.
     :param expectation_name_object: Expectation set name.
     :param confidence: Integer with confidence ranging from 0 to 100.
+
+    :return: GE's ValidationResultIdentifier object, or None if the dataset is not
+    compatible with the expectation set.
     """
     dataset_path = get_imported_dataset_path(dataset_name)
 
@@ -140,81 +141,86 @@ def validate_dataset(
 
     # If the selected dataset is compatible with the selected set of expectations
     if is_dataset_compatible(dataset_path, expectations_from_set_config):
-        expectation_suite = create_empty_ge_expectation_suite(
-            context, expectation_name_object
+        context = context_pool.get_context()
+        suite_name_object = compile_expectation_suite(
+            context,
+            expectation_name_object.name,
+            split_referencing_expectations(expectations_from_set_config)[0],
+            confidence
+        )
+        run_name = build_validation_run_name(
+            expectation_name_object.name, dataset_name, uuid4().hex
         )
-        batch = get_ge_batch(context, expectation_suite, dataset_path)
+        try:
+            batch_kwargs = get_batch_kwargs(context, dataset_path)
+            return save_validation(
+                context,
+                suite_name_object,
+                batch_kwargs,
+                checkpoint_name=run_name,
+                run_name=run_name
+            )
+        finally:
+            release_expectation_suite(suite_name_object)
+    return None
 
-        for column_name in expectations_from_set_config:
-            for expectation_config in expectations_from_set_config.get(column_name):
-                apply_expectation_to_dataset(
-                    batch, column_name, expectation_config, confidence
-                )
 
-        # Saving Expectation Suite to JSON file
-        batch.save_expectation_suite(discard_failed_expectations=False)
+def build_validation_run_name(set_name: str, dataset_name: str, run_id: str) -> str:
+    """
+    Builds the name of a GE validation run and of its checkpoint.
 
-        batch_kwargs = get_batch_kwargs(context, dataset_path)
-        save_validation(context, expectation_name_object, batch_kwargs)
+    :param set_name: String with expectation set name.
+    :param dataset_name: String with dataset name.
+    :param run_id: String that identifies the run.
+
+    :return: String with the name of the run.
+    """
+    return "_".join([set_name, ".".join(dataset_name.split(".")[:-1]), run_id])
 
 
 def build_new_validation_file_name(
-        set_name: str, dataset_name: str, confidence: str
+        set_name: str, dataset_name: str, confidence=None, extension=".html", mode=None
 ) -> str:
     """
-    Builds new name for validation file.
+    Builds new name for validation file. Threshold independent results have no
+    confidence in their name. Results of different validation modes have the mode in
+    their name, so that none of them overwrites another.
 
     :param set_name: String with expectation set name.
     :param dataset_name: String with dataset name.
-    :param confidence: Numeric string representing the confidence.
+    :param confidence: Numeric string representing the confidence, or None.
+    :param extension: String with the extension of the validation file.
+    :param mode: String with the validation mode, or None.
 
     :return: String with new name for validation file.
     """
+    mode_suffix = "" if mode is None else "_" + mode.lower().replace(" ", "-")
+    confidence_suffix = "" if confidence is None else "_" + confidence
     return set_name + "_" + ".".join(
-        dataset_name.split(".")[:-1]) + "_" + confidence + ".html"
+        dataset_name.split(".")[:-1]) + mode_suffix + confidence_suffix + extension
 
 
-def move_validation_to_app_system(dataset_name: str, confidence: str) -> None:
+def get_ge_validation_result(context, validation_result_identifier) -> dict:
     """
-    Changes the name of the last validation, then moves it to the app's file system.
+    Returns a validation result stored by Great Expectations.
 
-    :param dataset_name: String with dataset name.
-    :param confidence: Numeric string that represents the confidence in the
-    validation results.
-    """
-    # Getting all elements inside GE's validation directory
-    available_elements = get_elements_inside_directory(GE_VALIDATIONS_PATH)
-    for set_name in available_elements:
-
-        # Getting to validation
-        set_element_path = join_paths(GE_VALIDATIONS_PATH, set_name)
-        if is_directory(set_element_path):
-            elements_inside = get_elements_inside_directory(set_element_path)
-            unique_name = get_value(elements_inside)
-            validation_path = os.path.join(
-                *[set_element_path, unique_name, unique_name]
-            )
-            validation_file_name = get_value(
-                get_elements_inside_directory(validation_path)
-            )
+    :param context: GE's context object.
+    :param validation_result_identifier: GE's ValidationResultIdentifier object.
 
-            # Renaming it
-            new_validation_file_name = build_new_validation_file_name(
-                set_name, dataset_name, confidence
-            )
-            rename(validation_path, validation_file_name, new_validation_file_name)
-            validation_file_path = join_paths(
-                validation_path, new_validation_file_name
-            )
-            new_validation_file_path = join_paths(
-                VALIDATION_RESULTS_PATH, new_validation_file_name
-            )
+    :return: Dictionary with GE's validation result, as JSON.
+    """
+    return context.validations_store.get(validation_result_identifier).to_json_dict()
 
-            # Moving it
-            move(validation_file_path, new_validation_file_path)
 
-            # Deleting old directories
-            delete_directory(set_element_path)
+def delete_ge_validation_result(context, validation_result_identifier) -> None:
+    """
+    Deletes a validation result from Great Expectations' validations store. The app
+    keeps its own copy of every result, so GE's one is deleted once it has been read.
+
+    :param context: GE's context object.
+    :param validation_result_identifier: GE's ValidationResultIdentifier object.
+    """
+    context.validations_store.remove_key(validation_result_identifier)
 
 
 def get_validation_file_names() -> list:
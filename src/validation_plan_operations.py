@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+from constants.expectation_set_constants import MULTICOLUMN_CONFIG_SEPARATOR
+from constants.great_expectations_constants import MULTICOLUMN_EXPECTATIONS_N_COLUMNS
+from constants.validation_constants import (
+    NULL_MASK,
+    VALUE_HASHES,
+    VALUE_LENGTHS,
+    NUMERIC_VALUES,
+    COLUMN_INTERMEDIATES,
+    EXPECTATION_INTERMEDIATES
+)
+
+from src.parallel_operations import map_in_parallel
+
+# Odd multiplier used to mix the hashes of several columns into a single row hash
+_HASH_MULTIPLIER = np.uint64(0x100000001B3)
+
+
+def get_expectation_columns(expectation_id: str, column_key: str) -> list:
+    """
+    Returns the table columns an expectation works with, given the key it has in the
+    expectation set configuration.
+
+    :param expectation_id: String with GE's expectation ID.
+    :param column_key: String with the key of the expectation in the set config.
+
+    :return: List with column names.
+    """
+    if expectation_id not in MULTICOLUMN_EXPECTATIONS_N_COLUMNS:
+        return [column_key]
+    return column_key.split(MULTICOLUMN_CONFIG_SEPARATOR)
+
+
+def build_validation_plan(expectations: tuple) -> dict:
+    """
+    Finds the intermediates every column needs across all the expectations of a set,
+    so that each of them is computed once per chunk and shared by the expectations
+    that use it.
+
+    :param expectations: Iterable with CompiledExpectation objects.
+
+    :return: Dictionary whose keys are column names and whose values are lists with
+    the intermediates to compute, in computation order.
+    """
+    required = dict()
+    for expectation in expectations:
+        for column in expectation.columns:
+            required.setdefault(column, set()).update(
+                EXPECTATION_INTERMEDIATES.get(expectation.expectation_id, [NULL_MASK])
+            )
+    return {
+        column: [i for i in COLUMN_INTERMEDIATES if i in intermediates]
+        for column, intermediates in required.items()
+    }
+
+
+def normalize_values_for_hashing(values: pd.Series) -> pd.Series:
+    """
+    Casts numeric values to float, so that the same number gets the same hash no
+    matter if Pandas read its chunk as integers or as floats.
+
+    :param values: Pandas Series.
+
+    :return: Pandas Series.
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype("float64")
+    return values
+
+
+def compute_null_mask(values: pd.Series) -> np.ndarray:
+    """
+    :param values: Pandas Series.
+
+    :return: Boolean NumPy array, True where values are missing.
+    """
+    return values.isna().to_numpy()
+
+
+def compute_numeric_values(values: pd.Series) -> pd.Series:
+    """
+    :param values: Pandas Series.
+
+    :return: Pandas Series with the values as numbers, NaN where they are not numeric.
+    """
+    return pd.to_numeric(values, errors="coerce")
+
+
+def compute_value_lengths(values: pd.Series) -> pd.Series:
+    """
+    :param values: Pandas Series.
+
+    :return: Pandas Series with the length of every value as a string.
+    """
+    return values.astype(str).str.len()
+
+
+def compute_value_hashes(values: pd.Series) -> np.ndarray:
+    """
+    :param values: Pandas Series.
+
+    :return: NumPy array with a 64 bit unsigned hash of every value.
+    """
+    return pd.util.hash_pandas_object(
+        normalize_values_for_hashing(values), index=False
+    ).to_numpy()
+
+
+INTERMEDIATE_FUNCTIONS = {
+    NULL_MASK: compute_null_mask,
+    NUMERIC_VALUES: compute_numeric_values,
+    VALUE_LENGTHS: compute_value_lengths,
+    VALUE_HASHES: compute_value_hashes,
+}
+
+
+def compute_intermediates(chunk: pd.DataFrame, plan: dict) -> dict:
+    """
+    Computes the intermediates of a chunk, each of them once, following a plan built
+    by build_validation_plan(), such as the intermediates of an ExpectationPlan.
+    Columns are independent, so they are computed in parallel.
+
+    :param chunk: Pandas DataFrame.
+    :param plan: Dictionary with the intermediates every column needs.
+
+    :return: Dictionary whose keys are column names and whose values are dictionaries
+    with the computed intermediates.
+    """
+    columns = list(plan)
+    column_intermediates = map_in_parallel(
+        lambda column: {
+            intermediate: INTERMEDIATE_FUNCTIONS[intermediate](chunk[column])
+            for intermediate in plan[column]
+        },
+        columns
+    )
+    return dict(zip(columns, column_intermediates))
+
+
+def combine_hashes(hash_arrays: list) -> np.ndarray:
+    """
+    Mixes the value hashes of several columns into a single hash per row.
+
+    :param hash_arrays: List with NumPy arrays of 64 bit unsigned hashes, one per
+    column, all of them with the same length.
+
+    :return: NumPy array of 64 bit unsigned hashes.
+    """
+    combined = hash_arrays[0].copy()
+    for hashes in hash_arrays[1:]:
+        combined *= _HASH_MULTIPLIER
+        combined ^= hashes
+    return combined
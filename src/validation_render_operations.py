@@ -0,0 +1,69 @@
+import os
+from great_expectations.core import expectationSuiteValidationResultSchema
+from great_expectations.render.view import DefaultJinjaPageView
+from great_expectations.render.renderer import ValidationResultsPageRenderer
+
+from constants.path_constants import RENDERED_VALIDATIONS_PATH
+
+from src.json_operations import read_json
+from src.hash_operations import get_file_hash
+from src.low_level_operations import (
+    make_dir,
+    join_paths,
+    exists_path,
+    delete_directory,
+    get_validation_path
+)
+
+
+def get_rendered_validation_path(validation_path: os.path) -> os.path:
+    """
+    Returns where the page rendered from a validation result is kept. Pages are named
+    after the content of the result, so a result is never rendered twice.
+
+    :param validation_path: Path of the validation result.
+
+    :return: Path.
+    """
+    return join_paths(RENDERED_VALIDATIONS_PATH, get_file_hash(validation_path) + ".html")
+
+
+def render_ge_validation_result(ge_validation_result: dict) -> str:
+    """
+    Renders a Great Expectations' validation result as a data docs page.
+
+    :param ge_validation_result: Dictionary with GE's validation result, as JSON.
+
+    :return: String with HTML.
+    """
+    validation_result = expectationSuiteValidationResultSchema.load(ge_validation_result)
+    document = ValidationResultsPageRenderer().render(validation_result)
+    return DefaultJinjaPageView().render(document)
+
+
+def get_rendered_validation(validation_file_name: str) -> os.path:
+    """
+    Returns the data docs page of a stored Great Expectations' validation result. The
+    page is only rendered the first time it is requested.
+
+    :param validation_file_name: String with the name of the validation result.
+
+    :return: Path of the rendered page.
+    """
+    validation_path = get_validation_path(validation_file_name)
+    rendered_path = get_rendered_validation_path(validation_path)
+    if not exists_path(rendered_path):
+        if not exists_path(RENDERED_VALIDATIONS_PATH):
+            make_dir(RENDERED_VALIDATIONS_PATH)
+        with open(validation_path, "r") as fp:
+            ge_validation_result = read_json(fp)
+        with open(rendered_path, "w") as fp:
+            fp.write(render_ge_validation_result(ge_validation_result))
+    return rendered_path
+
+
+def delete_rendered_validations() -> None:
+    """
+    Deletes every rendered page.
+    """
+    delete_directory(RENDERED_VALIDATIONS_PATH)
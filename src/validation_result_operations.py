@@ -0,0 +1,367 @@
+import os
+import copy
+import pandas as pd
+
+from constants.expectation_set_constants import (
+    PARAMETERS,
+    EXPECTATION_NAME,
+    EXPECTATION_SET_NAME,
+    MULTICOLUMN_CONFIG_SEPARATOR
+)
+from constants.great_expectations_constants import (
+    COLUMN,
+    COLUMN_A,
+    COLUMN_B,
+    COLUMN_LIST
+)
+from constants.validation_constants import (
+    MODE,
+    RESULT,
+    RESULTS,
+    SUCCESS,
+    EXACT,
+    DECIDABLE,
+    GE_KWARGS,
+    FIXED_SUCCESS,
+    GE_RESULT,
+    COLUMN_KEY,
+    CONFIDENCE,
+    GE_RESULTS,
+    GE_SUCCESS,
+    STATISTICS,
+    GE_RESULT_EXTENSION,
+    SKETCH_MODE,
+    FAIL_FAST_MODE,
+    EARLY_TERMINATED,
+    DATASET_NAME,
+    ELEMENT_COUNT,
+    MISSING_COUNT,
+    SUCCESS_PERCENT,
+    DISTINCT_COUNT,
+    UNEXPECTED_COUNT,
+    GE_EXPECTATION_TYPE,
+    UNEXPECTED_FRACTION,
+    GE_EXPECTATION_CONFIG,
+    EVALUATED_EXPECTATIONS,
+    GREAT_EXPECTATIONS_MODE,
+    GE_NON_PARAMETER_KWARGS,
+    SUCCESSFUL_EXPECTATIONS,
+    UNDECIDED_EXPECTATIONS,
+    DISTINCT_COUNT_LOWER,
+    DISTINCT_COUNT_UPPER,
+    UNSUCCESSFUL_EXPECTATIONS,
+    UNEXPECTED_FRACTION_LOWER,
+    UNEXPECTED_FRACTION_UPPER
+)
+
+from src.json_operations import read_json, write_json
+from src.low_level_operations import get_validation_path
+
+
+def is_mostly_successful(rows_considered: int, unexpected_count: int, mostly: float) -> bool:
+    """
+    Returns if an expectation succeeds, with the same criteria Great Expectations uses
+    for its "mostly" parameter. An expectation without rows to consider succeeds.
+
+    :param rows_considered: Integer with the number of considered rows.
+    :param unexpected_count: Integer with the number of unexpected rows.
+    :param mostly: Float ranging from 0 to 1.
+
+    :return: Bool.
+    """
+    if not rows_considered:
+        return True
+    return (rows_considered - unexpected_count) / rows_considered >= mostly
+
+
+def get_unexpected_fraction(
+    element_count: int, missing_count: int, unexpected_count: int
+) -> float:
+    """
+    Returns the fraction of considered rows that are unexpected.
+
+    :param element_count: Integer with the number of rows.
+    :param missing_count: Integer with the number of rows that are not considered.
+    :param unexpected_count: Integer with the number of unexpected rows.
+
+    :return: Float ranging from 0 to 1.
+    """
+    rows_considered = element_count - missing_count
+    return unexpected_count / rows_considered if rows_considered else 0.0
+
+
+def evaluate_expectation_result(expectation_result: dict, confidence: int) -> bool or None:
+    """
+    Returns if an expectation result succeeds at the given confidence. Counts are used
+    when available, so that the outcome is exactly the one of a full validation.
+
+    :param expectation_result: Dictionary with a threshold independent expectation
+    result.
+    :param confidence: Integer with confidence ranging from 0 to 100.
+
+    :return: Bool, or None if the result was computed on a sample, or estimated with
+    bounds, that cannot decide it at this confidence.
+    """
+    result = expectation_result[RESULT]
+    if not result.get(DECIDABLE, True):
+        return None
+    # Results without counts only know whether they succeeded at the confidence of
+    # their run
+    if FIXED_SUCCESS in result:
+        return result[FIXED_SUCCESS]
+    mostly = confidence / 100
+    # Results estimated on a sample or with a sketch only decide when both bounds of
+    # their interval are on the same side of the threshold. Exact ones have no width
+    if UNEXPECTED_FRACTION_UPPER in result and \
+            result[UNEXPECTED_FRACTION_LOWER] < result[UNEXPECTED_FRACTION_UPPER]:
+        if 1 - result[UNEXPECTED_FRACTION_UPPER] >= mostly:
+            return True
+        if 1 - result[UNEXPECTED_FRACTION_LOWER] < mostly:
+            return False
+        return None
+    if result.get(ELEMENT_COUNT) is None or result.get(UNEXPECTED_COUNT) is None:
+        return 1 - result[UNEXPECTED_FRACTION] >= mostly
+    return is_mostly_successful(
+        result[ELEMENT_COUNT] - result.get(MISSING_COUNT, 0),
+        result[UNEXPECTED_COUNT],
+        mostly
+    )
+
+
+def build_validation_statistics(expectation_results: list) -> dict:
+    """
+    Builds the statistics of a validation given the evaluated results of its
+    expectations. Undecided expectations are not counted as evaluated.
+
+    :param expectation_results: List with dictionaries of expectation results.
+
+    :return: Dictionary with statistics.
+    """
+    undecided = len([r for r in expectation_results if r[SUCCESS] is None])
+    evaluated = len(expectation_results) - undecided
+    successful = len([r for r in expectation_results if r[SUCCESS]])
+    return {
+        EVALUATED_EXPECTATIONS: evaluated,
+        SUCCESSFUL_EXPECTATIONS: successful,
+        UNSUCCESSFUL_EXPECTATIONS: evaluated - successful,
+        UNDECIDED_EXPECTATIONS: undecided,
+        SUCCESS_PERCENT: 100 * successful / evaluated if evaluated else 100.0,
+    }
+
+
+def get_evaluation_confidence(validation_result: dict, confidence: int) -> int:
+    """
+    Returns the confidence a validation result can be evaluated at. A fail-fast
+    validation that stopped early only decided its expectations at the confidence it
+    was run at, so it is always evaluated at that one.
+
+    :param validation_result: Dictionary with a threshold independent validation
+    result.
+    :param confidence: Integer with the requested confidence, ranging from 0 to 100.
+
+    :return: Integer with confidence ranging from 0 to 100.
+    """
+    if validation_result.get(MODE) == FAIL_FAST_MODE and \
+            validation_result.get(EARLY_TERMINATED, False):
+        return validation_result[CONFIDENCE]
+    return confidence
+
+
+def evaluate_validation_result(validation_result: dict, confidence: int) -> dict:
+    """
+    Evaluates a threshold independent validation result at the given confidence. No
+    data is read, so any confidence can be evaluated instantly. Results that are only
+    valid at one confidence are evaluated at it, see get_evaluation_confidence().
+
+    :param validation_result: Dictionary with a threshold independent validation
+    result.
+    :param confidence: Integer with confidence ranging from 0 to 100.
+
+    :return: Copy of the validation result, with success flags and statistics.
+    """
+    confidence = get_evaluation_confidence(validation_result, confidence)
+    evaluated_result = copy.deepcopy(validation_result)
+    for expectation_result in evaluated_result[RESULTS]:
+        expectation_result[SUCCESS] = evaluate_expectation_result(
+            expectation_result, confidence
+        )
+    statistics = build_validation_statistics(evaluated_result[RESULTS])
+    evaluated_result[CONFIDENCE] = confidence
+    evaluated_result[STATISTICS] = statistics
+    # A validation that stopped early, or left expectations undecided, never succeeds
+    # as a whole
+    evaluated_result[SUCCESS] = statistics[UNSUCCESSFUL_EXPECTATIONS] == 0 and \
+        statistics[UNDECIDED_EXPECTATIONS] == 0 and \
+        not evaluated_result.get(EARLY_TERMINATED, False)
+    return evaluated_result
+
+
+def get_column_key_from_ge_kwargs(kwargs: dict) -> str:
+    """
+    Returns the key an expectation has in the expectation set config, given the kwargs
+    of its Great Expectations configuration.
+
+    :param kwargs: Dictionary with GE's expectation kwargs.
+
+    :return: String with the column key.
+    """
+    if COLUMN in kwargs:
+        return kwargs[COLUMN]
+    if COLUMN_LIST in kwargs:
+        return MULTICOLUMN_CONFIG_SEPARATOR.join(kwargs[COLUMN_LIST])
+    return MULTICOLUMN_CONFIG_SEPARATOR.join([kwargs[COLUMN_A], kwargs[COLUMN_B]])
+
+
+def summarize_ge_validation_result(
+    ge_validation_result: dict, dataset_name: str, expectation_set_name: str
+) -> dict:
+    """
+    Builds a threshold independent validation result from a Great Expectations one.
+    Expectations that GE evaluates as a whole, instead of row by row, have no counts,
+    so they keep GE's own success and are not evaluated again at other confidences.
+
+    :param ge_validation_result: Dictionary with GE's validation result, as JSON.
+    :param dataset_name: String with the name of the validated dataset.
+    :param expectation_set_name: String with the name of the expectation set.
+
+    :return: Dictionary with the validation result.
+    """
+    expectation_results = list()
+    for ge_result in ge_validation_result[GE_RESULTS]:
+        expectation_config = ge_result[GE_EXPECTATION_CONFIG]
+        kwargs = expectation_config[GE_KWARGS]
+        result = ge_result.get(GE_RESULT) or dict()
+        if result.get(UNEXPECTED_COUNT) is not None:
+            element_count = result.get(ELEMENT_COUNT, 0)
+            missing_count = result.get(MISSING_COUNT) or 0
+            unexpected_count = result[UNEXPECTED_COUNT]
+            summarized_result = {
+                ELEMENT_COUNT: element_count,
+                MISSING_COUNT: missing_count,
+                UNEXPECTED_COUNT: unexpected_count,
+                UNEXPECTED_FRACTION: get_unexpected_fraction(
+                    element_count, missing_count, unexpected_count
+                ),
+            }
+        else:
+            summarized_result = {
+                ELEMENT_COUNT: None,
+                MISSING_COUNT: None,
+                UNEXPECTED_COUNT: None,
+                UNEXPECTED_FRACTION: None,
+                FIXED_SUCCESS: ge_result[GE_SUCCESS],
+            }
+        expectation_results.append(
+            {
+                EXPECTATION_NAME: expectation_config[GE_EXPECTATION_TYPE],
+                COLUMN_KEY: get_column_key_from_ge_kwargs(kwargs),
+                PARAMETERS: {
+                    k: v for k, v in kwargs.items() if k not in GE_NON_PARAMETER_KWARGS
+                },
+                RESULT: summarized_result
+            }
+        )
+    return {
+        EXPECTATION_SET_NAME: expectation_set_name,
+        DATASET_NAME: dataset_name,
+        CONFIDENCE: None,
+        MODE: GREAT_EXPECTATIONS_MODE,
+        RESULTS: expectation_results,
+    }
+
+
+def get_validation_result_table(evaluated_result: dict) -> pd.DataFrame:
+    """
+    Returns a table that summarizes an evaluated validation result, with one row per
+    expectation. Results estimated on a sample also show their confidence interval,
+    uniqueness checked with sketches shows its distinct count, and undecided
+    expectations are labeled according to the validation mode.
+
+    :param evaluated_result: Dictionary with an evaluated validation result.
+
+    :return: Pandas DataFrame.
+    """
+    if evaluated_result.get(MODE) == FAIL_FAST_MODE:
+        undecided_label = "Not decided before termination"
+    elif evaluated_result.get(MODE) == SKETCH_MODE:
+        undecided_label = "Cannot be decided from the estimate"
+    else:
+        undecided_label = "Cannot be decided on a sample"
+    rows = list()
+    for r in evaluated_result[RESULTS]:
+        row = {
+            "Expectation": r[EXPECTATION_NAME],
+            "Column": r[COLUMN_KEY],
+            "Unexpected (%)": None if r[RESULT][UNEXPECTED_FRACTION] is None else
+            round(100 * r[RESULT][UNEXPECTED_FRACTION], 3),
+        }
+        if UNEXPECTED_FRACTION_LOWER in r[RESULT]:
+            row["Interval (%)"] = (
+                f"{round(100 * r[RESULT][UNEXPECTED_FRACTION_LOWER], 3)} - "
+                f"{round(100 * r[RESULT][UNEXPECTED_FRACTION_UPPER], 3)}"
+            )
+        if DISTINCT_COUNT in r[RESULT]:
+            if r[RESULT][EXACT]:
+                row["Distinct values"] = str(r[RESULT][DISTINCT_COUNT])
+            else:
+                row["Distinct values"] = (
+                    f"~{r[RESULT][DISTINCT_COUNT]} ({r[RESULT][DISTINCT_COUNT_LOWER]} - "
+                    f"{r[RESULT][DISTINCT_COUNT_UPPER]})"
+                )
+        if r[SUCCESS] is None:
+            row["Success"] = undecided_label
+        else:
+            row["Success"] = "Yes" if r[SUCCESS] else "No"
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def is_validation_result_name(name: str) -> bool:
+    """
+    Returns if the given validation file name belongs to a threshold independent
+    validation result.
+
+    :param name: String with a filename.
+
+    :return: Bool.
+    """
+    return bool(name) and name.endswith(".json") and not is_ge_validation_result_name(name)
+
+
+def is_ge_validation_result_name(name: str) -> bool:
+    """
+    Returns if the given validation file name belongs to a Great Expectations'
+    validation result, which can be rendered as a data docs page.
+
+    :param name: String with a filename.
+
+    :return: Bool.
+    """
+    return bool(name) and name.endswith(GE_RESULT_EXTENSION)
+
+
+def save_validation_result(validation_result: dict, file_name: str) -> os.path:
+    """
+    Writes a validation result to the app's validation directory, as a JSON file.
+
+    :param validation_result: Dictionary with the validation result.
+    :param file_name: String with the name of the file.
+
+    :return: Path of the written file.
+    """
+    validation_path = get_validation_path(file_name)
+    with open(validation_path, "w") as fp:
+        write_json(validation_result, fp)
+    return validation_path
+
+
+def read_validation_result(file_name: str) -> dict:
+    """
+    Reads a validation result from the app's validation directory.
+
+    :param file_name: String with the name of the file.
+
+    :return: Dictionary with the validation result.
+    """
+    with open(get_validation_path(file_name), "r") as fp:
+        return read_json(fp)
@@ -0,0 +1,262 @@
+import time
+from great_expectations.exceptions import GreatExpectationsError
+
+from objects.ge_context_pool import GEContextPool
+from objects.expectation_suite_name import ExpectationSuiteName
+
+from constants.expectation_set_constants import EXPECTATIONS
+from constants.validation_constants import (
+    RESULTS,
+    SKETCH_MODE,
+    CHUNKED_MODE,
+    SAMPLING_MODE,
+    FAIL_FAST_MODE,
+    INCREMENTAL_MODE,
+    GE_RESULT_EXTENSION,
+    GREAT_EXPECTATIONS_MODE
+)
+
+from src.expectation_suite_operations import get_expectation_suite_name_object
+from src.validation_operations import (
+    validate_dataset,
+    get_ge_validation_result,
+    delete_ge_validation_result,
+    build_new_validation_file_name
+)
+from src.validation_cache_operations import (
+    store_validation_in_cache,
+    build_validation_cache_key,
+    restore_cached_validation
+)
+from src.validation_result_operations import (
+    read_validation_result,
+    save_validation_result,
+    summarize_ge_validation_result
+)
+from src.expectation_set_operations import get_expectation_set_config
+from src.value_set_operations import split_referencing_expectations
+from src.chunked_validation_operations import (
+    validate_dataset_in_chunks,
+    validate_expectations_in_chunks
+)
+from src.sampling_validation_operations import validate_dataset_on_sample
+from src.incremental_validation_operations import validate_dataset_incrementally
+from src.fail_fast_validation_operations import validate_dataset_failing_fast
+from src.sketch_validation_operations import validate_dataset_with_sketches
+from src.validation_history_operations import record_validation_run
+from src.low_level_operations import get_validation_path, get_imported_dataset_path
+
+# Modes whose results are only valid at the confidence they were run at
+CONFIDENCE_DEPENDENT_MODES = [FAIL_FAST_MODE, GREAT_EXPECTATIONS_MODE]
+
+
+def build_validation_result_file_names(
+    expectation_set_name: str, dataset_name: str, confidence: int, mode: str
+) -> list:
+    """
+    Builds the names of the files a validation writes. The first one is its threshold
+    independent result, and GE validations also keep GE's own result, which can be
+    rendered as a data docs page.
+
+    :param expectation_set_name: String with the name of the expectation set.
+    :param dataset_name: String with the name of the validated dataset.
+    :param confidence: Integer with confidence ranging from 0 to 100.
+    :param mode: String with the validation mode.
+
+    :return: List with file names.
+    """
+    result_confidence = str(confidence) if mode in CONFIDENCE_DEPENDENT_MODES else None
+    file_names = [
+        build_new_validation_file_name(
+            expectation_set_name,
+            dataset_name,
+            result_confidence,
+            extension=".json",
+            mode=mode
+        )
+    ]
+    if mode == GREAT_EXPECTATIONS_MODE:
+        file_names.append(
+            build_new_validation_file_name(
+                expectation_set_name,
+                dataset_name,
+                str(confidence),
+                extension=GE_RESULT_EXTENSION,
+                mode=mode
+            )
+        )
+    return file_names
+
+
+def validate_dataset_with_ge(
+    context_pool: GEContextPool,
+    dataset_name: str,
+    expectation_name_object: ExpectationSuiteName,
+    confidence: int,
+    ge_result_file_name: str
+) -> dict or None:
+    """
+    Validates a dataset with Great Expectations and summarizes its result. GE's own
+    result is saved in the given file, and removed from GE's validations store.
+    Expectations that reference a column of another dataset are not part of GE's
+    suite. They are checked against the cached values of that column instead, and
+    their results are added to the summary.
+
+    :param context_pool: GEContextPool object that provides the worker's context.
+    :param dataset_name: String with the name of the dataset to be validated.
+    :param expectation_name_object: Expectation set name.
+    :param confidence: Integer with confidence ranging from 0 to 100.
+    :param ge_result_file_name: String with the name of the file of GE's result.
+
+    :return: Dictionary with the validation result, or None if the dataset is not
+    compatible with the expectation set.
+    """
+    validation_result_identifier = validate_dataset(
+        context_pool, dataset_name, expectation_name_object, confidence
+    )
+    if validation_result_identifier is None:
+        return None
+    context = context_pool.get_context()
+    ge_validation_result = get_ge_validation_result(context, validation_result_identifier)
+    delete_ge_validation_result(context, validation_result_identifier)
+    save_validation_result(ge_validation_result, ge_result_file_name)
+    validation_result = summarize_ge_validation_result(
+        ge_validation_result, dataset_name, expectation_name_object.name
+    )
+
+    config = get_expectation_set_config(expectation_name_object.name)
+    _, referencing_expectations = split_referencing_expectations(config.get(EXPECTATIONS))
+    if referencing_expectations:
+        validation_result[RESULTS] += validate_expectations_in_chunks(
+            get_imported_dataset_path(dataset_name), referencing_expectations
+        )
+    return validation_result
+
+
+def validate_dataset_with_engine(
+    mode: str,
+    dataset_name: str,
+    expectation_name_object: ExpectationSuiteName,
+    confidence: int,
+    export_unexpected_rows=False
+) -> dict or None:
+    """
+    Validates a dataset with the app's own engine for the given mode.
+
+    :param mode: String with the validation mode, other than Great Expectations.
+    :param dataset_name: String with the name of the dataset to be validated.
+    :param expectation_name_object: Expectation set name.
+    :param confidence: Integer with confidence ranging from 0 to 100.
+    :param export_unexpected_rows: Bool that tells if unexpected rows are exported,
+    which only chunked validations do.
+
+    :return: Dictionary with the validation result, or None if the dataset is not
+    compatible with the expectation set.
+    """
+    if mode == CHUNKED_MODE:
+        return validate_dataset_in_chunks(
+            dataset_name,
+            expectation_name_object,
+            export_unexpected_rows=export_unexpected_rows
+        )
+    if mode == INCREMENTAL_MODE:
+        return validate_dataset_incrementally(dataset_name, expectation_name_object)
+    if mode == FAIL_FAST_MODE:
+        return validate_dataset_failing_fast(
+            dataset_name, expectation_name_object, confidence
+        )
+    if mode == SKETCH_MODE:
+        return validate_dataset_with_sketches(dataset_name, expectation_name_object)
+    if mode == SAMPLING_MODE:
+        return validate_dataset_on_sample(dataset_name, expectation_name_object)
+    raise ValueError(f"Unknown validation mode {mode}")
+
+
+def run_validation(
+    context_pool: GEContextPool,
+    dataset_name: str,
+    expectation_set_name: str,
+    confidence: int,
+    mode: str,
+    export_unexpected_rows=False
+) -> (dict or None, str or None):
+    """
+    Validates a dataset against an expectation set in the given mode, saves its
+    result and records the run in the history. If the very same validation has
+    already been computed, its cached result is reused. Otherwise, the new result is
+    cached, unless its unexpected rows were exported, since they are not cached.
+
+    :param context_pool: GEContextPool object that provides the worker's context.
+    :param dataset_name: String with the name of the dataset to be validated.
+    :param expectation_set_name: String with the name of the expectation set.
+    :param confidence: Integer with confidence ranging from 0 to 100.
+    :param mode: String with the validation mode.
+    :param export_unexpected_rows: Bool that tells if unexpected rows are exported,
+    which only chunked validations do.
+
+    :return: Tuple with the dictionary of the validation result, or None if there is
+    none, and a string with the error that prevented the validation, or None.
+    """
+    expectation_name_object = get_expectation_suite_name_object(expectation_set_name)
+    file_names = build_validation_result_file_names(
+        expectation_set_name, dataset_name, confidence, mode
+    )
+    validation_paths = [get_validation_path(file_name) for file_name in file_names]
+
+    export_unexpected_rows = export_unexpected_rows and mode == CHUNKED_MODE
+    cache_key = None
+    if not export_unexpected_rows:
+        cache_key = build_validation_cache_key(
+            dataset_name,
+            expectation_set_name,
+            confidence if mode in CONFIDENCE_DEPENDENT_MODES else None,
+            mode
+        )
+
+    start_time = time.perf_counter()
+    # Sets that cannot be compiled, like hand edited ones, and datasets that cannot be
+    # read are reported instead of validated
+    try:
+        from_cache = cache_key is not None and \
+            restore_cached_validation(cache_key, validation_paths)
+        if from_cache:
+            validation_result = read_validation_result(file_names[0])
+        else:
+            if mode == GREAT_EXPECTATIONS_MODE:
+                validation_result = validate_dataset_with_ge(
+                    context_pool,
+                    dataset_name,
+                    expectation_name_object,
+                    confidence,
+                    file_names[1]
+                )
+            else:
+                validation_result = validate_dataset_with_engine(
+                    mode,
+                    dataset_name,
+                    expectation_name_object,
+                    confidence,
+                    export_unexpected_rows=export_unexpected_rows
+                )
+            if validation_result is None:
+                return None, None
+            save_validation_result(validation_result, file_names[0])
+            # Keeping a copy of the new validation for future runs
+            if cache_key is not None:
+                store_validation_in_cache(cache_key, validation_paths)
+    except (
+        OSError, ValueError, KeyError, TypeError, GreatExpectationsError
+    ) as error:
+        print("ERROR:", f"Validation of {dataset_name} with {expectation_set_name} "
+              f"failed: {error}")
+        return None, f"{expectation_set_name} cannot be validated: {error}"
+
+    # Every run is kept in the history, which lists the results
+    record_validation_run(
+        file_names,
+        validation_result,
+        confidence,
+        time.perf_counter() - start_time,
+        from_cache=from_cache
+    )
+    return validation_result, None
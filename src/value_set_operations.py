@@ -0,0 +1,213 @@
+import threading
+import numpy as np
+import pandas as pd
+
+from constants.expectation_set_constants import (
+    PARAMETERS,
+    VALUE_SET_REFERENCE_PREFIX,
+    VALUE_SET_REFERENCE_SEPARATOR
+)
+from constants.great_expectations_constants import (
+    REFERENCE_COLUMN,
+    VALUE_SET_SINGLE,
+    REFERENCE_DATASET
+)
+
+from src.hash_operations import get_file_hash, get_content_hash
+from src.utils import read_dataset, infer_csv_separator, read_dataset_in_chunks
+from src.low_level_operations import exists_path, get_imported_dataset_path
+
+# Referenced value sets, as unique Pandas Indexes whose hash tables are built once,
+# together with the hash of the dataset content they were read from
+_VALUE_SETS = dict()
+_VALUE_SETS_LOCK = threading.Lock()
+
+
+def is_value_set_reference(value_set) -> bool:
+    """
+    Returns if a value set references a column of an imported dataset, instead of
+    listing its values.
+
+    :param value_set: Value set of an expectation.
+
+    :return: Bool.
+    """
+    return isinstance(value_set, str) and value_set.startswith(VALUE_SET_REFERENCE_PREFIX)
+
+
+def build_value_set_reference(dataset_name: str, column: str) -> str:
+    """
+    :param dataset_name: String with the name of an imported dataset.
+    :param column: String with the name of one of its columns.
+
+    :return: String with the value set reference, as "@dataset:column".
+    """
+    return VALUE_SET_REFERENCE_PREFIX + dataset_name + VALUE_SET_REFERENCE_SEPARATOR + column
+
+
+def parse_value_set_reference(reference: str) -> (str, str):
+    """
+    :param reference: String with a value set reference, as "@dataset:column".
+
+    :return: Tuple with the dataset name and the column name.
+    """
+    dataset_name, column = reference[len(VALUE_SET_REFERENCE_PREFIX):].split(
+        VALUE_SET_REFERENCE_SEPARATOR, 1
+    )
+    return dataset_name, column
+
+
+def is_value_set_reference_valid(reference: str) -> bool:
+    """
+    Returns if a value set reference points to an existing column of an imported
+    dataset.
+
+    :param reference: String with a value set reference.
+
+    :return: Bool.
+    """
+    if VALUE_SET_REFERENCE_SEPARATOR not in reference:
+        return False
+    dataset_name, column = parse_value_set_reference(reference)
+    dataset_path = get_imported_dataset_path(dataset_name)
+    if not dataset_name or not exists_path(dataset_path):
+        return False
+    separator = infer_csv_separator(dataset_path)
+    return column in read_dataset(dataset_path, sep=separator, n_rows=2).columns
+
+
+def get_value_set_references(expectations_from_set_config: dict) -> list:
+    """
+    Returns the value set references used by the expectations of a set, including
+    the columns referenced by "Values to exist in another dataset".
+
+    :param expectations_from_set_config: Dictionary with the expectations of the set.
+
+    :return: List with unique value set references, sorted.
+    """
+    references = set()
+    for expectation_configs in expectations_from_set_config.values():
+        for expectation_config in expectation_configs:
+            parameters = expectation_config.get(PARAMETERS) or dict()
+            if is_value_set_reference(parameters.get(VALUE_SET_SINGLE)):
+                references.add(parameters[VALUE_SET_SINGLE])
+            if REFERENCE_DATASET in parameters:
+                references.add(build_value_set_reference(
+                    parameters[REFERENCE_DATASET], parameters[REFERENCE_COLUMN]
+                ))
+    return sorted(references)
+
+
+def is_referencing_expectation(expectation_config: dict) -> bool:
+    """
+    Returns if an expectation checks values against a column of an imported dataset,
+    either through a value set reference or as "Values to exist in another dataset".
+
+    :param expectation_config: Dictionary with expectation name and parameters.
+
+    :return: Bool.
+    """
+    parameters = expectation_config.get(PARAMETERS) or dict()
+    return is_value_set_reference(parameters.get(VALUE_SET_SINGLE)) or \
+        REFERENCE_DATASET in parameters
+
+
+def split_referencing_expectations(expectations_from_set_config: dict) -> (dict, dict):
+    """
+    Splits the expectations of a set between the ones that check values against a
+    column of an imported dataset and the rest, keeping their config order.
+
+    :param expectations_from_set_config: Dictionary with the expectations of the set.
+
+    :return: Tuple with the expectations that do not reference any column and the ones
+    that do, in the same format as the expectations of a set.
+    """
+    expectations, referencing_expectations = dict(), dict()
+    for column_key, expectation_configs in expectations_from_set_config.items():
+        for expectation_config in expectation_configs:
+            if is_referencing_expectation(expectation_config):
+                referencing_expectations.setdefault(column_key, list()).append(
+                    expectation_config
+                )
+            else:
+                expectations.setdefault(column_key, list()).append(expectation_config)
+    return expectations, referencing_expectations
+
+
+def are_value_set_references_available(expectations_from_set_config: dict) -> bool:
+    """
+    Returns if every dataset referenced by the value sets of an expectation set is
+    still imported.
+
+    :param expectations_from_set_config: Dictionary with the expectations of the set.
+
+    :return: Bool.
+    """
+    return all(
+        exists_path(get_imported_dataset_path(parse_value_set_reference(reference)[0]))
+        for reference in get_value_set_references(expectations_from_set_config)
+    )
+
+
+def get_expectation_set_version(expectations_from_set_config: dict) -> str:
+    """
+    Returns a hash that changes whenever the expectations of a set change, and also
+    whenever the content of a dataset referenced by one of its value sets changes.
+
+    :param expectations_from_set_config: Dictionary with the expectations of the set.
+
+    :return: String with the hexadecimal hash.
+    """
+    references = get_value_set_references(expectations_from_set_config)
+    if not references:
+        return get_content_hash(expectations_from_set_config)
+    reference_hashes = dict()
+    for reference in references:
+        dataset_path = get_imported_dataset_path(parse_value_set_reference(reference)[0])
+        reference_hashes[reference] = \
+            get_file_hash(dataset_path) if exists_path(dataset_path) else None
+    return get_content_hash([expectations_from_set_config, reference_hashes])
+
+
+def get_referenced_value_set(reference: str) -> pd.Index:
+    """
+    Returns the unique values of a referenced column. They are read once, and read
+    again only if the content of the dataset changes.
+
+    :param reference: String with a value set reference.
+
+    :return: Pandas Index with unique values, without missing ones.
+    """
+    dataset_name, column = parse_value_set_reference(reference)
+    dataset_path = get_imported_dataset_path(dataset_name)
+    dataset_hash = get_file_hash(dataset_path)
+    with _VALUE_SETS_LOCK:
+        known_hash, value_set = _VALUE_SETS.get(reference, (None, None))
+        if known_hash == dataset_hash:
+            return value_set
+
+        separator = infer_csv_separator(dataset_path)
+        unique_values = [
+            chunk[column].dropna().unique()
+            for chunk in read_dataset_in_chunks(dataset_path, sep=separator, columns=[column])
+        ]
+        value_set = pd.Index(
+            pd.unique(np.concatenate(unique_values)) if unique_values else []
+        )
+        _VALUE_SETS[reference] = (dataset_hash, value_set)
+        return value_set
+
+
+def is_in_value_set(values: pd.Series, value_set) -> np.ndarray:
+    """
+    Returns which values are in a value set. Referenced value sets are looked up in
+    the hash table of their cached Index, which is never rebuilt for a new chunk.
+
+    :param values: Pandas Series.
+    :param value_set: List with values or string with a value set reference.
+
+    :return: Boolean NumPy array.
+    """
+    if is_value_set_reference(value_set):
+        return get_referenced_value_set(value_set).get_indexer(values) != -1
+    return values.isin(value_set).to_numpy()